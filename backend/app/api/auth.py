@@ -9,7 +9,7 @@ router = APIRouter()
 security = HTTPBearer()
 
 @router.post("/login", response_model=TokenResponse)
-async def login(
+def login(
     login_data: LoginRequest,
     db: Session = Depends(get_db)
 ):
@@ -18,7 +18,7 @@ async def login(
     return auth_service.login(login_data)
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(
+def refresh_token(
     refresh_data: RefreshTokenRequest,
     db: Session = Depends(get_db)
 ):
@@ -27,7 +27,7 @@ async def refresh_token(
     return auth_service.refresh_token(refresh_data.refresh_token)
 
 @router.get("/me", response_model=UserInfo)
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
@@ -36,7 +36,7 @@ async def get_current_user(
     return auth_service.get_current_user(credentials.credentials)
 
 # Dependency for protected routes
-async def get_current_active_user(
+def get_current_active_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> UserInfo:
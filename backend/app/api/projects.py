@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from app.database.connection import get_db
 from app.schemas.project import (
@@ -9,23 +9,37 @@ from app.schemas.project import (
 from app.schemas.auth import UserInfo
 from app.services.project_service import ProjectService
 from app.api.auth import get_current_active_user
+from app.utils.pagination import set_page_headers
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Project])
-async def get_projects(
+def get_projects(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="前ページのX-Next-Cursor"),
+    include_total: bool = Query(False, description="X-Total-Countヘッダーに総件数を返す"),
+    current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """プロジェクト一覧取得"""
-    from ..models.project import Project as ProjectModel
-    projects = db.query(ProjectModel).offset(skip).limit(limit).all()
-    return projects
+    project_service = ProjectService(db)
+    page = project_service.get_projects(
+        user_id=current_user.id,
+        user_role=current_user.role_level,
+        skip=skip,
+        limit=limit,
+        status_filter=status,
+        cursor=cursor,
+        include_total=include_total
+    )
+    set_page_headers(response, page)
+    return page.items
 
 @router.post("/", response_model=Project)
-async def create_project(
+def create_project(
     project_data: ProjectCreate,
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -35,7 +49,7 @@ async def create_project(
     return project_service.create_project(project_data, current_user.id)
 
 @router.get("/summaries", response_model=List[ProjectSummary])
-async def get_project_summaries(
+def get_project_summaries(
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -47,7 +61,7 @@ async def get_project_summaries(
     )
 
 @router.get("/{project_id}", response_model=ProjectWithMembers)
-async def get_project(
+def get_project(
     project_id: int,
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -61,7 +75,7 @@ async def get_project(
     )
 
 @router.put("/{project_id}", response_model=Project)
-async def update_project(
+def update_project(
     project_id: int,
     project_data: ProjectUpdate,
     current_user: UserInfo = Depends(get_current_active_user),
@@ -77,7 +91,7 @@ async def update_project(
     )
 
 @router.delete("/{project_id}")
-async def delete_project(
+def delete_project(
     project_id: int,
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -92,7 +106,7 @@ async def delete_project(
     return {"message": "プロジェクトが削除されました"}
 
 @router.get("/{project_id}/members", response_model=List[ProjectMember])
-async def get_project_members(
+def get_project_members(
     project_id: int,
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -106,7 +120,7 @@ async def get_project_members(
     )
 
 @router.post("/{project_id}/members", response_model=ProjectMember)
-async def add_project_member(
+def add_project_member(
     project_id: int,
     member_data: ProjectMemberCreate,
     current_user: UserInfo = Depends(get_current_active_user),
@@ -122,7 +136,7 @@ async def add_project_member(
     )
 
 @router.delete("/{project_id}/members/{member_user_id}")
-async def remove_project_member(
+def remove_project_member(
     project_id: int,
     member_user_id: int,
     current_user: UserInfo = Depends(get_current_active_user),
@@ -1,91 +1,206 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import BinaryIO, Dict, Iterator, Optional
 from datetime import date, datetime
+from urllib.parse import quote
+import os
 
 from ..database.connection import get_db
-from ..models.user import User
+from ..schemas.auth import UserInfo
+from ..schemas.report import ExportJob, ExportJobCreate
+from ..services import export_jobs
 from ..services.report_service import report_service
-from ..utils.auth import get_current_user
+from .auth import get_current_active_user
+from ..utils.exceptions import AuthorizationError, ConflictError, NotFoundError
+from ..utils.permission_cache import get_project_access
+from ..utils.report_cache import get_or_compute_report
 
 router = APIRouter()
 
+REFRESH_DESCRIPTION = "キャッシュを使わずに再計算する"
+EXCEL_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def _attachment_headers(filename: str) -> Dict[str, str]:
+    """ダウンロード用ヘッダー（日本語のファイル名はRFC 5987形式でエンコード）"""
+    return {"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"}
+
+def _iter_file(file: BinaryIO) -> Iterator[bytes]:
+    """ファイルを分割して送信し、送信後に閉じる"""
+    try:
+        while chunk := file.read(STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        file.close()
+
+def _check_project_access(db: Session, project_id: int, current_user: UserInfo):
+    """プロジェクトのレポート参照権限チェック（管理者以外はメンバーのみ）"""
+    if current_user.role_level == "admin":
+        return
+    access = get_project_access(db, project_id, current_user.id)
+    if access is None:
+        raise NotFoundError("プロジェクト")
+    if not access.is_member:
+        raise AuthorizationError("このプロジェクトにアクセスする権限がありません")
+
 @router.get("/reports/projects/{project_id}/progress")
 def get_project_progress_report(
+    response: Response,
     project_id: int,
     report_date: Optional[date] = Query(None, description="レポート基準日 (YYYY-MM-DD)"),
+    refresh: bool = Query(False, description=REFRESH_DESCRIPTION),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserInfo = Depends(get_current_active_user)
 ):
-    """プロジェクト進捗レポートを取得"""
+    """プロジェクト進捗レポートを取得（結果はプロジェクトの版数が変わるまでキャッシュ）"""
+    _check_project_access(db, project_id, current_user)
+    # 基準日の省略時は当日（日付が変われば別のキャッシュになる）
+    report_date = report_date or datetime.now().date()
     try:
-        report = report_service.generate_project_progress_report(db, project_id, report_date)
-        return report
+        cached = get_or_compute_report(
+            "project_progress", project_id, {"report_date": report_date},
+            lambda: report_service.generate_project_progress_report(db, project_id, report_date),
+            refresh=refresh
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    response.headers["X-Report-Cache"] = cached.status
+    return cached.value
 
 @router.get("/reports/projects/{project_id}/progress/pdf")
-def export_project_progress_pdf(
+async def export_project_progress_pdf(
     project_id: int,
     report_date: Optional[date] = Query(None, description="レポート基準日 (YYYY-MM-DD)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserInfo = Depends(get_current_active_user)
 ):
-    """プロジェクト進捗レポートをPDF出力"""
+    """プロジェクト進捗レポートをPDF出力
+
+    DBの読み込みとHTML生成はスレッドで行い、PDFの描画はPDF描画プロセスで行う
+    （描画を待つ間はスレッドもDB接続も占有しない）。
+    """
+    await run_in_threadpool(_check_project_access, db, project_id, current_user)
+    
+    def render_html():
+        try:
+            # プロジェクト名を取得してファイル名に使用
+            from ..models.project import Project
+            project_name = db.query(Project.name).filter(Project.id == project_id).scalar() or f"Project_{project_id}"
+            return project_name, report_service.render_project_progress_html(db, project_id, report_date)
+        finally:
+            db.close()
+    
     try:
-        pdf_data = report_service.export_project_progress_to_pdf(db, project_id, report_date)
-        
-        # プロジェクト名を取得してファイル名に使用
-        from ..models.project import Project
-        project = db.query(Project).filter(Project.id == project_id).first()
-        project_name = project.name if project else f"Project_{project_id}"
-        
-        filename = f"進捗レポート_{project_name}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        
-        return Response(
-            content=pdf_data,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{filename}"}
-        )
+        project_name, html_content = await run_in_threadpool(render_html)
+        pdf_data = await report_service.pdf_renderer.render_async(html_content)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF生成エラー: {str(e)}")
+    
+    filename = f"進捗レポート_{project_name}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    return Response(
+        content=pdf_data,
+        media_type="application/pdf",
+        headers=_attachment_headers(filename)
+    )
 
 @router.get("/reports/projects/{project_id}/tasks/excel")
 def export_tasks_excel(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserInfo = Depends(get_current_active_user)
 ):
-    """タスク一覧をExcel出力"""
+    """タスク一覧をExcel出力
+
+    一時ファイルに書き出した後に分割して送信する（タスク数によらずメモリ使用量は一定）。
+    """
+    _check_project_access(db, project_id, current_user)
     try:
-        excel_data = report_service.export_tasks_to_excel(db, project_id)
-        
-        # プロジェクト名を取得してファイル名に使用
-        from ..models.project import Project
-        project = db.query(Project).filter(Project.id == project_id).first()
-        project_name = project.name if project else f"Project_{project_id}"
-        
-        filename = f"タスク一覧_{project_name}_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        
-        return Response(
-            content=excel_data,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{filename}"}
-        )
+        excel_file = report_service.export_tasks_to_excel_file(db, project_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Excel生成エラー: {str(e)}")
+    
+    # プロジェクト名を取得してファイル名に使用
+    from ..models.project import Project
+    project_name = db.query(Project.name).filter(Project.id == project_id).scalar() or f"Project_{project_id}"
+    filename = f"タスク一覧_{project_name}_{datetime.now().strftime('%Y%m%d')}.xlsx"
+    
+    headers = _attachment_headers(filename)
+    headers["Content-Length"] = str(os.fstat(excel_file.fileno()).st_size)
+    return StreamingResponse(_iter_file(excel_file), media_type=EXCEL_MEDIA_TYPE, headers=headers)
+
+@router.post("/reports/exports", response_model=ExportJob, status_code=202)
+def create_export_job(
+    request: ExportJobCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: UserInfo = Depends(get_current_active_user)
+):
+    """レポート出力ジョブを登録（生成はワーカーで行い、状態は返却したジョブIDで確認する）
+
+    同じ内容のジョブが生成中または生成済み（有効期限内）の場合はそのジョブを返す。
+    """
+    _check_project_access(db, request.project_id, current_user)
+    from ..models.project import Project
+    project_name = db.query(Project.name).filter(Project.id == request.project_id).scalar()
+    if project_name is None:
+        raise NotFoundError("プロジェクト")
+    
+    params = {}
+    if request.report_type == "progress_pdf":
+        params["report_date"] = (request.report_date or datetime.now().date()).isoformat()
+    job = export_jobs.submit_export_job(
+        request.report_type, request.project_id, params, project_name, current_user.id
+    )
+    response.headers["Location"] = f"/api/reports/exports/{job.job_id}"
+    return job
+
+def _get_export_job(db: Session, job_id: str, current_user: UserInfo) -> ExportJob:
+    """出力ジョブを取得（同じ内容のジョブは共有されるため、プロジェクトの参照権限で判定）"""
+    job = export_jobs.get_export_job(job_id)
+    if job is None:
+        raise NotFoundError("出力ジョブ")
+    _check_project_access(db, job.project_id, current_user)
+    return job
+
+@router.get("/reports/exports/{job_id}", response_model=ExportJob)
+def get_export_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: UserInfo = Depends(get_current_active_user)
+):
+    """レポート出力ジョブの状態を取得"""
+    return _get_export_job(db, job_id, current_user)
+
+@router.get("/reports/exports/{job_id}/download")
+def download_export(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: UserInfo = Depends(get_current_active_user)
+):
+    """生成済みのレポートをダウンロード"""
+    job = _get_export_job(db, job_id, current_user)
+    if job.status != export_jobs.COMPLETED:
+        raise ConflictError(f"出力ジョブは完了していません（{job.status}）")
+    path = export_jobs.artifact_path(job)
+    if not path.exists():
+        raise NotFoundError("出力ファイル")
+    return FileResponse(
+        path, media_type=export_jobs.RENDERERS[job.report_type].media_type,
+        headers=_attachment_headers(job.filename)
+    )
 
 @router.get("/reports/workload")
 def get_user_workload_report(
     start_date: date = Query(..., description="開始日 (YYYY-MM-DD)"),
     end_date: date = Query(..., description="終了日 (YYYY-MM-DD)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserInfo = Depends(get_current_active_user)
 ):
     """ユーザー別作業負荷レポートを取得"""
     if current_user.role_level not in ["admin", "manager"]:
@@ -99,62 +214,30 @@ def get_user_workload_report(
 
 @router.get("/reports/dashboard-stats")
 def get_dashboard_statistics(
+    response: Response,
+    refresh: bool = Query(False, description=REFRESH_DESCRIPTION),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserInfo = Depends(get_current_active_user)
 ):
-    """ダッシュボード用統計情報を取得"""
-    from ..models.project import Project
-    from ..models.task import Task
-    
-    # プロジェクト統計
-    total_projects = db.query(Project).count()
-    active_projects = db.query(Project).filter(Project.status == "active").count()
-    completed_projects = db.query(Project).filter(Project.status == "completed").count()
-    
-    # タスク統計
-    total_tasks = db.query(Task).count()
-    completed_tasks = db.query(Task).filter(Task.status == "completed").count()
-    overdue_tasks = db.query(Task).filter(
-        Task.planned_end_date < datetime.now().date(),
-        Task.status != "completed"
-    ).count()
-    
-    # 今月の実績
-    current_month_start = datetime.now().replace(day=1).date()
-    tasks_completed_this_month = db.query(Task).filter(
-        Task.actual_end_date >= current_month_start,
-        Task.status == "completed"
-    ).count()
-    
-    projects_completed_this_month = db.query(Project).filter(
-        Project.updated_at >= datetime.combine(current_month_start, datetime.min.time()),
-        Project.status == "completed"
-    ).count()
-    
-    return {
-        "projects": {
-            "total": total_projects,
-            "active": active_projects,
-            "completed": completed_projects,
-            "completed_this_month": projects_completed_this_month
-        },
-        "tasks": {
-            "total": total_tasks,
-            "completed": completed_tasks,
-            "overdue": overdue_tasks,
-            "completed_this_month": tasks_completed_this_month,
-            "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        }
-    }
+    """ダッシュボード用統計情報を取得（結果はいずれかのプロジェクトへの書き込みまでキャッシュ）"""
+    today = datetime.now().date()
+    cached = get_or_compute_report(
+        "dashboard_stats", None, {"today": today},
+        lambda: report_service.generate_dashboard_statistics(db, today),
+        refresh=refresh
+    )
+    response.headers["X-Report-Cache"] = cached.status
+    return cached.value
 
 @router.get("/reports/projects/{project_id}/gantt/export")
 def export_gantt_chart_image(
     project_id: int,
     format: str = Query("png", regex="^(png|svg|pdf)$", description="出力フォーマット"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserInfo = Depends(get_current_active_user)
 ):
     """ガントチャートを画像またはPDFで出力"""
+    _check_project_access(db, project_id, current_user)
     # 注意: 実際のガントチャートの画像生成は複雑なため、
     # ここではプレースホルダーとして基本的な実装を示します
     
@@ -179,7 +262,7 @@ def send_report_email(
     recipient_emails: list,
     project_id: Optional[int] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserInfo = Depends(get_current_active_user)
 ):
     """レポートをメールで送信"""
     if current_user.role_level not in ["admin", "manager"]:
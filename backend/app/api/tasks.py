@@ -1,44 +1,57 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, Path
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Path, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database.connection import get_db
+from app.database.connection import get_db, get_async_db
 from app.schemas.task import (
     Task, TaskCreate, TaskUpdate, TaskWithAssignments,
     TaskAssignment, TaskAssignmentCreate,
     TaskDependency, TaskDependencyCreate,
     TaskComment, TaskCommentCreate,
-    ValidPredecessorTask, TaskHierarchy
+    ValidPredecessorTask, TaskHierarchy, ProjectSchedule, TaskRescheduleResult,
+    TaskBatchRequest, TaskBatchResult, TaskChanges,
+    TaskMoveRequest, TaskReorderRequest, TaskSortOrder
 )
 from app.schemas.auth import UserInfo
-from app.services.task_service import TaskService
+from app.services.task_service import TaskService, renumber_project_sort_orders
+from app.services.gantt_service import GanttService
 from app.api.auth import get_current_active_user
+from app.utils.pagination import set_page_headers
 
 router = APIRouter()
 
 @router.get("/projects/{project_id}/tasks", response_model=List[Task])
-async def get_project_tasks(
+def get_project_tasks(
+    response: Response,
     project_id: int = Path(..., description="プロジェクトID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
     assigned_to: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="前ページのX-Next-Cursor"),
+    include_total: bool = Query(False, description="X-Total-Countヘッダーに総件数を返す"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """プロジェクトのタスク一覧取得"""
     task_service = TaskService(db)
-    return task_service.get_tasks(
+    page = task_service.get_tasks(
         project_id=project_id,
         user_id=current_user.id,
         user_role=current_user.role_level,
         skip=skip,
         limit=limit,
         status_filter=status,
-        assigned_to=assigned_to
+        assigned_to=assigned_to,
+        cursor=cursor,
+        include_total=include_total
     )
+    set_page_headers(response, page)
+    return page.items
 
 @router.post("/projects/{project_id}/tasks", response_model=Task)
-async def create_task(
+def create_task(
     project_id: int = Path(..., description="プロジェクトID"),
     task_data: TaskCreate = ...,
     current_user: UserInfo = Depends(get_current_active_user),
@@ -50,8 +63,24 @@ async def create_task(
     task_service = TaskService(db)
     return task_service.create_task(task_data, current_user.id, current_user.role_level)
 
+@router.post("/projects/{project_id}/tasks:batch", response_model=TaskBatchResult)
+def apply_task_batch(
+    project_id: int = Path(..., description="プロジェクトID"),
+    batch: TaskBatchRequest = ...,
+    current_user: UserInfo = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """タスクの一括作成・更新・削除（1トランザクション）"""
+    task_service = TaskService(db)
+    return task_service.apply_task_batch(
+        project_id=project_id,
+        batch=batch,
+        user_id=current_user.id,
+        user_role=current_user.role_level
+    )
+
 @router.get("/tasks/{task_id}", response_model=TaskWithAssignments)
-async def get_task(
+def get_task(
     task_id: int = Path(..., description="タスクID"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -65,7 +94,7 @@ async def get_task(
     )
 
 @router.put("/tasks/{task_id}", response_model=Task)
-async def update_task(
+def update_task(
     task_id: int = Path(..., description="タスクID"),
     task_data: TaskUpdate = ...,
     current_user: UserInfo = Depends(get_current_active_user),
@@ -80,9 +109,62 @@ async def update_task(
         user_role=current_user.role_level
     )
 
+@router.put("/tasks/{task_id}/reschedule", response_model=TaskRescheduleResult)
+def reschedule_task(
+    task_id: int = Path(..., description="タスクID"),
+    task_data: TaskUpdate = ...,
+    current_user: UserInfo = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """タスク更新（計画日の変更を依存関係に従って後続タスクへ伝播）"""
+    task_service = TaskService(db)
+    return task_service.reschedule_task(
+        task_id=task_id,
+        task_data=task_data,
+        user_id=current_user.id,
+        user_role=current_user.role_level
+    )
+
+@router.put("/tasks/{task_id}/position", response_model=Task)
+def move_task(
+    background_tasks: BackgroundTasks,
+    task_id: int = Path(..., description="タスクID"),
+    move: TaskMoveRequest = ...,
+    current_user: UserInfo = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """タスクの表示順を移動（前後の間隔が尽きたらsort_orderをバックグラウンドで振り直す）"""
+    task_service = TaskService(db)
+    task, crowded = task_service.move_task(
+        task_id=task_id,
+        move=move,
+        user_id=current_user.id,
+        user_role=current_user.role_level
+    )
+    if crowded:
+        background_tasks.add_task(renumber_project_sort_orders, task.project_id)
+    return task
+
+@router.post("/projects/{project_id}/tasks/reorder", response_model=List[TaskSortOrder])
+def reorder_tasks(
+    project_id: int = Path(..., description="プロジェクトID"),
+    request: TaskReorderRequest = ...,
+    current_user: UserInfo = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """ドラッグ＆ドロップの並べ替え結果を一括反映"""
+    task_service = TaskService(db)
+    return task_service.reorder_tasks(
+        project_id=project_id,
+        task_ids=request.task_ids,
+        user_id=current_user.id,
+        user_role=current_user.role_level
+    )
+
 @router.delete("/tasks/{task_id}")
-async def delete_task(
+def delete_task(
     task_id: int = Path(..., description="タスクID"),
+    cascade: bool = Query(False, description="子孫タスクを含めて削除"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -91,12 +173,13 @@ async def delete_task(
     task_service.delete_task(
         task_id=task_id,
         user_id=current_user.id,
-        user_role=current_user.role_level
+        user_role=current_user.role_level,
+        cascade=cascade
     )
     return {"message": "タスクが削除されました"}
 
 @router.get("/tasks/{task_id}/assignments", response_model=List[TaskAssignment])
-async def get_task_assignments(
+def get_task_assignments(
     task_id: int = Path(..., description="タスクID"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -107,7 +190,7 @@ async def get_task_assignments(
     return task.assignments
 
 @router.post("/tasks/{task_id}/assignments", response_model=TaskAssignment)
-async def assign_task(
+def assign_task(
     task_id: int = Path(..., description="タスクID"),
     assignment_data: TaskAssignmentCreate = ...,
     current_user: UserInfo = Depends(get_current_active_user),
@@ -123,7 +206,7 @@ async def assign_task(
     )
 
 @router.delete("/tasks/{task_id}/assignments/{assignment_user_id}")
-async def unassign_task(
+def unassign_task(
     task_id: int = Path(..., description="タスクID"),
     assignment_user_id: int = Path(..., description="割り当て解除するユーザーID"),
     current_user: UserInfo = Depends(get_current_active_user),
@@ -140,7 +223,7 @@ async def unassign_task(
     return {"message": "担当者の割り当てが解除されました"}
 
 @router.post("/task-dependencies", response_model=TaskDependency)
-async def create_task_dependency(
+def create_task_dependency(
     dependency_data: TaskDependencyCreate = ...,
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -154,7 +237,7 @@ async def create_task_dependency(
     )
 
 @router.get("/tasks/{task_id}/comments", response_model=List[TaskComment])
-async def get_task_comments(
+def get_task_comments(
     task_id: int = Path(..., description="タスクID"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -168,7 +251,7 @@ async def get_task_comments(
     )
 
 @router.post("/tasks/{task_id}/comments", response_model=TaskComment)
-async def add_task_comment(
+def add_task_comment(
     task_id: int = Path(..., description="タスクID"),
     comment_data: TaskCommentCreate = ...,
     current_user: UserInfo = Depends(get_current_active_user),
@@ -184,7 +267,7 @@ async def add_task_comment(
     )
 
 @router.get("/projects/{project_id}/tasks/hierarchy", response_model=List[TaskHierarchy])
-async def get_task_hierarchy(
+def get_task_hierarchy(
     project_id: int = Path(..., description="プロジェクトID"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -198,7 +281,7 @@ async def get_task_hierarchy(
     )
 
 @router.get("/tasks/{task_id}/valid-predecessors", response_model=List[ValidPredecessorTask])
-async def get_valid_predecessors(
+def get_valid_predecessors(
     task_id: int = Path(..., description="タスクID"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -212,7 +295,7 @@ async def get_valid_predecessors(
     )
 
 @router.get("/projects/{project_id}/hierarchy", response_model=List[TaskHierarchy])
-async def get_project_task_hierarchy(
+def get_project_task_hierarchy(
     project_id: int = Path(..., description="プロジェクトID"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -226,7 +309,7 @@ async def get_project_task_hierarchy(
     )
 
 @router.get("/projects/{project_id}/dependencies", response_model=List[TaskDependency])
-async def get_project_task_dependencies(
+def get_project_task_dependencies(
     project_id: int = Path(..., description="プロジェクトID"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -239,29 +322,89 @@ async def get_project_task_dependencies(
         user_role=current_user.role_level
     )
 
+@router.get("/projects/{project_id}/gantt", response_class=ORJSONResponse)
+async def get_project_gantt(
+    project_id: int = Path(..., description="プロジェクトID"),
+    current_user: UserInfo = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """ガンチャート描画用データ一括取得（列指向の軽量形式・非同期DBアクセス）"""
+    payload = await db.run_sync(
+        lambda session: GanttService(session).get_gantt_payload(
+            project_id=project_id,
+            user_id=current_user.id,
+            user_role=current_user.role_level
+        )
+    )
+    return ORJSONResponse(payload)
+
+@router.get("/projects/{project_id}/changes", response_model=TaskChanges)
+def get_project_changes(
+    project_id: int = Path(..., description="プロジェクトID"),
+    since: Optional[str] = Query(None, description="前回レスポンスのcursor（省略時は全件）"),
+    current_user: UserInfo = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """前回取得以降に変更されたタスク・依存関係・担当者を取得（差分同期）"""
+    task_service = TaskService(db)
+    return task_service.get_project_changes(
+        project_id=project_id,
+        user_id=current_user.id,
+        user_role=current_user.role_level,
+        since=since
+    )
+
+@router.get("/projects/{project_id}/schedule", response_model=ProjectSchedule)
+def get_project_schedule(
+    project_id: int = Path(..., description="プロジェクトID"),
+    current_user: UserInfo = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """プロジェクトのクリティカルパス計算結果取得"""
+    task_service = TaskService(db)
+    return task_service.get_project_schedule(
+        project_id=project_id,
+        user_id=current_user.id,
+        user_role=current_user.role_level
+    )
+
+@router.post("/projects/{project_id}/schedule", response_model=ProjectSchedule)
+def compute_project_schedule(
+    project_id: int = Path(..., description="プロジェクトID"),
+    current_user: UserInfo = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """プロジェクトのクリティカルパスを計算して保存"""
+    task_service = TaskService(db)
+    return task_service.get_project_schedule(
+        project_id=project_id,
+        user_id=current_user.id,
+        user_role=current_user.role_level,
+        persist=True
+    )
+
 @router.put("/tasks/{task_id}/parent", response_model=Task)
-async def update_task_parent(
+def update_task_parent(
     task_id: int = Path(..., description="タスクID"),
     parent_data: dict = ...,
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """タスクの親子関係更新"""
+    """タスクの親子関係更新（levelは親タスクから算出するため指定不要）"""
     task_service = TaskService(db)
     parent_task_id = parent_data.get('parent_task_id')
-    level = parent_data.get('level', 0)
     
     return task_service.update_task_parent(
         task_id=task_id,
         parent_task_id=parent_task_id,
-        level=level,
         user_id=current_user.id,
         user_role=current_user.role_level
     )
 
 @router.post("/projects/{project_id}/calculate-progress")
-async def calculate_parent_task_progress(
+def calculate_parent_task_progress(
     project_id: int = Path(..., description="プロジェクトID"),
+    weight_by_hours: Optional[bool] = Query(None, description="予定工数で加重平均する"),
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -270,6 +413,7 @@ async def calculate_parent_task_progress(
     updated_tasks = task_service.calculate_parent_progress(
         project_id=project_id,
         user_id=current_user.id,
-        user_role=current_user.role_level
+        user_role=current_user.role_level,
+        weight_by_hours=weight_by_hours
     )
     return {"updated_tasks": updated_tasks, "message": f"{len(updated_tasks)}個のタスクの進捗率が更新されました"}
\ No newline at end of file
@@ -19,7 +19,7 @@ def require_admin(current_user: UserInfo = Depends(get_current_active_user)):
     return current_user
 
 @router.get("/", response_model=List[User])
-async def get_users(
+def get_users(
     skip: int = 0,
     limit: int = 100,
     current_user: UserInfo = Depends(require_admin),
@@ -30,7 +30,7 @@ async def get_users(
     return user_service.get_users(skip=skip, limit=limit)
 
 @router.post("/", response_model=User)
-async def create_user(
+def create_user(
     user_data: UserCreate,
     current_user: UserInfo = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -40,7 +40,7 @@ async def create_user(
     return user_service.create_user(user_data)
 
 @router.get("/profile", response_model=User)
-async def get_profile(
+def get_profile(
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -49,7 +49,7 @@ async def get_profile(
     return user_service.get_user_by_id(current_user.id)
 
 @router.put("/profile", response_model=User)
-async def update_profile(
+def update_profile(
     user_data: UserUpdate,
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -73,7 +73,7 @@ async def update_profile(
     return user_service.update_user(current_user.id, filtered_update)
 
 @router.put("/profile/password")
-async def update_password(
+def update_password(
     password_data: UserPasswordUpdate,
     current_user: UserInfo = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -84,7 +84,7 @@ async def update_password(
     return {"message": "Password updated successfully"}
 
 @router.get("/{user_id}", response_model=User)
-async def get_user(
+def get_user(
     user_id: int,
     current_user: UserInfo = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -100,7 +100,7 @@ async def get_user(
     return user
 
 @router.put("/{user_id}", response_model=User)
-async def update_user(
+def update_user(
     user_id: int,
     user_data: UserUpdate,
     current_user: UserInfo = Depends(require_admin),
@@ -111,7 +111,7 @@ async def update_user(
     return user_service.update_user(user_id, user_data)
 
 @router.delete("/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     current_user: UserInfo = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -1,17 +1,66 @@
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.utils.metrics import TimedAsyncQueuePool, TimedQueuePool, register_pool
+from app.utils.query_counter import instrument_engine
+
+# 非同期ドライバへの置き換え（同期URLから非同期エンジンのURLを導出する）
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def _pool_options(url: str, async_driver: bool = False) -> dict:
+    """接続プールの設定（SQLiteはドライバ既定のプールを使う）"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        # 接続の取得待ち時間を /metrics に出力する
+        "poolclass": TimedAsyncQueuePool if async_driver else TimedQueuePool,
+    }
+
+def _enable_sqlite_foreign_keys(sync_engine):
+    """SQLiteでも外部キー制約（ON DELETE CASCADE）を有効化"""
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def set_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+def async_database_url(url: str) -> str:
+    """同期ドライバのURLを非同期ドライバ（asyncpg / aiosqlite）のURLに変換"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.get_driver_name() in ("asyncpg", "aiosqlite"):
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
 
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
     pool_recycle=300,
-    echo=settings.debug
+    echo=settings.debug,
+    **_pool_options(settings.database_url)
 )
+_enable_sqlite_foreign_keys(engine)
+instrument_engine(engine)
+register_pool("sync", engine.pool)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 非同期エンジンはドライバ（asyncpg / aiosqlite）が必要なため初回利用時に作成
+_async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -20,4 +69,38 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_async_engine() -> AsyncEngine:
+    """非同期エンジンを取得（未作成なら作成）"""
+    global _async_engine
+    if _async_engine is None:
+        url = settings.async_database_url or async_database_url(settings.database_url)
+        _async_engine = create_async_engine(
+            url,
+            pool_pre_ping=True,
+            pool_recycle=300,
+            echo=settings.debug,
+            **_pool_options(url, async_driver=True)
+        )
+        _enable_sqlite_foreign_keys(_async_engine.sync_engine)
+        instrument_engine(_async_engine.sync_engine)
+        register_pool("async", _async_engine.pool)
+    return _async_engine
+
+async def get_async_db():
+    """Async database dependency
+
+    既存の同期サービスは AsyncSession.run_sync で実行できる:
+        await db.run_sync(lambda session: TaskService(session).get_task_hierarchy(...))
+    戻り値はセッション外で遅延ロードできないため、必要な値はrun_sync内で確定させる。
+    """
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
+
+async def dispose_async_engine():
+    """非同期エンジンの接続を解放（シャットダウン時）"""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
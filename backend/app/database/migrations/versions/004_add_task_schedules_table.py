@@ -0,0 +1,42 @@
+"""Add task schedules table for persisted critical path results
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-09-01 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create task_schedules table
+    op.create_table(
+        'task_schedules',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('early_start_date', sa.Date(), nullable=False),
+        sa.Column('early_finish_date', sa.Date(), nullable=False),
+        sa.Column('late_start_date', sa.Date(), nullable=False),
+        sa.Column('late_finish_date', sa.Date(), nullable=False),
+        sa.Column('total_float', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('free_float', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('is_critical', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index(op.f('ix_task_schedules_project_id'), 'task_schedules', ['project_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_task_schedules_project_id'), table_name='task_schedules')
+    op.drop_table('task_schedules')
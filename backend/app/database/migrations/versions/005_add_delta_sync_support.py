@@ -0,0 +1,46 @@
+"""Add deleted_records tombstones and indexes for delta sync
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-09-08 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create deleted_records table
+    op.create_table(
+        'deleted_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deleted_records_id'), 'deleted_records', ['id'], unique=False)
+    op.create_index('ix_deleted_records_project_id_deleted_at', 'deleted_records', ['project_id', 'deleted_at'], unique=False)
+
+    # Indexes for "changed since" lookups
+    op.create_index('ix_tasks_project_id_updated_at', 'tasks', ['project_id', 'updated_at'], unique=False)
+    op.create_index(op.f('ix_task_dependencies_created_at'), 'task_dependencies', ['created_at'], unique=False)
+    op.create_index(op.f('ix_task_assignments_assigned_at'), 'task_assignments', ['assigned_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_task_assignments_assigned_at'), table_name='task_assignments')
+    op.drop_index(op.f('ix_task_dependencies_created_at'), table_name='task_dependencies')
+    op.drop_index('ix_tasks_project_id_updated_at', table_name='tasks')
+    op.drop_index('ix_deleted_records_project_id_deleted_at', table_name='deleted_records')
+    op.drop_index(op.f('ix_deleted_records_id'), table_name='deleted_records')
+    op.drop_table('deleted_records')
@@ -0,0 +1,53 @@
+"""Respace task sort_order with gaps and index it per project
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-09-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+SORT_ORDER_GAP = 1024
+
+
+def upgrade():
+    # Keep the current order per project but leave gaps so moves touch one row
+    op.execute(sa.text(
+        """
+        UPDATE tasks
+        SET sort_order = ranked.position * :gap
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY project_id ORDER BY sort_order, id
+            ) AS position
+            FROM tasks
+        ) AS ranked
+        WHERE tasks.id = ranked.id
+        """
+    ).bindparams(gap=SORT_ORDER_GAP))
+    op.create_index('ix_tasks_project_id_sort_order_id', 'tasks', ['project_id', 'sort_order', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_tasks_project_id_sort_order_id', table_name='tasks')
+    op.execute(sa.text(
+        """
+        UPDATE tasks
+        SET sort_order = ranked.position
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY project_id ORDER BY sort_order, id
+            ) AS position
+            FROM tasks
+        ) AS ranked
+        WHERE tasks.id = ranked.id
+        """
+    ))
@@ -0,0 +1,40 @@
+"""Cascade task deletes to subtasks and task child tables
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-09-22 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs referencing tasks.id; constraint names are PostgreSQL defaults
+TASK_FOREIGN_KEYS = [
+    ('tasks', 'parent_task_id'),
+    ('task_assignments', 'task_id'),
+    ('task_dependencies', 'predecessor_id'),
+    ('task_dependencies', 'successor_id'),
+    ('task_comments', 'task_id'),
+    ('task_attachments', 'task_id'),
+]
+
+
+def _recreate_foreign_keys(ondelete):
+    for table, column in TASK_FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'tasks', [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    _recreate_foreign_keys('CASCADE')
+
+
+def downgrade():
+    _recreate_foreign_keys(None)
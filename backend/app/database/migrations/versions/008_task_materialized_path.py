@@ -0,0 +1,54 @@
+"""Add materialized ancestry (root_task_id, path) to tasks
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-09-25 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('tasks', sa.Column('root_task_id', sa.Integer(), nullable=True))
+    op.add_column('tasks', sa.Column('path', sa.String(length=100), nullable=True))
+
+    # path is the ancestor ids from the root ('/' for root tasks, '/1/5/' for a grandchild of 1)
+    op.execute(sa.text(
+        """
+        WITH RECURSIVE tree(id, root_id, path) AS (
+            SELECT id, id, CAST('/' AS VARCHAR(100))
+            FROM tasks
+            WHERE parent_task_id IS NULL
+            UNION ALL
+            SELECT tasks.id, tree.root_id,
+                   CAST(tree.path || CAST(tree.id AS VARCHAR(20)) || '/' AS VARCHAR(100))
+            FROM tasks
+            JOIN tree ON tasks.parent_task_id = tree.id
+        )
+        UPDATE tasks
+        SET root_task_id = tree.root_id, path = tree.path
+        FROM tree
+        WHERE tasks.id = tree.id
+        """
+    ))
+
+    op.create_index('ix_tasks_root_task_id', 'tasks', ['root_task_id'], unique=False)
+    op.create_index(
+        'ix_tasks_project_id_path', 'tasks', ['project_id', 'path'], unique=False,
+        postgresql_ops={'path': 'varchar_pattern_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('ix_tasks_project_id_path', table_name='tasks')
+    op.drop_index('ix_tasks_root_task_id', table_name='tasks')
+    op.drop_column('tasks', 'path')
+    op.drop_column('tasks', 'root_task_id')
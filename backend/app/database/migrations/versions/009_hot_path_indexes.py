@@ -0,0 +1,61 @@
+"""Add composite and partial indexes for the service hot paths
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-09-29 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+# Statuses scanned by the deadline alert job (partial index predicate)
+OPEN_TASK_STATUSES = "status IN ('not_started', 'in_progress')"
+
+
+def upgrade():
+    # tasks.project_id is already the leading column of ix_tasks_project_id_* (005, 006, 008)
+    op.create_index(op.f('ix_tasks_parent_task_id'), 'tasks', ['parent_task_id'], unique=False)
+    op.create_index(
+        'ix_tasks_open_planned_end_date', 'tasks', ['planned_end_date'], unique=False,
+        postgresql_where=sa.text(OPEN_TASK_STATUSES), sqlite_where=sa.text(OPEN_TASK_STATUSES)
+    )
+
+    # Lookups and ON DELETE CASCADE from tasks (PostgreSQL does not index foreign keys)
+    op.create_index('ix_task_dependencies_predecessor_id_successor_id', 'task_dependencies', ['predecessor_id', 'successor_id'], unique=False)
+    op.create_index(op.f('ix_task_dependencies_successor_id'), 'task_dependencies', ['successor_id'], unique=False)
+    op.create_index('ix_task_assignments_task_id_user_id', 'task_assignments', ['task_id', 'user_id'], unique=False)
+    op.create_index(op.f('ix_task_assignments_user_id'), 'task_assignments', ['user_id'], unique=False)
+    op.create_index(op.f('ix_task_comments_task_id'), 'task_comments', ['task_id'], unique=False)
+    op.create_index(op.f('ix_task_attachments_task_id'), 'task_attachments', ['task_id'], unique=False)
+
+    # Permission checks and "my projects"
+    op.create_index('ix_project_members_project_id_user_id', 'project_members', ['project_id', 'user_id'], unique=False)
+    op.create_index(op.f('ix_project_members_user_id'), 'project_members', ['user_id'], unique=False)
+    op.create_index(op.f('ix_projects_created_by'), 'projects', ['created_by'], unique=False)
+
+    # notifications is not created by these migrations; index it where it exists
+    if 'notifications' in sa.inspect(op.get_bind()).get_table_names():
+        op.create_index('ix_notifications_user_id_is_read_created_at', 'notifications', ['user_id', 'is_read', 'created_at'], unique=False)
+
+
+def downgrade():
+    if 'notifications' in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_index('ix_notifications_user_id_is_read_created_at', table_name='notifications')
+    op.drop_index(op.f('ix_projects_created_by'), table_name='projects')
+    op.drop_index(op.f('ix_project_members_user_id'), table_name='project_members')
+    op.drop_index('ix_project_members_project_id_user_id', table_name='project_members')
+    op.drop_index(op.f('ix_task_attachments_task_id'), table_name='task_attachments')
+    op.drop_index(op.f('ix_task_comments_task_id'), table_name='task_comments')
+    op.drop_index(op.f('ix_task_assignments_user_id'), table_name='task_assignments')
+    op.drop_index('ix_task_assignments_task_id_user_id', table_name='task_assignments')
+    op.drop_index(op.f('ix_task_dependencies_successor_id'), table_name='task_dependencies')
+    op.drop_index('ix_task_dependencies_predecessor_id_successor_id', table_name='task_dependencies')
+    op.drop_index('ix_tasks_open_planned_end_date', table_name='tasks')
+    op.drop_index(op.f('ix_tasks_parent_task_id'), table_name='tasks')
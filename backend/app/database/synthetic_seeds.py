@@ -0,0 +1,353 @@
+"""
+Synthetic data generator for load and benchmark testing
+
+Generates production-scale datasets: users, projects (task counts skewed so a
+few projects are very large), 4-level task hierarchies in display order,
+dependency DAGs, assignments, comments and notifications. Output is fully
+determined by --seed. IDs are allocated up front, so rows reference each other
+without RETURNING. They are bulk-loaded with COPY on PostgreSQL and
+executemany elsewhere (SQLite), in one transaction.
+
+Usage (from the backend directory):
+    python -m app.database.synthetic_seeds --users 2000 --projects 50 --tasks 500000
+    python -m app.database.synthetic_seeds --profile large --seed 7
+    python -m app.database.synthetic_seeds --profile small --create-tables   # scratch DB without migrations
+
+All generated users share the password "password".
+"""
+import argparse
+import csv
+import io
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import func, inspect, select
+from sqlalchemy.engine import Engine
+
+from app.database.connection import engine as default_engine
+from app.models.user import User
+from app.utils.auth import get_password_hash
+
+SORT_ORDER_GAP = 1024  # app.services.task_service.SORT_ORDER_GAP と同じ間隔
+MAX_LEVEL = 3
+
+class SyntheticConfig(NamedTuple):
+    """生成するデータセットの規模"""
+    users: int = 200
+    projects: int = 10
+    tasks: int = 20_000  # 全プロジェクト合計
+    max_tasks_per_project: int = 100_000
+    members_per_project: int = 12
+    comment_rate: float = 0.3  # コメントを持つタスクの割合
+    notifications_per_user: int = 5
+    seed: int = 42
+    prefix: str = "load"  # ユーザー名・メールの接頭辞
+
+PROFILES = {
+    "small": SyntheticConfig(users=50, projects=5, tasks=5_000),
+    "medium": SyntheticConfig(users=500, projects=30, tasks=100_000),
+    "large": SyntheticConfig(users=5_000, projects=100, tasks=600_000),
+}
+
+# 挿入順（外部キーの参照先が先）と列
+TABLES = {
+    "users": ["id", "username", "email", "password_hash", "full_name", "company",
+              "department", "role_level", "is_active"],
+    "projects": ["id", "name", "description", "start_date", "end_date", "status",
+                 "category", "created_by"],
+    "project_members": ["id", "project_id", "user_id", "role"],
+    "tasks": ["id", "project_id", "parent_task_id", "root_task_id", "path", "level", "name",
+              "planned_start_date", "planned_end_date", "actual_start_date", "actual_end_date",
+              "estimated_hours", "actual_hours", "progress_rate", "priority", "status",
+              "is_milestone", "category", "sort_order"],
+    "task_dependencies": ["id", "predecessor_id", "successor_id", "dependency_type", "lag_days"],
+    "task_assignments": ["id", "task_id", "user_id"],
+    "task_comments": ["id", "task_id", "user_id", "comment"],
+    "notifications": ["id", "user_id", "type", "title", "message", "is_read", "is_email_sent",
+                      "project_id", "task_id", "created_at"],
+}
+
+DEPARTMENTS = ["開発部", "営業部", "企画部", "品質保証部", "インフラ部", "デザイン部"]
+PROJECT_CATEGORIES = ["Web開発", "アプリ開発", "インフラ", "社内システム", "研究開発"]
+TASK_CATEGORIES = [None, "設計", "開発", "テスト", "リリース", "調査"]
+PHASES = ["要件定義", "基本設計", "詳細設計", "実装", "結合テスト", "受入テスト", "移行", "運用準備"]
+WORK_ITEMS = ["画面", "API", "バッチ", "帳票", "データ移行", "認証", "通知", "検索", "設定", "ログ"]
+ACTIONS = ["設計", "実装", "レビュー", "テスト", "修正", "ドキュメント作成"]
+COMMENTS = ["対応しました。", "レビューをお願いします。", "仕様を確認中です。",
+            "期限を調整したいです。", "テストで不具合が見つかりました。", "完了しました。"]
+NOTIFICATION_TYPES = ["deadline_alert", "task_assigned", "progress_delay"]
+
+class IdAllocator:
+    """テーブルごとに既存の最大ID以降を連番で払い出す"""
+
+    def __init__(self, start: Dict[str, int]):
+        self._next = dict(start)
+
+    def __call__(self, table: str) -> int:
+        value = self._next[table]
+        self._next[table] = value + 1
+        return value
+
+class BulkLoader:
+    """行をテーブルごとにバッファし、参照先のテーブルから順にまとめて書き込む"""
+
+    def __init__(self, connection, tables: Dict[str, List[str]], chunk_size: int = 50_000):
+        self.connection = connection
+        self.tables = tables
+        self.chunk_size = chunk_size
+        self.buffers = {table: [] for table in tables}
+        self.counts = {table: 0 for table in tables}
+        self.postgres = connection.dialect.name == "postgresql"
+
+    def add(self, table: str, row: tuple):
+        if table not in self.tables:
+            return
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            # 他テーブルのバッファが参照する行を先に書き込むため全テーブルを順に書き出す
+            self.flush()
+
+    def flush(self):
+        for table, rows in self.buffers.items():
+            if rows:
+                self._write(table, self.tables[table], rows)
+                self.counts[table] += len(rows)
+                rows.clear()
+
+    def _write(self, table: str, columns: List[str], rows: List[tuple]):
+        cursor = self.connection.connection.cursor()
+        try:
+            if self.postgres:
+                data = io.StringIO()
+                csv.writer(data).writerows(rows)  # Noneは空欄（NULL）になる
+                data.seek(0)
+                cursor.copy_expert(
+                    f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", data
+                )
+            else:
+                placeholder = "?" if self.connection.dialect.paramstyle == "qmark" else "%s"
+                cursor.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join([placeholder] * len(columns))})",
+                    rows
+                )
+        finally:
+            cursor.close()
+
+def project_sizes(rng: random.Random, config: SyntheticConfig) -> List[int]:
+    """合計がconfig.tasks程度になるよう、パレート分布で偏らせたプロジェクトごとのタスク数"""
+    weights = [rng.paretovariate(1.2) for _ in range(config.projects)]
+    total = sum(weights)
+    return [
+        max(1, min(config.max_tasks_per_project, round(config.tasks * weight / total)))
+        for weight in weights
+    ]
+
+def task_tree(rng: random.Random, size: int) -> List[tuple]:
+    """size件のタスク階層を表示順（深さ優先）で (level, 親の位置) のリストとして生成
+
+    ルート（フェーズ）の下に2〜8件、その下に0〜6件…と枝分かれし、最大4階層。
+    """
+    nodes = []
+    branching = {0: (2, 8), 1: (0, 6), 2: (0, 4)}
+
+    def add(level: int, parent: Optional[int]):
+        position = len(nodes)
+        nodes.append((level, parent))
+        if level < MAX_LEVEL:
+            low, high = branching[level]
+            for _ in range(rng.randint(low, high)):
+                if len(nodes) >= size:
+                    return
+                add(level + 1, position)
+
+    while len(nodes) < size:
+        add(0, None)
+    return nodes
+
+class SyntheticDataGenerator:
+    """設定と乱数シードから行を生成してBulkLoaderに渡す"""
+
+    def __init__(self, config: SyntheticConfig, loader: BulkLoader, next_id: IdAllocator):
+        self.config = config
+        self.loader = loader
+        self.next_id = next_id
+        self.rng = random.Random(config.seed)
+        # 通知は別系列の乱数で生成し、通知テーブルの有無で他のデータが変わらないようにする
+        self.notification_rng = random.Random(config.seed + 1)
+        self.origin = date(2025, 1, 1)  # 実行日に依存しないよう固定
+        self.user_ids: List[int] = []
+
+    def run(self):
+        self.generate_users()
+        for index, size in enumerate(project_sizes(self.rng, self.config)):
+            self.generate_project(index, size)
+        self.loader.flush()
+
+    def generate_users(self):
+        password_hash = get_password_hash("password")  # bcryptは遅いため全ユーザーで共有
+        prefix = self.config.prefix
+        for i in range(self.config.users):
+            user_id = self.next_id("users")
+            self.user_ids.append(user_id)
+            self.loader.add("users", (
+                user_id, f"{prefix}_user{i}", f"{prefix}_user{i}@example.com", password_hash,
+                f"ユーザー {i}", "Gunchart Inc.", self.rng.choice(DEPARTMENTS),
+                "manager" if i % 20 == 0 else "member", True
+            ))
+            if "notifications" in self.loader.tables:
+                self.generate_notifications(user_id)
+
+    def generate_notifications(self, user_id: int):
+        rng = self.notification_rng
+        origin = datetime.combine(self.origin, datetime.min.time())
+        for n in range(self.config.notifications_per_user):
+            self.loader.add("notifications", (
+                self.next_id("notifications"), user_id, rng.choice(NOTIFICATION_TYPES),
+                f"お知らせ {n + 1}", "タスクの状況が更新されました。", rng.random() < 0.6,
+                False, None, None, origin + timedelta(minutes=rng.randrange(525_600))
+            ))
+
+    def generate_project(self, index: int, size: int):
+        rng = self.rng
+        project_id = self.next_id("projects")
+        members = rng.sample(self.user_ids, min(len(self.user_ids), self.config.members_per_project))
+        start = self.origin + timedelta(days=rng.randrange(180))
+        duration = max(60, min(720, size // 20 + rng.randrange(60, 240)))
+        self.loader.add("projects", (
+            project_id, f"負荷試験プロジェクト {index + 1}", f"{size}件のタスクを持つ合成データ",
+            start, start + timedelta(days=duration), "active", rng.choice(PROJECT_CATEGORIES),
+            members[0]
+        ))
+        for i, user_id in enumerate(members):
+            self.loader.add("project_members", (
+                self.next_id("project_members"), project_id, user_id,
+                "manager" if i == 0 else rng.choice(["member", "member", "member", "viewer"])
+            ))
+
+        tasks = []  # 位置 → (id, path, root_id, 開始日, 終了日)
+        last_child = {}  # 親の位置 → 直前の兄弟タスクID
+        dependencies = set()
+        for position, (level, parent) in enumerate(task_tree(rng, size)):
+            task_id = self.next_id("tasks")
+            if parent is None:
+                parent_id, path, root_id = None, "/", task_id
+                span_start, span_end = start, start + timedelta(days=duration)
+            else:
+                parent_id, parent_path, root_id, span_start, span_end = tasks[parent]
+                path = f"{parent_path}{parent_id}/"
+            span = max(1, (span_end - span_start).days)
+            offset = rng.randrange(span)
+            planned_start = span_start + timedelta(days=offset)
+            planned_end = planned_start + timedelta(days=max(1, min(span - offset, rng.randint(1, 30 * (4 - level)))))
+            tasks.append((task_id, path, root_id, planned_start, planned_end))
+
+            status = rng.choices(["not_started", "in_progress", "completed", "on_hold"], [4, 3, 3, 1])[0]
+            progress = {"not_started": 0, "completed": 100}.get(status, rng.randrange(10, 100, 10))
+            estimated = rng.choice([4, 8, 16, 24, 40]) if level else 0
+            actual_start = planned_start if status != "not_started" else None
+            actual_end = planned_end if status == "completed" else None
+            name = (PHASES[position % len(PHASES)] if level == 0
+                    else f"{rng.choice(WORK_ITEMS)}{rng.choice(ACTIONS)} {position + 1}")
+            self.loader.add("tasks", (
+                task_id, project_id, parent_id, root_id, path, level, name,
+                planned_start, planned_end, actual_start, actual_end,
+                estimated, estimated * progress // 100, progress,
+                rng.choice(["high", "medium", "medium", "low"]), status,
+                level > 0 and rng.random() < 0.02, rng.choice(TASK_CATEGORIES),
+                (position + 1) * SORT_ORDER_GAP
+            ))
+
+            # 依存関係: 直前の兄弟からの終了→開始と、先行する無関係なタスクからの依存（常に前→後なのでDAG）
+            if parent is not None and parent in last_child and rng.random() < 0.6:
+                dependencies.add((last_child[parent], task_id))
+            if position > 10 and rng.random() < 0.1:
+                other_id, other_path = tasks[rng.randrange(position)][:2]
+                if f"/{other_id}/" not in path and f"/{task_id}/" not in other_path:
+                    dependencies.add((other_id, task_id))
+            last_child[parent] = task_id
+
+            if level > 0:
+                for user_id in rng.sample(members, 1 if rng.random() < 0.85 else min(2, len(members))):
+                    self.loader.add("task_assignments", (self.next_id("task_assignments"), task_id, user_id))
+            if rng.random() < self.config.comment_rate:
+                for _ in range(rng.randint(1, 3)):
+                    self.loader.add("task_comments", (
+                        self.next_id("task_comments"), task_id, rng.choice(members), rng.choice(COMMENTS)
+                    ))
+
+        for predecessor_id, successor_id in sorted(dependencies):
+            self.loader.add("task_dependencies", (
+                self.next_id("task_dependencies"), predecessor_id, successor_id,
+                "finish_to_start", rng.choice([0, 0, 0, 1, 2])
+            ))
+
+def _existing_tables(engine: Engine) -> Dict[str, List[str]]:
+    """存在するテーブルだけを対象にする（notificationsはマイグレーションで作成されない）"""
+    names = set(inspect(engine).get_table_names())
+    return {table: columns for table, columns in TABLES.items() if table in names}
+
+def create_tables(engine: Engine = default_engine):
+    """マイグレーションを使わない使い捨てDB（負荷試験用SQLiteなど）にテーブルを作成"""
+    import app.models.project, app.models.task, app.models.template  # noqa: F401  Base.metadataに登録
+    from app.database.connection import Base
+    Base.metadata.create_all(bind=engine)
+
+def seed_synthetic_data(config: SyntheticConfig, engine: Engine = default_engine,
+                        chunk_size: int = 50_000) -> Dict[str, int]:
+    """合成データを1トランザクションで投入し、テーブルごとの件数を返す"""
+    tables = _existing_tables(engine)
+    with engine.begin() as connection:
+        taken = connection.scalar(
+            select(func.count()).select_from(User).where(User.username.like(f"{config.prefix}\\_user%", escape="\\"))
+        )
+        if taken:
+            raise ValueError(f"接頭辞 '{config.prefix}' のユーザーが既に存在します（--prefix を変更してください）")
+
+        start = {
+            table: (connection.exec_driver_sql(f"SELECT MAX(id) FROM {table}").scalar() or 0) + 1
+            for table in tables
+        }
+        loader = BulkLoader(connection, tables, chunk_size)
+        SyntheticDataGenerator(config, loader, IdAllocator(start)).run()
+
+        if connection.dialect.name == "postgresql":
+            # IDを明示して投入したためシーケンスを進める
+            for table in tables:
+                connection.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                )
+        connection.exec_driver_sql("ANALYZE")
+    return loader.counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset for load testing")
+    parser.add_argument("--profile", choices=sorted(PROFILES), help="preset sizes (other options override)")
+    for field, default in SyntheticConfig._field_defaults.items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=None)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--create-tables", action="store_true",
+                        help="create missing tables first (scratch databases without migrations)")
+    args = parser.parse_args()
+
+    config = PROFILES[args.profile] if args.profile else SyntheticConfig()
+    config = config._replace(**{
+        field: getattr(args, field) for field in SyntheticConfig._fields if getattr(args, field) is not None
+    })
+
+    if args.create_tables:
+        create_tables()
+    started = time.perf_counter()
+    counts = seed_synthetic_data(config, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    for table, count in counts.items():
+        print(f"{table:>18} {count:>10,}")
+    print(f"{'total':>18} {total:>10,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
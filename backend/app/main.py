@@ -1,8 +1,12 @@
-from fastapi import FastAPI
+import anyio.to_thread
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import SQLAlchemyError
-from app.api import auth, users, projects, tasks
-from app.database.connection import engine
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.api import auth, users, projects, tasks, reports
+from app.config import settings
+from app.database.connection import engine, dispose_async_engine
+from app.services.report_service import report_service
 from app.models import user, project, task
 from app.utils.exceptions import (
     GunchartException, 
@@ -10,6 +14,8 @@ from app.utils.exceptions import (
     sqlalchemy_exception_handler,
     general_exception_handler
 )
+from app.utils.metrics import MetricsMiddleware
+from app.utils.query_counter import QueryCounterMiddleware
 
 app = FastAPI(
     title="Gunchart Backend API",
@@ -32,13 +38,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-DB-Queries", "X-DB-Time", "X-Report-Cache"],
 )
 
+# リクエストごとのSQL発行数・DB時間（N+1の検出）
+if settings.query_counter_enabled:
+    app.add_middleware(QueryCounterMiddleware)
+
+# ルート単位のレイテンシ・ステータス（/metrics で公開）
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Create database tables
 # user.Base.metadata.create_all(bind=engine)
 # project.Base.metadata.create_all(bind=engine)
 # task.Base.metadata.create_all(bind=engine)
 
+@app.on_event("startup")
+async def configure_threadpool():
+    """同期エンドポイント（def）を実行するスレッドプールの上限を設定"""
+    # DB接続プールを超えるスレッドは接続待ちになるだけなので上限を揃える
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_max_workers
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
+
+@app.on_event("shutdown")
+def stop_pdf_renderer():
+    report_service.pdf_renderer.shutdown()
+
 # Add exception handlers
 app.add_exception_handler(GunchartException, gunchart_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
@@ -49,6 +78,7 @@ app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(projects.router, prefix="/api/projects", tags=["projects"])
 app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
+app.include_router(reports.router, prefix="/api", tags=["reports"])
 
 @app.get("/")
 async def root():
@@ -56,4 +86,10 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Prometheus テキスト形式のメトリクス"""
+        return Response(generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
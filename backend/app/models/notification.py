@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -24,6 +24,10 @@ class Notification(Base):
     read_at = Column(DateTime, nullable=True)
     email_sent_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        Index('ix_notifications_user_id_is_read_created_at', 'user_id', 'is_read', 'created_at'),
+    )
+
     # Relationships
     user = relationship("User", back_populates="notifications")
     project = relationship("Project", back_populates="notifications")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.database.connection import Base
 
@@ -12,7 +12,7 @@ class Project(Base):
     end_date = Column(Date, nullable=False)
     status = Column(String(20), default='active')  # 'active', 'completed', 'archived', 'on_hold'
     category = Column(String(50))
-    created_by = Column(Integer, ForeignKey('users.id'), nullable=False)
+    created_by = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -29,10 +29,14 @@ class ProjectMember(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     role = Column(String(20), default='member')  # 'manager', 'member', 'viewer'
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index('ix_project_members_project_id_user_id', 'project_id', 'user_id'),
+    )
+
     # Relationships
     project = relationship("Project", back_populates="members")
     user = relationship("User", back_populates="project_memberships")
@@ -1,14 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, func
-from sqlalchemy.orm import relationship
+from typing import List
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, Index, and_, bindparam, func, or_, text
+from sqlalchemy.orm import relationship, object_session
 from app.database.connection import Base
 
+# 未完了タスクのステータス（期限アラートの部分インデックスの条件）
+OPEN_TASK_STATUSES = ('not_started', 'in_progress')
+_OPEN_TASK_CONDITION = "status IN (%s)" % ", ".join(f"'{status}'" for status in OPEN_TASK_STATUSES)
+
 class Task(Base):
     __tablename__ = "tasks"
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
-    parent_task_id = Column(Integer, ForeignKey('tasks.id'), nullable=True)
+    parent_task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=True, index=True)
     level = Column(Integer, default=0)  # 0=root, 1=sub, 2=sub-sub, 3=sub-sub-sub
+    root_task_id = Column(Integer, index=True)  # タスクグループのルートタスクID（ルートタスクは自身のID）
+    path = Column(String(100))  # ルートからの祖先IDの並び（ルートタスクは'/'、例: '/1/5/'）
     name = Column(String(300), nullable=False)
     description = Column(Text)
     planned_start_date = Column(Date)
@@ -26,71 +33,110 @@ class Task(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index('ix_tasks_project_id_updated_at', 'project_id', 'updated_at'),
+        Index('ix_tasks_project_id_sort_order_id', 'project_id', 'sort_order', 'id'),
+        # 子孫の前方一致検索用（PostgreSQLはロケールに依存せずLIKEで使えるよう pattern_ops）
+        Index('ix_tasks_project_id_path', 'project_id', 'path',
+              postgresql_ops={'path': 'varchar_pattern_ops'}),
+        # 期限アラートの走査用（未完了タスクのみの部分インデックス）
+        Index('ix_tasks_open_planned_end_date', 'planned_end_date',
+              postgresql_where=text(_OPEN_TASK_CONDITION), sqlite_where=text(_OPEN_TASK_CONDITION)),
+    )
+
     # Relationships
     project = relationship("Project", back_populates="tasks")
     parent_task = relationship("Task", remote_side=[id], back_populates="subtasks")
-    subtasks = relationship("Task", back_populates="parent_task", cascade="all, delete-orphan")
+    subtasks = relationship("Task", back_populates="parent_task", cascade="all, delete-orphan", passive_deletes=True)
     
     @property
     def task_group_root_id(self):
         """Get the root task ID for this task's group"""
+        if self.root_task_id is not None:
+            return self.root_task_id
+
+        # 未フラッシュのタスクは親を辿る
         current = self
         while current.parent_task_id is not None:
             current = current.parent_task
         return current.id
-    
+
+    @property
+    def ancestor_ids(self) -> List[int]:
+        """祖先タスクIDをルートから順に取得（pathから算出、クエリなし）"""
+        if not self.path:
+            return []
+        return [int(part) for part in self.path.strip('/').split('/') if part]
+
+    @property
+    def descendant_path_prefix(self) -> str:
+        """子孫タスクのpathが前方一致する文字列"""
+        return f"{self.path}{self.id}/"
+
     def get_siblings_and_ancestors(self):
         """Get all tasks in the same group that can be predecessors"""
-        from sqlalchemy.orm import Session
-        from app.database.connection import SessionLocal
-        
         if self.level == 0:
             # Root tasks can have any task in same project as predecessor
             return []
             
         if self.parent_task_id is None:
             return []
-            
-        # Get all tasks with same parent (siblings) and all ancestor tasks
-        valid_predecessors = []
-        
-        # Add siblings (same parent_task_id)
-        siblings = self.parent_task.subtasks if self.parent_task else []
-        valid_predecessors.extend([t for t in siblings if t.id != self.id])
-        
-        # Add parent and its ancestors
-        current = self.parent_task
-        while current is not None:
-            valid_predecessors.append(current)
-            current = current.parent_task
-            
-        return valid_predecessors
-    assignments = relationship("TaskAssignment", back_populates="task", cascade="all, delete-orphan")
+
+        # 兄弟（同じ親）と祖先を1回のクエリで取得
+        ancestor_ids = self.ancestor_ids
+        tasks = object_session(self).query(Task).filter(
+            or_(
+                and_(Task.parent_task_id == self.parent_task_id, Task.id != self.id),
+                Task.id.in_(ancestor_ids)
+            )
+        ).order_by(Task.sort_order, Task.id).all()
+
+        # 兄弟→親→祖先の順に並べる
+        ancestors = {task.id: task for task in tasks if task.id in ancestor_ids}
+        siblings = [task for task in tasks if task.id not in ancestors]
+        return siblings + [ancestors[task_id] for task_id in reversed(ancestor_ids) if task_id in ancestors]
+
+    # 子テーブルはDB側の ON DELETE CASCADE で削除する（未ロードの関連は読み込まない）
+    assignments = relationship("TaskAssignment", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
     dependencies_as_predecessor = relationship(
         "TaskDependency", 
         foreign_keys="TaskDependency.predecessor_id", 
         back_populates="predecessor",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
     dependencies_as_successor = relationship(
         "TaskDependency", 
         foreign_keys="TaskDependency.successor_id", 
         back_populates="successor",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
-    comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan")
-    attachments = relationship("TaskAttachment", back_populates="task", cascade="all, delete-orphan")
+    comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
+    attachments = relationship("TaskAttachment", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
+    schedule = relationship("TaskSchedule", back_populates="task", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Task(name='{self.name}', status='{self.status}')>"
 
+def open_task_filter():
+    """未完了タスクの条件
+
+    部分インデックスの条件と一致させるため、ステータスはバインド変数ではなくSQLに埋め込む。
+    """
+    return Task.status.in_(bindparam("open_task_statuses", list(OPEN_TASK_STATUSES), literal_execute=True))
+
 class TaskAssignment(Base):
     __tablename__ = "task_assignments"
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey('tasks.id'), nullable=False)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
-    assigned_at = Column(DateTime(timezone=True), server_default=func.now())
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+    assigned_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    __table_args__ = (
+        Index('ix_task_assignments_task_id_user_id', 'task_id', 'user_id'),
+    )
 
     # Relationships
     task = relationship("Task", back_populates="assignments")
@@ -103,11 +149,15 @@ class TaskDependency(Base):
     __tablename__ = "task_dependencies"
 
     id = Column(Integer, primary_key=True, index=True)
-    predecessor_id = Column(Integer, ForeignKey('tasks.id'), nullable=False)
-    successor_id = Column(Integer, ForeignKey('tasks.id'), nullable=False)
+    predecessor_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
+    successor_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False, index=True)
     dependency_type = Column(String(20), default='finish_to_start')  # 'fs', 'ss', 'ff', 'sf'
     lag_days = Column(Integer, default=0)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    __table_args__ = (
+        Index('ix_task_dependencies_predecessor_id_successor_id', 'predecessor_id', 'successor_id'),
+    )
 
     # Relationships
     predecessor = relationship("Task", foreign_keys=[predecessor_id], back_populates="dependencies_as_predecessor")
@@ -120,7 +170,7 @@ class TaskComment(Base):
     __tablename__ = "task_comments"
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey('tasks.id'), nullable=False)
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     comment = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -136,7 +186,7 @@ class TaskAttachment(Base):
     __tablename__ = "task_attachments"
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey('tasks.id'), nullable=False)
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=False)
@@ -149,4 +199,42 @@ class TaskAttachment(Base):
     user = relationship("User", back_populates="task_attachments")
 
     def __repr__(self):
-        return f"<TaskAttachment(task_id={self.task_id}, filename='{self.filename}')>"
\ No newline at end of file
+        return f"<TaskAttachment(task_id={self.task_id}, filename='{self.filename}')>"
+
+
+class TaskSchedule(Base):
+    __tablename__ = "task_schedules"
+
+    task_id = Column(Integer, ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+    early_start_date = Column(Date, nullable=False)
+    early_finish_date = Column(Date, nullable=False)
+    late_start_date = Column(Date, nullable=False)
+    late_finish_date = Column(Date, nullable=False)
+    total_float = Column(Integer, nullable=False, default=0)
+    free_float = Column(Integer, nullable=False, default=0)
+    is_critical = Column(Boolean, nullable=False, default=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    task = relationship("Task", back_populates="schedule")
+
+    def __repr__(self):
+        return f"<TaskSchedule(task_id={self.task_id}, total_float={self.total_float})>"
+
+class DeletedRecord(Base):
+    """差分同期用の削除記録（トゥームストーン）"""
+    __tablename__ = "deleted_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    entity_type = Column(String(20), nullable=False)  # 'task', 'dependency', 'assignment'
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_deleted_records_project_id_deleted_at', 'project_id', 'deleted_at'),
+    )
+
+    def __repr__(self):
+        return f"<DeletedRecord(entity_type='{self.entity_type}', entity_id={self.entity_id})>"
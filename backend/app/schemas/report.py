@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+from datetime import date, datetime
+
+class ExportJobCreate(BaseModel):
+    """レポート出力ジョブの登録"""
+    report_type: Literal["tasks_excel", "progress_pdf"]
+    project_id: int
+    report_date: Optional[date] = None  # progress_pdf の基準日（省略時は当日）
+
+class ExportJob(BaseModel):
+    """レポート出力ジョブの状態"""
+    job_id: str
+    report_type: str
+    project_id: int
+    report_date: Optional[date] = None
+    status: str  # pending / running / completed / failed
+    filename: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: datetime
+    size: Optional[int] = None
+    error: Optional[str] = None
+    deduplicated: bool = False  # 同じ内容の既存ジョブを返した場合はTrue
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import date, datetime
 
 class TaskBase(BaseModel):
@@ -151,6 +151,87 @@ class TaskHierarchy(BaseModel):
     class Config:
         from_attributes = True
 
+class TaskScheduleEntry(BaseModel):
+    task_id: int
+    early_start_date: date
+    early_finish_date: date
+    late_start_date: date
+    late_finish_date: date
+    total_float: int
+    free_float: int
+    is_critical: bool
+
+class ProjectSchedule(BaseModel):
+    """クリティカルパス計算結果"""
+    project_id: int
+    project_start_date: date
+    project_finish_date: date
+    critical_path: List[int] = []
+    tasks: List[TaskScheduleEntry] = []
+    persisted: bool = False
+
+class TaskDateShift(BaseModel):
+    """依存関係の伝播で移動したタスクの計画日"""
+    id: int
+    planned_start_date: Optional[date] = None
+    planned_end_date: Optional[date] = None
+
+class TaskRescheduleResult(BaseModel):
+    task: Task
+    shifted_tasks: List[TaskDateShift] = []
+
+class TaskBatchCreate(TaskBase):
+    """一括作成するタスク（temp_idで同じバッチ内の親タスクを参照できる）"""
+    temp_id: Optional[str] = None
+    parent_task_id: Optional[int] = None
+    parent_temp_id: Optional[str] = None
+    level: Optional[int] = None
+
+class TaskBatchUpdate(TaskUpdate):
+    id: int
+
+class TaskBatchRequest(BaseModel):
+    """タスクの一括作成・更新・削除（1トランザクションで適用）"""
+    create: List[TaskBatchCreate] = []
+    update: List[TaskBatchUpdate] = []
+    delete: List[int] = []
+
+class TaskBatchResult(BaseModel):
+    temp_id_map: Dict[str, int] = {}
+    created: List[Task] = []
+    updated: List[Task] = []
+    deleted: List[int] = []
+
+class DeletedRecord(BaseModel):
+    entity_type: str
+    entity_id: int
+    deleted_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class TaskChanges(BaseModel):
+    """差分同期の結果（sinceなし、または削除記録の保持期間より古いカーソルの場合は全件）"""
+    project_id: int
+    cursor: str
+    full: bool = False
+    tasks: List[Task] = []
+    dependencies: List[TaskDependency] = []
+    assignments: List[TaskAssignment] = []
+    deleted: List[DeletedRecord] = []
+
+class TaskMoveRequest(BaseModel):
+    """表示順の移動先（どちらも未指定なら末尾）"""
+    after_task_id: Optional[int] = None
+    before_task_id: Optional[int] = None
+
+class TaskReorderRequest(BaseModel):
+    task_ids: List[int]
+
+class TaskSortOrder(BaseModel):
+    id: int
+    sort_order: int
+
 # Fix forward reference
 TaskWithAssignments.model_rebuild()
 TaskHierarchy.model_rebuild()
\ No newline at end of file
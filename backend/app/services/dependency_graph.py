@@ -0,0 +1,196 @@
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.task import Task, TaskDependency
+from app.utils.project_version import get_shared_project_version
+
+# 依存関係種別のコード（'fs'などの略称と正式名称の両方を受け付ける）
+FINISH_TO_START = 0
+START_TO_START = 1
+FINISH_TO_FINISH = 2
+START_TO_FINISH = 3
+
+DEPENDENCY_TYPE_CODES = {
+    "finish_to_start": FINISH_TO_START,
+    "fs": FINISH_TO_START,
+    "start_to_start": START_TO_START,
+    "ss": START_TO_START,
+    "finish_to_finish": FINISH_TO_FINISH,
+    "ff": FINISH_TO_FINISH,
+    "start_to_finish": START_TO_FINISH,
+    "sf": START_TO_FINISH,
+}
+
+def dependency_type_code(dependency_type: Optional[str]) -> int:
+    """依存関係種別の文字列をコードに変換（未知の値は終了→開始として扱う）"""
+    return DEPENDENCY_TYPE_CODES.get((dependency_type or "").lower(), FINISH_TO_START)
+
+def _build_csr(size: int, keys: array) -> Tuple[array, array]:
+    """キー配列から CSR 形式（オフセット配列と要素番号配列）のインデックスを作成"""
+    offsets = array("l", [0]) * (size + 1)
+    for key in keys:
+        offsets[key + 1] += 1
+    for i in range(size):
+        offsets[i + 1] += offsets[i]
+    items = array("l", [0]) * len(keys)
+    cursor = offsets[:-1]
+    for item, key in enumerate(keys):
+        items[cursor[key]] = item
+        cursor[key] += 1
+    return offsets, items
+
+class ProjectTaskGraph:
+    """プロジェクト単位のタスク依存関係グラフ
+
+    タスクは 0..n-1 の連番インデックスで表し、隣接リストをコンパクトな配列で保持する。
+    読み取り専用として扱い、変更時は再読み込みする。階層は Task.path / root_task_id で扱う。
+    """
+
+    def __init__(
+        self,
+        project_id: int,
+        version: int,
+        task_ids: array,
+        edge_predecessors: array,
+        edge_successors: array,
+        edge_types: array,
+        edge_lags: array
+    ):
+        self.project_id = project_id
+        self.version = version
+        self.task_ids = task_ids
+        self.index: Dict[int, int] = {task_id: i for i, task_id in enumerate(task_ids)}
+        self.edge_predecessors = edge_predecessors
+        self.edge_successors = edge_successors
+        self.edge_types = edge_types
+        self.edge_lags = edge_lags
+
+        size = len(task_ids)
+        # 後続・先行の各インデックス
+        self.succ_offsets, self.succ_edges = _build_csr(size, edge_predecessors)
+        self.pred_offsets, self.pred_edges = _build_csr(size, edge_successors)
+
+    @classmethod
+    def load(cls, db: Session, project_id: int, version: int = 0) -> "ProjectTaskGraph":
+        """タスクと依存関係を1回のクエリで読み込んでグラフを構築"""
+        rows = db.query(
+            Task.id,
+            TaskDependency.predecessor_id,
+            TaskDependency.dependency_type,
+            TaskDependency.lag_days
+        ).outerjoin(
+            TaskDependency, TaskDependency.successor_id == Task.id
+        ).filter(Task.project_id == project_id).order_by(Task.id).all()
+
+        task_ids = array("l")
+        dependencies = []
+        for row in rows:
+            if not task_ids or task_ids[-1] != row.id:
+                task_ids.append(row.id)
+            if row.predecessor_id is not None:
+                dependencies.append((row.predecessor_id, row.id, row.dependency_type, row.lag_days))
+
+        index = {task_id: i for i, task_id in enumerate(task_ids)}
+
+        edge_predecessors = array("l")
+        edge_successors = array("l")
+        edge_types = array("b")
+        edge_lags = array("l")
+        for predecessor_id, successor_id, dependency_type, lag_days in dependencies:
+            # 別プロジェクトのタスクへの依存は対象外
+            if predecessor_id not in index:
+                continue
+            edge_predecessors.append(index[predecessor_id])
+            edge_successors.append(index[successor_id])
+            edge_types.append(dependency_type_code(dependency_type))
+            edge_lags.append(lag_days or 0)
+
+        return cls(
+            project_id, version, task_ids,
+            edge_predecessors, edge_successors, edge_types, edge_lags
+        )
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self.index
+
+    def successors(self, task_id: int) -> List[Tuple[int, int, int]]:
+        """後続タスクを (タスクID, 依存種別コード, ラグ日数) のリストで取得"""
+        i = self.index[task_id]
+        start, end = self.succ_offsets[i], self.succ_offsets[i + 1]
+        return [
+            (self.task_ids[self.edge_successors[e]], self.edge_types[e], self.edge_lags[e])
+            for e in self.succ_edges[start:end]
+        ]
+
+    def predecessors(self, task_id: int) -> List[Tuple[int, int, int]]:
+        """先行タスクを (タスクID, 依存種別コード, ラグ日数) のリストで取得"""
+        i = self.index[task_id]
+        start, end = self.pred_offsets[i], self.pred_offsets[i + 1]
+        return [
+            (self.task_ids[self.edge_predecessors[e]], self.edge_types[e], self.edge_lags[e])
+            for e in self.pred_edges[start:end]
+        ]
+
+    def creates_dependency_cycle(self, predecessor_id: int, successor_id: int) -> bool:
+        """predecessor→successor の依存を追加すると循環するかチェック
+
+        successor から後続方向に辿って predecessor に到達できれば循環となる。
+        """
+        if predecessor_id == successor_id:
+            return True
+        if predecessor_id not in self.index or successor_id not in self.index:
+            return False
+
+        target = self.index[predecessor_id]
+        visited = bytearray(len(self.task_ids))
+        stack = [self.index[successor_id]]
+        while stack:
+            current = stack.pop()
+            if current == target:
+                return True
+            if visited[current]:
+                continue
+            visited[current] = 1
+            for e in self.succ_edges[self.succ_offsets[current]:self.succ_offsets[current + 1]]:
+                successor = self.edge_successors[e]
+                if not visited[successor]:
+                    stack.append(successor)
+        return False
+
+_graph_cache: "OrderedDict[int, ProjectTaskGraph]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def get_project_graph(db: Session, project_id: int) -> ProjectTaskGraph:
+    """プロジェクトのグラフを取得（共有の版数が一致する間はキャッシュを再利用）
+
+    プロセス内の版数では他プロセスの書き込みを検知できないため、
+    Redisの版数が使えない場合はキャッシュせず毎回DBから読み込む。
+    """
+    # 読み込み前に版数を取得し、読み込み中の書き込みは次回の再読み込みで反映させる
+    version = get_shared_project_version(project_id)
+    if version is None:
+        with _cache_lock:
+            # 障害中の書き込みはRedisの版数に反映されないため、復旧後に古いグラフを使わない
+            _graph_cache.clear()
+        return ProjectTaskGraph.load(db, project_id)
+
+    with _cache_lock:
+        graph = _graph_cache.get(project_id)
+        if graph is not None and graph.version == version:
+            _graph_cache.move_to_end(project_id)
+            return graph
+
+    graph = ProjectTaskGraph.load(db, project_id, version)
+
+    with _cache_lock:
+        _graph_cache[project_id] = graph
+        _graph_cache.move_to_end(project_id)
+        while len(_graph_cache) > settings.task_graph_cache_size:
+            _graph_cache.popitem(last=False)
+    return graph
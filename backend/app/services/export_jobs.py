@@ -0,0 +1,264 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database.connection import SessionLocal
+from app.schemas.report import ExportJob
+from app.services.report_service import report_service
+from app.utils.project_version import get_project_version
+from app.utils.query_counter import track_queries
+
+# レポート出力ジョブ
+#   登録したジョブをワーカーで生成し、成果物をローカルディスク（settings.export_dir）に
+#   有効期限付きで保存する。クライアントはジョブIDで状態を確認してダウンロードする。
+#   ジョブの状態は成果物と同じディレクトリのJSONに保存し、APIプロセスとワーカーで共有する。
+#   settings.export_job_broker_url 設定時はCeleryワーカー、未設定時はプロセス内のスレッドで生成する。
+#   同じレポート・パラメータ・データ版数のジョブが生成中または有効期限内なら、新しく生成せずそのジョブを返す。
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+_PURGE_INTERVAL_SECONDS = 60.0
+
+class ExportRenderer(NamedTuple):
+    """レポート種別ごとの生成方法"""
+    title: str  # ファイル名の接頭辞
+    extension: str
+    media_type: str
+    render: Callable[[Session, Dict[str, Any], BinaryIO], None]
+
+def _render_tasks_excel(db: Session, params: Dict[str, Any], output: BinaryIO):
+    report_service.write_tasks_excel(db, params["project_id"], output)
+
+def _render_progress_pdf(db: Session, params: Dict[str, Any], output: BinaryIO):
+    report_date = date.fromisoformat(params["report_date"])
+    output.write(report_service.export_project_progress_to_pdf(db, params["project_id"], report_date))
+
+RENDERERS: Dict[str, ExportRenderer] = {
+    "tasks_excel": ExportRenderer(
+        "タスク一覧", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        _render_tasks_excel
+    ),
+    "progress_pdf": ExportRenderer("進捗レポート", "pdf", "application/pdf", _render_progress_pdf),
+}
+
+# 保存先
+
+def _export_dir() -> Path:
+    path = Path(settings.export_dir)
+    (path / "keys").mkdir(parents=True, exist_ok=True)
+    return path
+
+def _job_path(job_id: str) -> Path:
+    return _export_dir() / f"{job_id}.json"
+
+def _key_path(dedup_key: str) -> Path:
+    return _export_dir() / "keys" / dedup_key
+
+def artifact_path(job: ExportJob) -> Path:
+    """生成済みファイルのパス"""
+    return _export_dir() / f"{job.job_id}.{RENDERERS[job.report_type].extension}"
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+def _now() -> datetime:
+    return datetime.utcnow()
+
+def _load(job_id: str) -> Optional[Dict[str, Any]]:
+    if not _JOB_ID.fullmatch(job_id):
+        return None
+    try:
+        return json.loads(_job_path(job_id).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _save(job: Dict[str, Any]):
+    _write_atomic(_job_path(job["job_id"]), json.dumps(job, ensure_ascii=False))
+
+def _is_stale(job: Dict[str, Any]) -> bool:
+    """完了しないまま制限時間を過ぎたジョブ（ワーカーの停止など）"""
+    if job["status"] not in (PENDING, RUNNING):
+        return False
+    created_at = datetime.fromisoformat(job["created_at"])
+    return _now() - created_at > timedelta(seconds=settings.export_job_timeout_seconds)
+
+def _to_schema(job: Dict[str, Any], deduplicated: bool = False) -> ExportJob:
+    if _is_stale(job):
+        job = {**job, "status": FAILED, "error": "制限時間内に完了しませんでした"}
+    return ExportJob(
+        **{field: job.get(field) for field in ExportJob.model_fields if field in job},
+        report_date=job["params"].get("report_date"),
+        deduplicated=deduplicated
+    )
+
+def get_export_job(job_id: str) -> Optional[ExportJob]:
+    """ジョブの状態を取得（存在しない・期限切れはNone）"""
+    job = _load(job_id)
+    if job is None or datetime.fromisoformat(job["expires_at"]) <= _now():
+        return None
+    return _to_schema(job)
+
+# 重複排除
+
+def _reusable(job_id: str) -> Optional[Dict[str, Any]]:
+    """同じ内容の依頼に返せるジョブ（生成中、または成果物が有効期限内）"""
+    job = _load(job_id)
+    if job is None or datetime.fromisoformat(job["expires_at"]) <= _now() or _is_stale(job):
+        return None
+    if job["status"] in (PENDING, RUNNING):
+        return job
+    if job["status"] == COMPLETED and artifact_path(_to_schema(job)).exists():
+        return job
+    return None
+
+def _claim(dedup_key: str, job_id: str) -> Optional[Dict[str, Any]]:
+    """重複排除キーを登録する。同じ内容の有効なジョブが既にあればそのジョブを返す"""
+    path = _key_path(dedup_key)
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        existing = _reusable(path.read_text().strip())
+        if existing is not None:
+            return existing
+        _write_atomic(path, job_id)  # 期限切れ・失敗したジョブのキーを置き換える
+        return None
+    with os.fdopen(fd, "w") as f:
+        f.write(job_id)
+    return None
+
+def _release(dedup_key: str, job_id: str):
+    path = _key_path(dedup_key)
+    try:
+        if path.read_text().strip() == job_id:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+# 登録・実行
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_last_purge = 0.0
+
+def _local_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.export_job_local_workers, thread_name_prefix="export")
+        return _pool
+
+def _dispatch(job_id: str):
+    if settings.export_job_broker_url:
+        try:
+            from app.worker import render_export
+            render_export.delay(job_id)
+            return
+        except Exception as e:
+            # ブローカーに接続できない場合もジョブは失わずにプロセス内で生成する
+            logger.warning(f"出力ジョブをブローカーに登録できないためプロセス内で生成します: {e}")
+    _local_pool().submit(run_export_job, job_id)
+
+def submit_export_job(report_type: str, project_id: int, params: Dict[str, Any],
+                      filename_label: str, user_id: int) -> ExportJob:
+    """出力ジョブを登録してすぐに返す（同じ内容のジョブがあればそれを返す）
+
+    params はJSONに変換できる値のみ。filename_label はファイル名に含める名前（プロジェクト名など）。
+    """
+    purge_expired_exports()
+    renderer = RENDERERS[report_type]
+    params = {"project_id": project_id, **params}
+    # データ版数をキーに含め、書き込み後の依頼は新しく生成する
+    dedup_key = hashlib.sha1(json.dumps(
+        [report_type, params, get_project_version(project_id)], sort_keys=True
+    ).encode()).hexdigest()
+
+    now = _now()
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "report_type": report_type,
+        "project_id": project_id,
+        "params": params,
+        "dedup_key": dedup_key,
+        "user_id": user_id,
+        "status": PENDING,
+        "filename": f"{renderer.title}_{filename_label}_{datetime.now().strftime('%Y%m%d')}.{renderer.extension}",
+        "created_at": now.isoformat(),
+        "expires_at": (now + timedelta(
+            seconds=settings.export_job_timeout_seconds + settings.export_ttl_seconds
+        )).isoformat(),
+    }
+    _save(job)
+    existing = _claim(dedup_key, job["job_id"])
+    if existing is not None:
+        _job_path(job["job_id"]).unlink(missing_ok=True)
+        return _to_schema(existing, deduplicated=True)
+
+    _dispatch(job["job_id"])
+    return _to_schema(job)
+
+def run_export_job(job_id: str):
+    """ジョブのレポートを生成して保存する（ワーカーから呼び出す）"""
+    job = _load(job_id)
+    if job is None or job["status"] != PENDING:
+        return  # 期限切れ削除済み、または再配送された実行済みのジョブ
+
+    job.update(status=RUNNING, started_at=_now().isoformat())
+    _save(job)
+    path = artifact_path(_to_schema(job))
+    tmp = path.with_name(f"{path.name}.part")
+    started = time.perf_counter()
+    try:
+        with track_queries(f"export {job['report_type']} {job_id}"), SessionLocal() as db, open(tmp, "wb") as output:
+            RENDERERS[job["report_type"]].render(db, job["params"], output)
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.exception(f"出力ジョブ {job_id}（{job['report_type']}）の生成に失敗しました")
+        tmp.unlink(missing_ok=True)
+        finished = _now()
+        job.update(status=FAILED, finished_at=finished.isoformat(), error=str(e)[:500],
+                   expires_at=(finished + timedelta(seconds=settings.export_ttl_seconds)).isoformat())
+        _save(job)
+        _release(job["dedup_key"], job_id)  # 失敗したジョブは再依頼で作り直す
+        return
+
+    finished = _now()
+    job.update(status=COMPLETED, finished_at=finished.isoformat(), size=path.stat().st_size,
+               expires_at=(finished + timedelta(seconds=settings.export_ttl_seconds)).isoformat())
+    _save(job)
+    logger.info(f"出力ジョブ {job_id}（{job['report_type']}）を生成しました: {job['size']} bytes, "
+                f"{time.perf_counter() - started:.1f}s")
+
+def purge_expired_exports(force: bool = False):
+    """有効期限を過ぎたジョブと成果物を削除（登録時に一定間隔で実行）"""
+    global _last_purge
+    if not force and time.monotonic() - _last_purge < _PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = time.monotonic()
+    now = _now()
+    for path in _export_dir().glob("*.json"):
+        job = _load(path.stem)
+        if job is None or datetime.fromisoformat(job["expires_at"]) > now:
+            continue
+        artifact = artifact_path(_to_schema(job))
+        artifact.unlink(missing_ok=True)
+        artifact.with_name(f"{artifact.name}.part").unlink(missing_ok=True)
+        _release(job["dedup_key"], job["job_id"])
+        path.unlink(missing_ok=True)
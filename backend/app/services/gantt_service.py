@@ -0,0 +1,130 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.models.project import Project, ProjectMember
+from app.models.task import Task, TaskAssignment, TaskDependency
+from app.models.user import User
+from app.utils.exceptions import NotFoundError, AuthorizationError
+
+class StringTable:
+    """繰り返し出現する文字列を連番コードに置き換える（出現順に採番）"""
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> Optional[int]:
+        if value is None:
+            return None
+        return self._codes.setdefault(value, len(self._codes))
+
+    def codes(self, values) -> List[Optional[int]]:
+        return [self.code(value) for value in values]
+
+    @property
+    def values(self) -> List[str]:
+        return list(self._codes)
+
+def _day_offsets(values, origin: int) -> List[Optional[int]]:
+    """日付を基準日からの日数に変換（未設定はNone）"""
+    return [value.toordinal() - origin if value is not None else None for value in values]
+
+def _columns(rows, names: List[str]) -> Dict[str, list]:
+    """行のリストを列ごとの配列に変換"""
+    return {name: [row[i] for row in rows] for i, name in enumerate(names)}
+
+class GanttService:
+    """ガンチャート描画用のプロジェクト一式を列指向の軽量な形式で組み立てる
+
+    タスク・依存関係・担当者・メンバーは列名→値配列の辞書で返す。
+    ステータス・優先度・カテゴリなどの文字列は strings の表のインデックス、
+    日付は date_origin（プロジェクト開始日）からの日数で表す。
+    """
+
+    TASK_COLUMNS = [
+        "id", "parent_task_id", "level", "name", "status", "priority", "category",
+        "planned_start", "planned_end", "actual_start", "actual_end",
+        "estimated_hours", "actual_hours", "progress_rate", "is_milestone", "sort_order"
+    ]
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_gantt_payload(self, project_id: int, user_id: int, user_role: str) -> Dict[str, Any]:
+        """プロジェクト情報・タスク・依存関係・担当者・メンバーを5回のクエリで取得"""
+        project = self.db.query(Project).filter(Project.id == project_id).first()
+        if not project:
+            raise NotFoundError("プロジェクト")
+
+        members = self.db.query(
+            ProjectMember.user_id, User.username, User.full_name, ProjectMember.role
+        ).join(User, User.id == ProjectMember.user_id).filter(
+            ProjectMember.project_id == project_id
+        ).order_by(ProjectMember.id).all()
+
+        # プロジェクトアクセス権限チェック（取得済みのメンバー一覧で判定）
+        if user_role != "admin" and all(member.user_id != user_id for member in members):
+            raise AuthorizationError("このプロジェクトにアクセスする権限がありません")
+
+        tasks = self.db.query(
+            Task.id, Task.parent_task_id, Task.level, Task.name, Task.status,
+            Task.priority, Task.category, Task.planned_start_date, Task.planned_end_date,
+            Task.actual_start_date, Task.actual_end_date, Task.estimated_hours,
+            Task.actual_hours, Task.progress_rate, Task.is_milestone, Task.sort_order
+        ).filter(Task.project_id == project_id).order_by(Task.sort_order, Task.id).all()
+
+        dependencies = self.db.query(
+            TaskDependency.id, TaskDependency.predecessor_id, TaskDependency.successor_id,
+            TaskDependency.dependency_type, TaskDependency.lag_days
+        ).join(Task, Task.id == TaskDependency.successor_id).filter(
+            Task.project_id == project_id
+        ).order_by(TaskDependency.id).all()
+
+        assignments = self.db.query(
+            TaskAssignment.task_id, TaskAssignment.user_id
+        ).join(Task, Task.id == TaskAssignment.task_id).filter(
+            Task.project_id == project_id
+        ).order_by(TaskAssignment.id).all()
+
+        origin = project.start_date.toordinal()
+        statuses, priorities, categories = StringTable(), StringTable(), StringTable()
+        dependency_types, roles = StringTable(), StringTable()
+
+        task_columns = _columns(tasks, self.TASK_COLUMNS)
+        task_columns["status"] = statuses.codes(task_columns["status"])
+        task_columns["priority"] = priorities.codes(task_columns["priority"])
+        task_columns["category"] = categories.codes(task_columns["category"])
+        for name in ("planned_start", "planned_end", "actual_start", "actual_end"):
+            task_columns[name] = _day_offsets(task_columns[name], origin)
+        task_columns["is_milestone"] = [1 if value else 0 for value in task_columns["is_milestone"]]
+
+        dependency_columns = _columns(
+            dependencies, ["id", "predecessor_id", "successor_id", "type", "lag_days"]
+        )
+        dependency_columns["type"] = dependency_types.codes(dependency_columns["type"])
+
+        member_columns = _columns(members, ["user_id", "username", "full_name", "role"])
+        member_columns["role"] = roles.codes(member_columns["role"])
+
+        return {
+            "project": {
+                "id": project.id,
+                "name": project.name,
+                "description": project.description,
+                "start_date": project.start_date.isoformat(),
+                "end_date": project.end_date.isoformat(),
+                "status": project.status,
+                "category": project.category,
+                "created_by": project.created_by
+            },
+            "date_origin": project.start_date.isoformat(),
+            "strings": {
+                "status": statuses.values,
+                "priority": priorities.values,
+                "category": categories.values,
+                "dependency_type": dependency_types.values,
+                "role": roles.values
+            },
+            "tasks": task_columns,
+            "dependencies": dependency_columns,
+            "assignments": _columns(assignments, ["task_id", "user_id"]),
+            "members": member_columns
+        }
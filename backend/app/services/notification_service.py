@@ -7,7 +7,7 @@ from fastapi_mail.config import ConnectionConfig
 
 from ..models.notification import Notification, UserNotificationSettings
 from ..models.user import User
-from ..models.task import Task
+from ..models.task import Task, open_task_filter
 from ..models.project import Project
 from ..database.connection import get_db
 
@@ -123,7 +123,7 @@ class NotificationService:
             for alert_date in alert_dates:
                 tasks = db.query(Task).filter(
                     Task.planned_end_date == alert_date,
-                    Task.status.in_(["not_started", "in_progress"])
+                    open_task_filter()
                 ).all()
                 
                 for task in tasks:
@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Sequence
+
+# WeasyPrintによるHTML → PDFの描画
+#   WeasyPrintはCPU処理でGILを保持するため、APIプロセスのスレッドではなくプロセスプールで描画し、
+#   複数のPDFを複数コアで並行に生成する。プールのプロセス数が同時に描画するPDFの上限になる。
+#   各プロセスは起動時（initializer）にWeasyPrintの読み込み・フォント設定・スタイルシートの解析を1回だけ行い、
+#   描画ごとにはHTMLのみを受け渡す。
+
+# ワーカープロセス内の状態（_initialize で設定）
+_stylesheets: Optional[list] = None
+_font_config = None
+_init_error: Optional[BaseException] = None
+_init_lock = threading.Lock()
+
+def _initialize(stylesheet_paths: Sequence[str]):
+    """WeasyPrint・フォント設定・スタイルシートを読み込む（プロセスごとに1回）"""
+    global _stylesheets, _font_config, _init_error
+    try:
+        from weasyprint import CSS, HTML
+        from weasyprint.text.fonts import FontConfiguration
+        font_config = FontConfiguration()
+        stylesheets = [CSS(filename=path, font_config=font_config) for path in stylesheet_paths]
+        # フォントの検索・読み込みは初回の描画で行われるため、起動時に済ませておく
+        HTML(string="<p>初期化</p>").write_pdf(stylesheets=stylesheets, font_config=font_config)
+        _font_config, _stylesheets = font_config, stylesheets
+    except Exception as e:
+        # 初期化の失敗でプールを壊さず、描画時にこの例外を呼び出し元へ返す
+        _init_error = e
+
+def _render(html: str, base_url: Optional[str]) -> bytes:
+    if _init_error is not None:
+        raise _init_error
+    from weasyprint import HTML
+    return HTML(string=html, base_url=base_url).write_pdf(stylesheets=_stylesheets, font_config=_font_config)
+
+class PdfRenderer:
+    """スタイルシートを読み込み済みのプロセスプールでPDFを描画する
+
+    max_workers が0、または use_processes=False の場合は呼び出し元のプロセスで描画する
+    （Celeryワーカーなど、呼び出し側が既にプロセス単位で並列化している場合）。
+    """
+
+    def __init__(self, stylesheet_paths: Sequence[str], base_url: Optional[str] = None, max_workers: int = 2):
+        self.stylesheet_paths: List[str] = [str(path) for path in stylesheet_paths]
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.use_processes = max_workers > 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # スレッドとDB接続を持つAPIプロセスをforkしないよう spawn で起動する
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_initialize,
+                    initargs=(self.stylesheet_paths,)
+                )
+            return self._executor
+
+    def _submit(self, html: str) -> Future:
+        try:
+            return self._get_executor().submit(_render, html, self.base_url)
+        except BrokenProcessPool:
+            # ワーカープロセスが異常終了したプールは使えないため作り直す
+            self._reset()
+            return self._get_executor().submit(_render, html, self.base_url)
+
+    def _render_inline(self, html: str) -> bytes:
+        with _init_lock:
+            if not self._initialized:
+                _initialize(self.stylesheet_paths)
+                self._initialized = True
+        return _render(html, self.base_url)
+
+    def render(self, html: str) -> bytes:
+        """HTMLをPDFに変換（完了まで待つ）"""
+        if not self.use_processes:
+            return self._render_inline(html)
+        try:
+            return self._submit(html).result()
+        except BrokenProcessPool:
+            self._reset()
+            raise
+
+    async def render_async(self, html: str) -> bytes:
+        """HTMLをPDFに変換（イベントループを止めずに待つ）"""
+        if not self.use_processes:
+            return await asyncio.to_thread(self._render_inline, html)
+        try:
+            return await asyncio.wrap_future(self._submit(html))
+        except BrokenProcessPool:
+            self._reset()
+            raise
+
+    def _reset(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        """プロセスプールを終了（アプリケーション終了時）"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
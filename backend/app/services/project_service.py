@@ -1,5 +1,5 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import and_, func
 from fastapi import HTTPException, status
 from app.models.project import Project, ProjectMember
@@ -10,6 +10,9 @@ from app.schemas.project import (
     ProjectSummary
 )
 from app.utils.exceptions import NotFoundError, ConflictError, AuthorizationError
+from app.utils.pagination import Page, encode_cursor, decode_cursor
+from app.utils.permission_cache import get_project_access, invalidate_project_access
+from app.utils.project_version import bump_project_version
 
 class ProjectService:
     def __init__(self, db: Session):
@@ -21,20 +24,41 @@ class ProjectService:
         user_role: str,
         skip: int = 0, 
         limit: int = 100,
-        status_filter: Optional[str] = None
-    ) -> List[Project]:
-        """ユーザーが参加可能なプロジェクト一覧取得"""
+        status_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Page:
+        """ユーザーが参加可能なプロジェクト一覧取得
+
+        idのキーセットでページングする。cursorを指定した場合はskipを無視する。
+        """
         query = self.db.query(Project)
         
         # 管理者以外は参加プロジェクトのみ
         if user_role != "admin":
-            query = query.join(ProjectMember).filter(ProjectMember.user_id == user_id)
+            query = query.filter(Project.members.any(ProjectMember.user_id == user_id))
         
         # ステータスフィルタ
         if status_filter:
             query = query.filter(Project.status == status_filter)
-            
-        return query.options(joinedload(Project.members)).offset(skip).limit(limit).all()
+
+        total = query.count() if include_total else None
+
+        query = query.order_by(Project.id)
+        if cursor:
+            last_id, = decode_cursor(cursor, 1)
+            query = query.filter(Project.id > last_id)
+        elif skip:
+            query = query.offset(skip)
+
+        # 次ページの有無を判定するため1件多く取得
+        projects = query.options(selectinload(Project.members)).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(projects) > limit:
+            projects = projects[:limit]
+            next_cursor = encode_cursor(projects[-1].id)
+        return Page(projects, next_cursor, total)
 
     def get_project_by_id(self, project_id: int, user_id: int, user_role: str) -> Project:
         """プロジェクト詳細取得"""
@@ -83,6 +107,8 @@ class ProjectService:
         self.db.add(project_member)
         
         self.db.commit()
+        invalidate_project_access(db_project.id, db=self.db)
+        bump_project_version(db_project.id)
         self.db.refresh(db_project)
         return db_project
 
@@ -116,6 +142,7 @@ class ProjectService:
             setattr(project, field, value)
 
         self.db.commit()
+        bump_project_version(project_id)
         self.db.refresh(project)
         return project
 
@@ -129,6 +156,8 @@ class ProjectService:
 
         self.db.delete(project)
         self.db.commit()
+        invalidate_project_access(project_id, db=self.db)
+        bump_project_version(project_id)
         return True
 
     def get_project_members(self, project_id: int, user_id: int, user_role: str) -> List[ProjectMember]:
@@ -178,6 +207,7 @@ class ProjectService:
         
         self.db.add(db_member)
         self.db.commit()
+        invalidate_project_access(project_id, member_data.user_id, db=self.db)
         self.db.refresh(db_member)
         return db_member
 
@@ -214,6 +244,7 @@ class ProjectService:
 
         self.db.delete(member)
         self.db.commit()
+        invalidate_project_access(project_id, member_user_id, db=self.db)
         return True
 
     def get_project_summaries(self, user_id: int, user_role: str) -> List[ProjectSummary]:
@@ -264,18 +295,13 @@ class ProjectService:
             return True
             
         # プロジェクトメンバーかチェック
-        is_member = any(member.user_id == user_id for member in project.members)
-        return is_member
+        access = get_project_access(self.db, project.id, user_id)
+        return access is not None and access.is_member
 
     def _can_modify_project(self, project: Project, user_id: int, user_role: str) -> bool:
-        """プロジェクト変更権限チェック"""
+        """プロジェクト変更権限チェック（作成者またはマネージャー）"""
         if user_role == "admin":
             return True
             
-        # プロジェクト作成者またはマネージャーかチェック
-        if project.created_by == user_id:
-            return True
-            
-        # マネージャー権限チェック
-        member = next((m for m in project.members if m.user_id == user_id), None)
-        return member and member.role == "manager"
\ No newline at end of file
+        access = get_project_access(self.db, project.id, user_id)
+        return access is not None and access.can_modify
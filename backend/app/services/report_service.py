@@ -1,89 +1,114 @@
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session, aliased
+from typing import BinaryIO, List, Dict, Any, Optional
 from datetime import datetime, date, timedelta
 import io
+import tempfile
 import base64
 from pathlib import Path
 
-# PDF生成用
-from weasyprint import HTML, CSS
-from jinja2 import Template
+# PDF生成用（WeasyPrintはネイティブライブラリが必要なためPDF描画プロセスで読み込む）
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
 # Excel生成用  
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.chart import BarChart, Reference
 
+from ..config import settings
 from ..models.project import Project
 from ..models.task import Task, TaskAssignment
 from ..models.user import User
+from .pdf_renderer import PdfRenderer
 
 class ReportService:
     def __init__(self):
         self.template_dir = Path(__file__).parent.parent / "templates" / "reports"
-        self.template_dir.mkdir(parents=True, exist_ok=True)
+        # コンパイル済みテンプレートはEnvironmentが保持し、バイトコードは一時ディレクトリに保存して
+        # 別プロセス（ワーカー・再起動後）でも再コンパイルしない
+        self.template_env = Environment(
+            loader=FileSystemLoader(self.template_dir),
+            bytecode_cache=FileSystemBytecodeCache(),
+            autoescape=select_autoescape(["html"])
+        )
+        self.pdf_renderer = PdfRenderer(
+            [self.template_dir / "progress_report.css"],
+            base_url=str(self.template_dir),
+            max_workers=settings.pdf_render_workers
+        )
     
     def generate_project_progress_report(self, db: Session, project_id: int, 
                                        report_date: Optional[date] = None) -> Dict[str, Any]:
-        """プロジェクト進捗レポートを生成"""
+        """プロジェクト進捗レポートを生成
+
+        件数・工数・マイルストーンはカテゴリ別の集計クエリ1回（FILTER句）で求め、
+        遅延タスクは必要な列だけを別クエリで取得する（ORMエンティティは読み込まない）。
+        """
         if report_date is None:
             report_date = datetime.now().date()
         
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(
+            Project.id, Project.name, Project.start_date, Project.end_date, Project.status
+        ).filter(Project.id == project_id).first()
         if not project:
             raise ValueError("Project not found")
         
-        tasks = db.query(Task).filter(Task.project_id == project_id).all()
+        completed = Task.status == "completed"
+        not_completed = or_(Task.status.is_(None), Task.status != "completed")
+        overdue = and_(Task.planned_end_date < report_date, not_completed)
+        rows = db.query(
+            Task.category,
+            func.count().label("total"),
+            func.count().filter(completed).label("completed"),
+            func.count().filter(Task.status == "in_progress").label("in_progress"),
+            func.count().filter(Task.status == "not_started").label("not_started"),
+            func.count().filter(overdue).label("overdue"),
+            func.coalesce(func.sum(Task.estimated_hours), 0).label("estimated_hours"),
+            func.coalesce(func.sum(Task.actual_hours), 0).label("actual_hours"),
+            func.count().filter(Task.is_milestone.is_(True)).label("milestones"),
+            func.count().filter(and_(Task.is_milestone.is_(True), completed)).label("completed_milestones"),
+        ).filter(Task.project_id == project_id).group_by(Task.category).all()
         
-        # 基本統計
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.status == "completed"])
-        in_progress_tasks = len([t for t in tasks if t.status == "in_progress"])
-        not_started_tasks = len([t for t in tasks if t.status == "not_started"])
-        overdue_tasks = len([t for t in tasks 
-                           if t.planned_end_date and t.planned_end_date < report_date 
-                           and t.status != "completed"])
+        # 基本統計（カテゴリ別の集計を合算）
+        total_tasks = sum(row.total for row in rows)
+        completed_tasks = sum(row.completed for row in rows)
+        in_progress_tasks = sum(row.in_progress for row in rows)
+        not_started_tasks = sum(row.not_started for row in rows)
+        overdue_tasks = sum(row.overdue for row in rows)
         
         # 進捗率計算
         completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
         # 工数統計
-        total_estimated_hours = sum(t.estimated_hours or 0 for t in tasks)
-        total_actual_hours = sum(t.actual_hours or 0 for t in tasks)
-        
-        # マイルストーン
-        milestones = [t for t in tasks if t.is_milestone]
-        completed_milestones = [m for m in milestones if m.status == "completed"]
+        total_estimated_hours = sum(row.estimated_hours for row in rows)
+        total_actual_hours = sum(row.actual_hours for row in rows)
         
         # 遅延分析
-        delayed_tasks = []
-        for task in tasks:
-            if (task.planned_end_date and task.planned_end_date < report_date 
-                and task.status != "completed"):
-                delay_days = (report_date - task.planned_end_date).days
-                delayed_tasks.append({
-                    "name": task.name,
-                    "planned_end_date": task.planned_end_date,
-                    "delay_days": delay_days,
-                    "status": task.status
-                })
+        delayed_tasks = [
+            {
+                "name": task.name,
+                "planned_end_date": task.planned_end_date,
+                "delay_days": (report_date - task.planned_end_date).days,
+                "status": task.status
+            }
+            for task in db.query(Task.name, Task.planned_end_date, Task.status).filter(
+                Task.project_id == project_id, overdue
+            ).order_by(Task.planned_end_date, Task.id)
+        ]
         
-        # カテゴリ別進捗
+        # カテゴリ別進捗（未設定は「その他」にまとめる）
         category_progress = {}
-        for task in tasks:
-            category = task.category or "その他"
-            if category not in category_progress:
-                category_progress[category] = {"total": 0, "completed": 0}
-            
-            category_progress[category]["total"] += 1
-            if task.status == "completed":
-                category_progress[category]["completed"] += 1
+        for row in rows:
+            progress = category_progress.setdefault(row.category or "その他", {"total": 0, "completed": 0})
+            progress["total"] += row.total
+            progress["completed"] += row.completed
         
         # 進捗率を計算
-        for category in category_progress:
-            total = category_progress[category]["total"]
-            completed = category_progress[category]["completed"]
-            category_progress[category]["completion_rate"] = (completed / total * 100) if total > 0 else 0
+        for progress in category_progress.values():
+            total = progress["total"]
+            progress["completion_rate"] = (progress["completed"] / total * 100) if total > 0 else 0
         
         return {
             "project": {
@@ -103,160 +128,62 @@ class ReportService:
                 "completion_rate": round(completion_rate, 1),
                 "total_estimated_hours": total_estimated_hours,
                 "total_actual_hours": total_actual_hours,
-                "milestones_total": len(milestones),
-                "milestones_completed": len(completed_milestones)
+                "milestones_total": sum(row.milestones for row in rows),
+                "milestones_completed": sum(row.completed_milestones for row in rows)
             },
             "delayed_tasks": delayed_tasks,
             "category_progress": category_progress
         }
     
+    def render_project_progress_html(self, db: Session, project_id: int,
+                                     report_date: Optional[date] = None) -> str:
+        """プロジェクト進捗レポートのHTML（PDFの元）を生成"""
+        report_data = self.generate_project_progress_report(db, project_id, report_date)
+        return self.template_env.get_template("progress_report.html").render(**report_data)
+    
     def export_project_progress_to_pdf(self, db: Session, project_id: int, 
                                      report_date: Optional[date] = None) -> bytes:
-        """プロジェクト進捗レポートをPDF出力"""
-        report_data = self.generate_project_progress_report(db, project_id, report_date)
-        
-        # HTMLテンプレート
-        template_html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>プロジェクト進捗レポート</title>
-            <style>
-                body { font-family: 'Noto Sans JP', sans-serif; margin: 20px; }
-                .header { text-align: center; border-bottom: 2px solid #333; padding-bottom: 10px; }
-                .section { margin: 20px 0; }
-                .summary-table { width: 100%; border-collapse: collapse; margin: 10px 0; }
-                .summary-table th, .summary-table td { 
-                    border: 1px solid #ddd; padding: 8px; text-align: left; 
-                }
-                .summary-table th { background-color: #f2f2f2; }
-                .progress-bar { 
-                    width: 200px; height: 20px; background-color: #f0f0f0; 
-                    border: 1px solid #ccc; position: relative; 
-                }
-                .progress-fill { 
-                    height: 100%; background-color: #4CAF50; 
-                }
-                .delayed-task { background-color: #ffebee; }
-                .chart-placeholder { 
-                    width: 100%; height: 200px; border: 1px solid #ccc; 
-                    text-align: center; line-height: 200px; background-color: #f9f9f9; 
-                }
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>プロジェクト進捗レポート</h1>
-                <h2>{{ project.name }}</h2>
-                <p>レポート作成日: {{ report_date.strftime('%Y年%m月%d日') }}</p>
-            </div>
-            
-            <div class="section">
-                <h3>プロジェクト概要</h3>
-                <table class="summary-table">
-                    <tr><td>プロジェクト名</td><td>{{ project.name }}</td></tr>
-                    <tr><td>開始日</td><td>{{ project.start_date.strftime('%Y/%m/%d') if project.start_date else '未設定' }}</td></tr>
-                    <tr><td>終了予定日</td><td>{{ project.end_date.strftime('%Y/%m/%d') if project.end_date else '未設定' }}</td></tr>
-                    <tr><td>ステータス</td><td>{{ project.status }}</td></tr>
-                </table>
-            </div>
-            
-            <div class="section">
-                <h3>進捗サマリー</h3>
-                <table class="summary-table">
-                    <tr><td>総タスク数</td><td>{{ summary.total_tasks }}</td></tr>
-                    <tr><td>完了タスク</td><td>{{ summary.completed_tasks }}</td></tr>
-                    <tr><td>進行中タスク</td><td>{{ summary.in_progress_tasks }}</td></tr>
-                    <tr><td>未開始タスク</td><td>{{ summary.not_started_tasks }}</td></tr>
-                    <tr><td>遅延タスク</td><td>{{ summary.overdue_tasks }}</td></tr>
-                    <tr>
-                        <td>完了率</td>
-                        <td>
-                            {{ summary.completion_rate }}%
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: {{ summary.completion_rate }}%;"></div>
-                            </div>
-                        </td>
-                    </tr>
-                    <tr><td>予定工数合計</td><td>{{ summary.total_estimated_hours }}時間</td></tr>
-                    <tr><td>実績工数合計</td><td>{{ summary.total_actual_hours }}時間</td></tr>
-                </table>
-            </div>
-            
-            {% if delayed_tasks %}
-            <div class="section">
-                <h3>遅延タスク一覧</h3>
-                <table class="summary-table">
-                    <thead>
-                        <tr>
-                            <th>タスク名</th>
-                            <th>予定終了日</th>
-                            <th>遅延日数</th>
-                            <th>ステータス</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for task in delayed_tasks %}
-                        <tr class="delayed-task">
-                            <td>{{ task.name }}</td>
-                            <td>{{ task.planned_end_date.strftime('%Y/%m/%d') if task.planned_end_date else '-' }}</td>
-                            <td>{{ task.delay_days }}日</td>
-                            <td>{{ task.status }}</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-            {% endif %}
-            
-            <div class="section">
-                <h3>カテゴリ別進捗</h3>
-                <table class="summary-table">
-                    <thead>
-                        <tr>
-                            <th>カテゴリ</th>
-                            <th>総タスク数</th>
-                            <th>完了タスク数</th>
-                            <th>完了率</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for category, progress in category_progress.items() %}
-                        <tr>
-                            <td>{{ category }}</td>
-                            <td>{{ progress.total }}</td>
-                            <td>{{ progress.completed }}</td>
-                            <td>{{ progress.completion_rate|round(1) }}%</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # テンプレートを使ってHTMLを生成
-        template = Template(template_html)
-        html_content = template.render(**report_data)
-        
-        # PDFに変換
-        pdf_bytes = HTML(string=html_content).write_pdf()
-        return pdf_bytes
+        """プロジェクト進捗レポートをPDF出力（描画はPDF描画プロセスで行う）"""
+        html_content = self.render_project_progress_html(db, project_id, report_date)
+        return self.pdf_renderer.render(html_content)
     
     def export_tasks_to_excel(self, db: Session, project_id: int) -> bytes:
-        """タスク一覧をExcelエクスポート"""
-        project = db.query(Project).filter(Project.id == project_id).first()
+        """タスク一覧をExcelエクスポート（バイト列。大きなプロジェクトは export_tasks_to_excel_file を使う）"""
+        buffer = io.BytesIO()
+        self.write_tasks_excel(db, project_id, buffer)
+        return buffer.getvalue()
+    
+    def export_tasks_to_excel_file(self, db: Session, project_id: int) -> BinaryIO:
+        """タスク一覧をExcelエクスポートし、先頭に戻した一時ファイルを返す（クローズで削除）"""
+        output = tempfile.TemporaryFile()
+        try:
+            self.write_tasks_excel(db, project_id, output)
+        except BaseException:
+            output.close()
+            raise
+        output.seek(0)
+        return output
+    
+    def write_tasks_excel(self, db: Session, project_id: int, output: BinaryIO):
+        """タスク一覧をExcel形式でoutputに書き込む
+
+        openpyxlの書き込み専用モードで行を逐次書き出し、タスクは親タスク名を結合した
+        列のみのクエリを yield_per で分割取得するため、メモリ使用量はタスク数によらず一定。
+        xlsxでは列幅が行データより前に置かれるため、列幅は書き出し前に集計クエリで求める。
+        """
+        project = db.query(
+            Project.name, Project.description, Project.start_date, Project.end_date,
+            Project.status, Project.category, Project.created_at
+        ).filter(Project.id == project_id).first()
         if not project:
             raise ValueError("Project not found")
         
-        tasks = db.query(Task).filter(Task.project_id == project_id).order_by(Task.sort_order).all()
+        parent = aliased(Task)
+        task_filter = Task.project_id == project_id
         
-        # Excelワークブック作成
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "タスク一覧"
+        # Excelワークブック作成（書き込み専用モード）
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet(title="タスク一覧")
         
         # ヘッダー設定
         headers = [
@@ -265,6 +192,35 @@ class ReportService:
             "予定工数(h)", "実績工数(h)", "進捗率(%)", "マイルストーン", "親タスク"
         ]
         
+        # 列幅（最長の値 + 2、最大50）を集計クエリ1回で求める
+        def max_length(column):
+            return func.coalesce(func.max(func.length(column)), 0)
+        
+        date_columns = [Task.planned_start_date, Task.planned_end_date, Task.actual_start_date, Task.actual_end_date]
+        lengths = db.query(
+            func.max(Task.id).label("id"),
+            max_length(Task.name).label("name"),
+            max_length(Task.description).label("description"),
+            max_length(Task.status).label("status"),
+            max_length(Task.priority).label("priority"),
+            max_length(Task.category).label("category"),
+            *[func.count(column).label(column.key) for column in date_columns],
+            func.max(Task.estimated_hours).label("estimated_hours"),
+            func.max(Task.actual_hours).label("actual_hours"),
+            max_length(parent.name).label("parent_name"),
+        ).select_from(Task).outerjoin(parent, parent.id == Task.parent_task_id).filter(task_filter).one()
+        value_lengths = [
+            len(str(lengths.id or "")), lengths.name, lengths.description, lengths.status,
+            lengths.priority, lengths.category,
+            # 日付は YYYY/MM/DD の10文字（値のある列のみ）
+            *[10 if getattr(lengths, column.key) else 0 for column in date_columns],
+            len(str(lengths.estimated_hours or 0)), len(str(lengths.actual_hours or 0)), 3, 3,
+            lengths.parent_name
+        ]
+        for col, (header, value_length) in enumerate(zip(headers, value_lengths), 1):
+            width = max(len(header), value_length or 0)
+            ws.column_dimensions[get_column_letter(col)].width = min(width + 2, 50)
+        
         # ヘッダーのスタイル
         header_font = Font(bold=True, color="FFFFFF")
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
@@ -275,22 +231,41 @@ class ReportService:
             bottom=Side(style="thin")
         )
         
-        # ヘッダー行を設定
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
+        def styled_cell(value=None, **styles) -> WriteOnlyCell:
+            cell = WriteOnlyCell(ws, value=value)
             cell.border = border
-            cell.alignment = Alignment(horizontal="center")
+            for name, style in styles.items():
+                setattr(cell, name, style)
+            return cell
+        
+        # ヘッダー行を設定
+        ws.append([
+            styled_cell(header, font=header_font, fill=header_fill, alignment=Alignment(horizontal="center"))
+            for header in headers
+        ])
+        
+        # データ行のセル（行ごとに値だけを差し替えて書き出す）
+        cells = [styled_cell() for _ in headers]
+        # ステータスに応じた背景色
+        status_cells = {
+            status: styled_cell(fill=PatternFill(start_color=color, end_color=color, fill_type="solid"))
+            for status, color in [("completed", "C6EFCE"), ("in_progress", "FFEB9C"), ("overdue", "FFC7CE")]
+        }
+        
+        def format_date(value):
+            return value.strftime('%Y/%m/%d') if value else ""
         
         # データ行を設定
-        for row, task in enumerate(tasks, 2):
-            # 親タスク名を取得
-            parent_task_name = ""
-            if task.parent_task_id:
-                parent_task = db.query(Task).filter(Task.id == task.parent_task_id).first()
-                parent_task_name = parent_task.name if parent_task else ""
-            
+        tasks = db.query(
+            Task.id, Task.name, Task.description, Task.status, Task.priority, Task.category,
+            Task.planned_start_date, Task.planned_end_date, Task.actual_start_date, Task.actual_end_date,
+            Task.estimated_hours, Task.actual_hours, Task.progress_rate, Task.is_milestone,
+            parent.name.label("parent_name")
+        ).outerjoin(parent, parent.id == Task.parent_task_id).filter(task_filter).order_by(
+            Task.sort_order, Task.id
+        ).yield_per(2000)
+        
+        for task in tasks:
             data = [
                 task.id,
                 task.name,
@@ -298,42 +273,21 @@ class ReportService:
                 task.status,
                 task.priority,
                 task.category or "",
-                task.planned_start_date.strftime('%Y/%m/%d') if task.planned_start_date else "",
-                task.planned_end_date.strftime('%Y/%m/%d') if task.planned_end_date else "",
-                task.actual_start_date.strftime('%Y/%m/%d') if task.actual_start_date else "",
-                task.actual_end_date.strftime('%Y/%m/%d') if task.actual_end_date else "",
+                format_date(task.planned_start_date),
+                format_date(task.planned_end_date),
+                format_date(task.actual_start_date),
+                format_date(task.actual_end_date),
                 task.estimated_hours or 0,
                 task.actual_hours or 0,
                 task.progress_rate,
                 "はい" if task.is_milestone else "いいえ",
-                parent_task_name
+                task.parent_name or ""
             ]
-            
-            for col, value in enumerate(data, 1):
-                cell = ws.cell(row=row, column=col, value=value)
-                cell.border = border
-                
-                # ステータスに応じて背景色を設定
-                if col == 4:  # ステータス列
-                    if value == "completed":
-                        cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-                    elif value == "in_progress":
-                        cell.fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-                    elif value == "overdue":
-                        cell.fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-        
-        # 列幅を自動調整
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+            row = cells[:]
+            row[3] = status_cells.get(task.status, cells[3])
+            for cell, value in zip(row, data):
+                cell.value = value
+            ws.append(row)
         
         # プロジェクト情報シートを追加
         project_ws = wb.create_sheet(title="プロジェクト情報")
@@ -341,22 +295,19 @@ class ReportService:
             ["項目", "値"],
             ["プロジェクト名", project.name],
             ["説明", project.description or ""],
-            ["開始日", project.start_date.strftime('%Y/%m/%d') if project.start_date else ""],
-            ["終了予定日", project.end_date.strftime('%Y/%m/%d') if project.end_date else ""],
+            ["開始日", format_date(project.start_date)],
+            ["終了予定日", format_date(project.end_date)],
             ["ステータス", project.status],
             ["カテゴリ", project.category or ""],
             ["作成日", project.created_at.strftime('%Y/%m/%d %H:%M') if project.created_at else ""],
         ]
         
-        for row, (key, value) in enumerate(project_info, 1):
-            project_ws.cell(row=row, column=1, value=key).font = Font(bold=True)
-            project_ws.cell(row=row, column=2, value=value)
+        for key, value in project_info:
+            key_cell = WriteOnlyCell(project_ws, value=key)
+            key_cell.font = Font(bold=True)
+            project_ws.append([key_cell, value])
         
-        # Excelファイルをバイト列として返す
-        excel_buffer = io.BytesIO()
-        wb.save(excel_buffer)
-        excel_buffer.seek(0)
-        return excel_buffer.getvalue()
+        wb.save(output)
     
     def generate_user_workload_report(self, db: Session, start_date: date, end_date: date) -> Dict[str, Any]:
         """ユーザー別作業負荷レポートを生成"""
@@ -404,4 +355,49 @@ class ReportService:
             "workload_data": workload_data
         }
 
+    def generate_dashboard_statistics(self, db: Session, today: Optional[date] = None) -> Dict[str, Any]:
+        """ダッシュボード用統計情報を生成（プロジェクト・タスクそれぞれ集計クエリ1回）"""
+        if today is None:
+            today = datetime.now().date()
+        current_month_start = today.replace(day=1)
+
+        # プロジェクト統計
+        project_completed = Project.status == "completed"
+        projects = db.query(
+            func.count().label("total"),
+            func.count().filter(Project.status == "active").label("active"),
+            func.count().filter(project_completed).label("completed"),
+            func.count().filter(and_(
+                project_completed,
+                Project.updated_at >= datetime.combine(current_month_start, datetime.min.time())
+            )).label("completed_this_month"),
+        ).select_from(Project).one()
+
+        # タスク統計（今月の実績を含む）
+        task_completed = Task.status == "completed"
+        tasks = db.query(
+            func.count().label("total"),
+            func.count().filter(task_completed).label("completed"),
+            func.count().filter(and_(Task.planned_end_date < today, Task.status != "completed")).label("overdue"),
+            func.count().filter(and_(
+                task_completed, Task.actual_end_date >= current_month_start
+            )).label("completed_this_month"),
+        ).select_from(Task).one()
+
+        return {
+            "projects": {
+                "total": projects.total,
+                "active": projects.active,
+                "completed": projects.completed,
+                "completed_this_month": projects.completed_this_month
+            },
+            "tasks": {
+                "total": tasks.total,
+                "completed": tasks.completed,
+                "overdue": tasks.overdue,
+                "completed_this_month": tasks.completed_this_month,
+                "completion_rate": (tasks.completed / tasks.total * 100) if tasks.total > 0 else 0
+            }
+        }
+
 report_service = ReportService()
\ No newline at end of file
@@ -0,0 +1,156 @@
+from array import array
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from app.services.dependency_graph import (
+    ProjectTaskGraph, START_TO_START, FINISH_TO_FINISH, START_TO_FINISH
+)
+from app.utils.exceptions import ValidationError
+
+class ScheduleResult(NamedTuple):
+    """クリティカルパス計算結果（日付はすべて日序数 date.toordinal() で保持、終了日は当日を含む）"""
+    task_ids: array
+    early_start: array
+    early_finish: array
+    late_start: array
+    late_finish: array
+    total_float: array
+    free_float: array
+    project_start: int
+    project_finish: int
+    critical_path: List[int]
+
+def topological_order(graph: ProjectTaskGraph) -> array:
+    """依存関係DAGのトポロジカル順（タスクインデックス）を取得
+
+    循環がある場合は ValidationError を送出する。
+    """
+    size = len(graph)
+    in_degree = array("l", [0]) * size
+    for successor in graph.edge_successors:
+        in_degree[successor] += 1
+
+    order = array("l", (i for i in range(size) if in_degree[i] == 0))
+    head = 0
+    while head < len(order):
+        current = order[head]
+        head += 1
+        for e in graph.succ_edges[graph.succ_offsets[current]:graph.succ_offsets[current + 1]]:
+            successor = graph.edge_successors[e]
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                order.append(successor)
+
+    if len(order) != size:
+        raise ValidationError("依存関係に循環があるためスケジュールを計算できません")
+    return order
+
+def earliest_start(dependency_type: int, lag: int, predecessor_start: int,
+                   predecessor_finish: int, duration: int) -> int:
+    """先行タスクの開始・終了から後続タスクの最早開始を算出
+
+    終了日は当日を含み、duration は後続タスクの日数（開始日と終了日を含む）。
+    終了-開始（FS）の後続はラグ0で先行の終了日の翌日に開始する。
+    """
+    if dependency_type == START_TO_START:
+        return predecessor_start + lag
+    if dependency_type == FINISH_TO_FINISH:
+        return predecessor_finish + lag - duration + 1
+    if dependency_type == START_TO_FINISH:
+        return predecessor_start + lag - duration
+    return predecessor_finish + 1 + lag
+
+def latest_finish(dependency_type: int, lag: int, successor_start: int,
+                  successor_finish: int, duration: int) -> int:
+    """後続タスクの最遅開始・終了から先行タスクの最遅終了を算出
+
+    earliest_start の逆算。duration は先行タスクの日数（開始日と終了日を含む）。
+    """
+    if dependency_type == START_TO_START:
+        return successor_start - lag + duration - 1
+    if dependency_type == FINISH_TO_FINISH:
+        return successor_finish - lag
+    if dependency_type == START_TO_FINISH:
+        return successor_finish - lag + duration
+    return successor_start - 1 - lag
+
+def compute_schedule(
+    graph: ProjectTaskGraph,
+    task_dates: Dict[int, Tuple[Optional[date], Optional[date]]],
+    project_start: date
+) -> ScheduleResult:
+    """前進・後退計算で各タスクの最早/最遅日程とフロートを算出
+
+    task_datesは タスクID → (計画開始日, 計画終了日)。計画開始日はその日以降に
+    開始する制約として扱い、未設定のタスクはプロジェクト開始日を起点とする。
+    所要日数は開始日と終了日を含む 計画終了日 - 計画開始日 + 1（終了日が未設定は1日）。
+    """
+    size = len(graph)
+    anchor = project_start.toordinal()
+    durations = array("l", [1]) * size
+    early_start = array("l", [anchor]) * size
+    for i, task_id in enumerate(graph.task_ids):
+        start, end = task_dates.get(task_id, (None, None))
+        if start is not None:
+            early_start[i] = start.toordinal()
+            if end is not None:
+                durations[i] = max((end - start).days + 1, 1)
+
+    order = topological_order(graph)
+    offsets = graph.succ_offsets
+    succ_edges = graph.succ_edges
+    edge_successors = graph.edge_successors
+    edge_types = graph.edge_types
+    edge_lags = graph.edge_lags
+
+    # 前進計算
+    early_finish = array("l", [0]) * size
+    for i in order:
+        early_finish[i] = finish = early_start[i] + durations[i] - 1
+        for e in succ_edges[offsets[i]:offsets[i + 1]]:
+            j = edge_successors[e]
+            candidate = earliest_start(edge_types[e], edge_lags[e], early_start[i], finish, durations[j])
+            if candidate > early_start[j]:
+                early_start[j] = candidate
+
+    project_finish = max(early_finish) if size else anchor
+    start_ordinal = min(early_start) if size else anchor
+
+    # 後退計算とフリーフロート
+    late_finish = array("l", [project_finish]) * size
+    late_start = array("l", [0]) * size
+    free_float = array("l", [0]) * size
+    for i in reversed(order):
+        finish = project_finish
+        free = project_finish - early_finish[i]
+        for e in succ_edges[offsets[i]:offsets[i + 1]]:
+            j = edge_successors[e]
+            dependency_type, lag = edge_types[e], edge_lags[e]
+            candidate = latest_finish(dependency_type, lag, late_start[j], late_finish[j], durations[i])
+            if candidate < finish:
+                finish = candidate
+            # 後続の最早開始を遅らせずに許される遅れ
+            slack = early_start[j] - earliest_start(
+                dependency_type, lag, early_start[i], early_finish[i], durations[j]
+            )
+            if slack < free:
+                free = slack
+        late_finish[i] = finish
+        late_start[i] = finish - durations[i] + 1
+        free_float[i] = max(free, 0)
+
+    total_float = array("l", (late_start[i] - early_start[i] for i in range(size)))
+    critical = [i for i in order if total_float[i] <= 0]
+    critical.sort(key=lambda i: (early_start[i], early_finish[i]))
+
+    return ScheduleResult(
+        task_ids=graph.task_ids,
+        early_start=early_start,
+        early_finish=early_finish,
+        late_start=late_start,
+        late_finish=late_finish,
+        total_float=total_float,
+        free_float=free_float,
+        project_start=start_ordinal,
+        project_finish=project_finish,
+        critical_path=[graph.task_ids[i] for i in critical]
+    )
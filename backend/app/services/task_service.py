@@ -1,16 +1,129 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
+from collections import defaultdict, deque
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import String, and_, or_, case, cast, func, delete, insert, literal, select, text, tuple_, update
 from fastapi import HTTPException, status
-from app.models.task import Task, TaskAssignment, TaskDependency, TaskComment
+from app.config import settings
+from app.database.connection import SessionLocal
+from app.models.task import (
+    Task, TaskAssignment, TaskDependency, TaskComment, TaskAttachment, TaskSchedule,
+    DeletedRecord
+)
 from app.models.project import Project, ProjectMember
 from app.models.user import User
 from app.schemas.task import (
     TaskCreate, TaskUpdate, TaskAssignmentCreate, 
     TaskDependencyCreate, TaskCommentCreate,
-    ValidPredecessorTask, TaskHierarchy
+    ValidPredecessorTask, TaskHierarchy, TaskScheduleEntry, ProjectSchedule,
+    TaskDateShift, TaskRescheduleResult,
+    TaskBatchCreate, TaskBatchRequest, TaskBatchResult, TaskChanges,
+    TaskMoveRequest, TaskSortOrder
+)
+from app.services.dependency_graph import get_project_graph
+from app.services.scheduling import compute_schedule, earliest_start
+from app.utils.exceptions import NotFoundError, ConflictError, AuthorizationError, ValidationError
+from app.utils.pagination import (
+    Page, encode_cursor, decode_cursor, encode_time_cursor, decode_time_cursor
 )
-from app.utils.exceptions import NotFoundError, ConflictError, AuthorizationError
+from app.utils.permission_cache import get_project_access
+from app.utils.project_version import bump_project_version
+
+def rollup_progress(children: List[Tuple[int, int]], weight_by_hours: bool = False) -> int:
+    """子タスクの (進捗率, 予定工数) から親タスクの進捗率を算出
+
+    weight_by_hoursがTrueの場合は予定工数で加重平均する（工数合計が0なら単純平均）。
+    """
+    if weight_by_hours:
+        total_hours = sum(hours for _, hours in children)
+        if total_hours > 0:
+            return int(sum(progress * hours for progress, hours in children) / total_hours)
+    return int(sum(progress for progress, _ in children) / len(children))
+
+# 表示順（sort_order）の間隔。移動時は前後の中間値を使い、間隔が尽きたら振り直す
+SORT_ORDER_GAP = 1024
+
+def renumber_sort_orders(db: Session, project_id: int) -> int:
+    """プロジェクトのsort_orderを現在の順序のまま SORT_ORDER_GAP 間隔に振り直す（1文のUPDATE）"""
+    ranked = select(
+        Task.id,
+        func.row_number().over(order_by=(Task.sort_order, Task.id)).label("position")
+    ).where(Task.project_id == project_id).subquery()
+    result = db.execute(
+        update(Task)
+        .where(Task.id == ranked.c.id)
+        .values(sort_order=ranked.c.position * SORT_ORDER_GAP)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+def renumber_project_sort_orders(project_id: int):
+    """sort_orderの振り直しを独立したセッションで実行（BackgroundTasksから呼び出す）"""
+    db = SessionLocal()
+    try:
+        renumber_sort_orders(db, project_id)
+        db.commit()
+        bump_project_version(project_id)
+    finally:
+        db.close()
+
+def task_path(parent_path: Optional[str], parent_id: Optional[int]) -> str:
+    """親タスクのpathとIDから子タスクのpathを算出（親なしは'/'）"""
+    return f"{parent_path}{parent_id}/" if parent_id else "/"
+
+def rebuild_task_paths(db: Session, project_id: int) -> int:
+    """プロジェクトの root_task_id / path を parent_task_id から再計算（1文のUPDATE）
+
+    親子関係をまとめて設定した後（テンプレート適用・シードなど）に呼び出す。
+    """
+    tree = select(
+        Task.id, Task.id.label("root_id"), cast(literal("/"), String(100)).label("path")
+    ).where(
+        Task.project_id == project_id, Task.parent_task_id.is_(None)
+    ).cte("tree", recursive=True)
+    tree = tree.union_all(
+        select(
+            Task.id, tree.c.root_id,
+            cast(tree.c.path + cast(tree.c.id, String(20)) + "/", String(100))
+        ).where(Task.parent_task_id == tree.c.id)
+    )
+    result = db.execute(
+        update(Task)
+        .where(Task.id == tree.c.id)
+        .values(root_task_id=tree.c.root_id, path=tree.c.path)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+def build_task_hierarchy(rows) -> List[TaskHierarchy]:
+    """並び順どおりの行から親→子インデックスを作り、線形時間で階層を構築
+
+    rowsは id, name, level, parent_task_id, status, progress_rate を持つ行で、
+    兄弟間の表示順（sort_order, id）で並んでいる必要がある。
+    """
+    nodes = {}
+    for row in rows:
+        # 検証はレスポンス変換時に行われるため、ここでは構築コストを抑える
+        nodes[row.id] = TaskHierarchy.model_construct(
+            id=row.id,
+            name=row.name,
+            level=row.level,
+            parent_task_id=row.parent_task_id,
+            status=row.status,
+            progress_rate=row.progress_rate,
+            subtasks=[]
+        )
+
+    roots = []
+    for row in rows:
+        parent = nodes.get(row.parent_task_id) if row.parent_task_id else None
+        if parent is None:
+            # 親がない、または親が別プロジェクトのタスクはルートとして扱う
+            roots.append(nodes[row.id])
+        else:
+            parent.subtasks.append(nodes[row.id])
+
+    return roots
 
 class TaskService:
     def __init__(self, db: Session):
@@ -24,9 +137,14 @@ class TaskService:
         skip: int = 0, 
         limit: int = 100,
         status_filter: Optional[str] = None,
-        assigned_to: Optional[int] = None
-    ) -> List[Task]:
-        """プロジェクトのタスク一覧取得"""
+        assigned_to: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Page:
+        """プロジェクトのタスク一覧取得
+
+        (sort_order, id) のキーセットでページングする。cursorを指定した場合はskipを無視する。
+        """
         # プロジェクトアクセス権限チェック
         self._check_project_access(project_id, user_id, user_role)
         
@@ -36,13 +154,27 @@ class TaskService:
         if status_filter:
             query = query.filter(Task.status == status_filter)
         
-        # 担当者フィルタ
+        # 担当者フィルタ（EXISTSで行の重複を避ける）
         if assigned_to:
-            query = query.join(TaskAssignment).filter(TaskAssignment.user_id == assigned_to)
-            
-        return query.options(
-            joinedload(Task.assignments)
-        ).order_by(Task.sort_order, Task.id).offset(skip).limit(limit).all()
+            query = query.filter(Task.assignments.any(TaskAssignment.user_id == assigned_to))
+
+        total = query.count() if include_total else None
+
+        query = query.order_by(Task.sort_order, Task.id)
+        if cursor:
+            last_sort_order, last_id = decode_cursor(cursor, 2)
+            query = query.filter(tuple_(Task.sort_order, Task.id) > (last_sort_order, last_id))
+        elif skip:
+            query = query.offset(skip)
+
+        # 次ページの有無を判定するため1件多く取得
+        tasks = query.options(selectinload(Task.assignments)).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].sort_order, tasks[-1].id)
+        return Page(tasks, next_cursor, total)
 
     def get_task_by_id(self, task_id: int, user_id: int, user_role: str) -> Task:
         """タスク詳細取得"""
@@ -76,6 +208,7 @@ class TaskService:
 
         # 親タスク存在確認と階層レベル計算
         level = task_data.level if task_data.level is not None else 0
+        path, root_task_id = task_path(None, None), None
         if task_data.parent_task_id:
             parent_task = self.db.query(Task).filter(
                 and_(
@@ -98,11 +231,13 @@ class TaskService:
                 level = parent_task.level + 1
             else:
                 level = task_data.level
+            path = task_path(parent_task.path, parent_task.id)
+            root_task_id = parent_task.root_task_id
 
-        # ソート順の自動設定
-        max_sort_order = self.db.query(func.max(Task.sort_order)).filter(
-            Task.project_id == task_data.project_id
-        ).scalar() or 0
+        # ソート順の自動設定（末尾に間隔を空けて追加。最大値の取得はINSERT文内で行う）
+        next_sort_order = select(
+            func.coalesce(func.max(Task.sort_order), 0) + SORT_ORDER_GAP
+        ).where(Task.project_id == task_data.project_id).scalar_subquery()
 
         # タスク作成
         db_task = Task(
@@ -117,11 +252,18 @@ class TaskService:
             priority=task_data.priority,
             category=task_data.category,
             is_milestone=task_data.is_milestone,
-            sort_order=max_sort_order + 1
+            sort_order=next_sort_order,
+            root_task_id=root_task_id,
+            path=path
         )
         
         self.db.add(db_task)
+        if root_task_id is None:
+            # ルートタスクは採番されたID自身がグループのルート
+            self.db.flush()
+            db_task.root_task_id = db_task.id
         self.db.commit()
+        self._invalidate_project_cache(db_task.project_id)
         self.db.refresh(db_task)
         return db_task
 
@@ -133,6 +275,31 @@ class TaskService:
         user_role: str
     ) -> Task:
         """タスク更新"""
+        task, _ = self._update_task(task_id, task_data, user_id, user_role)
+        return task
+
+    def reschedule_task(
+        self, 
+        task_id: int, 
+        task_data: TaskUpdate, 
+        user_id: int, 
+        user_role: str
+    ) -> TaskRescheduleResult:
+        """タスク更新（計画日変更を後続タスクへ伝播）"""
+        task, shifted_tasks = self._update_task(
+            task_id, task_data, user_id, user_role, propagate_dependencies=True
+        )
+        return TaskRescheduleResult(task=task, shifted_tasks=shifted_tasks)
+
+    def _update_task(
+        self, 
+        task_id: int, 
+        task_data: TaskUpdate, 
+        user_id: int, 
+        user_role: str,
+        propagate_dependencies: bool = False
+    ) -> Tuple[Task, List[TaskDateShift]]:
+        """タスク更新処理本体（更新タスクと日程が移動した後続タスクを返す）"""
         task = self.get_task_by_id(task_id, user_id, user_role)
         
         # 更新権限チェック（プロジェクトメンバーなら更新可能）
@@ -142,6 +309,29 @@ class TaskService:
         # 更新データ適用
         update_data = task_data.model_dump(exclude_unset=True)
         
+        self._validate_task_update(task, update_data)
+
+        for field, value in update_data.items():
+            setattr(task, field, value)
+
+        # 進捗率が更新された場合、親タスクの進捗率を自動更新
+        if 'progress_rate' in update_data:
+            self._update_parent_progress(task)
+
+        # 計画日が更新された場合、依存関係に従って後続タスクを同一トランザクションで移動
+        shifted_tasks = []
+        if propagate_dependencies and (
+            'planned_start_date' in update_data or 'planned_end_date' in update_data
+        ):
+            shifted_tasks = self._propagate_task_dates(task)
+
+        self.db.commit()
+        self._invalidate_project_cache(task.project_id)
+        self.db.refresh(task)
+        return task, shifted_tasks
+
+    def _validate_task_update(self, task, update_data: dict):
+        """更新後の計画日・実績日・進捗率を検証（taskは現在値を持つタスクまたは行）"""
         # 日付検証
         planned_start = update_data.get('planned_start_date', task.planned_start_date)
         planned_end = update_data.get('planned_end_date', task.planned_end_date)
@@ -167,37 +357,410 @@ class TaskService:
                 detail="進捗率は0-100の範囲で入力してください"
             )
 
-        for field, value in update_data.items():
-            setattr(task, field, value)
-
-        # 進捗率が更新された場合、親タスクの進捗率を自動更新
-        if 'progress_rate' in update_data:
-            self._update_parent_progress(task)
-
-        self.db.commit()
-        self.db.refresh(task)
-        return task
-
-    def delete_task(self, task_id: int, user_id: int, user_role: str) -> bool:
-        """タスク削除"""
+    def delete_task(self, task_id: int, user_id: int, user_role: str, cascade: bool = False) -> bool:
+        """タスク削除（cascade指定時は子孫タスクを含むサブツリーごと削除）"""
         task = self.get_task_by_id(task_id, user_id, user_role)
         
         # 削除権限チェック
         if not self._can_modify_project(task.project_id, user_id, user_role):
             raise AuthorizationError("タスクを削除する権限がありません")
 
-        # 子タスクがある場合は削除不可
-        subtasks_count = self.db.query(Task).filter(Task.parent_task_id == task_id).count()
-        if subtasks_count > 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="子タスクがあるため削除できません"
-            )
+        # 子タスクがある場合はcascade指定時のみ削除可
+        if not cascade:
+            has_subtasks = self.db.query(
+                select(Task.id).where(Task.parent_task_id == task_id).exists()
+            ).scalar()
+            if has_subtasks:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="子タスクがあるため削除できません"
+                )
+
+        project_id = task.project_id
+        task_ids = self.db.scalars(select(Task.id).where(self._subtree_filter(task))).all()
+
+        # 差分同期用の削除記録（担当者・依存関係はDB側のカスケードで削除される）
+        self._record_deletions(project_id, "assignment", self.db.scalars(
+            select(TaskAssignment.id).where(TaskAssignment.task_id.in_(task_ids))
+        ).all())
+        self._record_deletions(project_id, "dependency", self.db.scalars(
+            select(TaskDependency.id).where(or_(
+                TaskDependency.predecessor_id.in_(task_ids),
+                TaskDependency.successor_id.in_(task_ids)
+            ))
+        ).all())
+        self._record_deletions(project_id, "task", task_ids)
 
-        self.db.delete(task)
+        # サブツリーを1文で削除（コメント・添付・スケジュールもDB側で削除）
+        self.db.execute(
+            delete(Task).where(Task.id.in_(task_ids)).execution_options(synchronize_session=False)
+        )
         self.db.commit()
+        self.db.expunge(task)
+        self._invalidate_project_cache(project_id)
         return True
 
+    def apply_task_batch(
+        self,
+        project_id: int,
+        batch: TaskBatchRequest,
+        user_id: int,
+        user_role: str
+    ) -> TaskBatchResult:
+        """タスクの一括作成・更新・削除（権限チェックとコミットは1回ずつ）"""
+        # プロジェクトアクセス権限チェック
+        self._check_project_access(project_id, user_id, user_role)
+        if (batch.update or batch.delete) and not self._can_modify_project(project_id, user_id, user_role):
+            raise AuthorizationError("タスクを更新する権限がありません")
+
+        if not (batch.create or batch.update or batch.delete):
+            return TaskBatchResult()
+
+        # 同一IDへの複数の更新は順にマージ
+        updates = {}
+        for item in batch.update:
+            updates.setdefault(item.id, {}).update(item.model_dump(exclude_unset=True, exclude={'id'}))
+        delete_ids = set(batch.delete)
+        if delete_ids & updates.keys():
+            raise ValidationError("同じタスクを更新と削除の両方に指定することはできません")
+
+        # 参照される既存タスクを1回のクエリで取得
+        referenced_ids = updates.keys() | delete_ids | {
+            item.parent_task_id for item in batch.create if item.parent_task_id
+        }
+        existing = {}
+        if referenced_ids:
+            existing = {
+                row.id: row for row in self.db.query(
+                    Task.id, Task.project_id, Task.level, Task.root_task_id, Task.path,
+                    Task.planned_start_date, Task.planned_end_date,
+                    Task.actual_start_date, Task.actual_end_date,
+                    Task.progress_rate
+                ).filter(
+                    Task.project_id == project_id,
+                    Task.id.in_(referenced_ids)
+                )
+            }
+        if referenced_ids - existing.keys():
+            raise NotFoundError("タスク")
+
+        for task_id, update_data in updates.items():
+            self._validate_task_update(existing[task_id], update_data)
+
+        # 削除はサブツリー単位（子孫タスクも削除、pathの前方一致でDBから取得）
+        if delete_ids:
+            delete_ids = set(self.db.scalars(
+                select(Task.id).where(self._subtree_filter(*(existing[task_id] for task_id in delete_ids)))
+            ))
+            if delete_ids & updates.keys():
+                raise ValidationError("削除するタスクの子孫タスクを更新することはできません")
+
+        insert_groups = self._plan_batch_creates(project_id, batch.create, existing, delete_ids)
+
+        # 更新
+        update_rows = [{"id": task_id, **data} for task_id, data in updates.items() if data]
+        if update_rows:
+            self.db.execute(update(Task), update_rows)
+
+        # 削除（関連レコードも明示的に削除）
+        if delete_ids:
+            for model in (TaskComment, TaskAttachment, TaskSchedule):
+                self.db.execute(delete(model).where(model.task_id.in_(delete_ids)))
+            assignment_ids = self.db.scalars(
+                delete(TaskAssignment).where(TaskAssignment.task_id.in_(delete_ids))
+                .returning(TaskAssignment.id)
+            ).all()
+            dependency_ids = self.db.scalars(
+                delete(TaskDependency).where(or_(
+                    TaskDependency.predecessor_id.in_(delete_ids),
+                    TaskDependency.successor_id.in_(delete_ids)
+                )).returning(TaskDependency.id)
+            ).all()
+            self.db.execute(delete(Task).where(Task.id.in_(delete_ids)))
+            self._record_deletions(project_id, "assignment", assignment_ids)
+            self._record_deletions(project_id, "dependency", dependency_ids)
+            self._record_deletions(project_id, "task", delete_ids)
+
+        # 作成（親→子の階層順に executemany で挿入し、採番されたIDで子の親を解決）
+        temp_id_map = {}
+        created_ids = [None] * len(batch.create)
+        ancestry = {task_id: (row.path, row.root_task_id) for task_id, row in existing.items()}
+        new_root_ids = []
+        for group in insert_groups:
+            rows = []
+            for _, temp_id, parent_temp_id, values in group:
+                if parent_temp_id is not None:
+                    values["parent_task_id"] = temp_id_map[parent_temp_id]
+                parent_id = values["parent_task_id"]
+                parent_path, root_task_id = ancestry.get(parent_id, (None, None))
+                values["path"] = task_path(parent_path, parent_id)
+                values["root_task_id"] = root_task_id
+                rows.append(values)
+            new_ids = self.db.scalars(
+                insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+            ).all()
+            for (i, temp_id, _, values), new_id in zip(group, new_ids):
+                if temp_id is not None:
+                    temp_id_map[temp_id] = new_id
+                created_ids[i] = new_id
+                if values["root_task_id"] is None:
+                    new_root_ids.append(new_id)
+                ancestry[new_id] = (values["path"], values["root_task_id"] or new_id)
+        if new_root_ids:
+            self.db.execute(
+                update(Task).where(Task.id.in_(new_root_ids)).values(root_task_id=Task.id)
+                .execution_options(synchronize_session=False)
+            )
+
+        # 進捗率が更新された場合、親タスクの進捗率を一括で再計算
+        if any('progress_rate' in data for data in updates.values()):
+            self._rollup_project_progress(project_id)
+
+        self.db.commit()
+        self._invalidate_project_cache(project_id)
+
+        tasks = {}
+        changed_ids = created_ids + list(updates)
+        if changed_ids:
+            tasks = {
+                task.id: task for task in
+                self.db.query(Task).filter(Task.id.in_(changed_ids))
+            }
+        return TaskBatchResult(
+            temp_id_map=temp_id_map,
+            created=[tasks[task_id] for task_id in created_ids],
+            updated=[tasks[task_id] for task_id in updates],
+            deleted=sorted(delete_ids)
+        )
+
+    def _plan_batch_creates(
+        self,
+        project_id: int,
+        items: List[TaskBatchCreate],
+        existing: dict,
+        delete_ids: set
+    ) -> List[List[tuple]]:
+        """一括作成の階層レベル・ソート順を決定し、挿入順のグループに分割
+
+        戻り値は親→子の順に並んだグループで、各要素は (リクエスト内の位置, temp_id, parent_temp_id, 挿入値)。
+        """
+        temp_index = {}
+        for i, item in enumerate(items):
+            if item.temp_id is not None:
+                if item.temp_id in temp_index:
+                    raise ValidationError(f"temp_id '{item.temp_id}' が重複しています")
+                temp_index[item.temp_id] = i
+
+        for item in items:
+            if item.parent_task_id and item.parent_temp_id is not None:
+                raise ValidationError("parent_task_id と parent_temp_id は同時に指定できません")
+            if item.parent_temp_id is not None and item.parent_temp_id not in temp_index:
+                raise NotFoundError("親タスク")
+            if item.parent_task_id in delete_ids:
+                raise ValidationError("削除するタスクの下にタスクを作成することはできません")
+            # 日付検証
+            if (item.planned_start_date and item.planned_end_date and
+                item.planned_start_date >= item.planned_end_date):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="計画開始日は計画終了日より前である必要があります"
+                )
+
+        # 階層レベルと挿入の深さ（バッチ内の親の数）をメモ化しながら解決
+        levels = [None] * len(items)
+        depths = [None] * len(items)
+
+        def resolve(i: int):
+            chain, visiting = [], set()
+            while levels[i] is None:
+                if i in visiting:
+                    raise ValidationError("parent_temp_id に循環参照があります")
+                chain.append(i)
+                visiting.add(i)
+                parent_temp_id = items[i].parent_temp_id
+                if parent_temp_id is None:
+                    break
+                i = temp_index[parent_temp_id]
+            for j in reversed(chain):
+                item = items[j]
+                if item.parent_temp_id is not None:
+                    parent = temp_index[item.parent_temp_id]
+                    parent_level, depth = levels[parent], depths[parent] + 1
+                elif item.parent_task_id:
+                    parent_level, depth = existing[item.parent_task_id].level, 0
+                else:
+                    parent_level, depth = None, 0
+
+                if parent_level is None:
+                    level = item.level if item.level is not None else 0
+                else:
+                    # 階層レベル制限チェック（最大3レベル）
+                    if parent_level >= 3:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="サブタスクは3階層までしか作成できません"
+                        )
+                    level = item.level if item.level is not None else parent_level + 1
+                levels[j], depths[j] = level, depth
+
+        for i in range(len(items)):
+            resolve(i)
+
+        # ソート順はリクエスト順に間隔を空けてまとめて確保
+        max_sort_order = 0
+        if items:
+            max_sort_order = self.db.query(func.max(Task.sort_order)).filter(
+                Task.project_id == project_id
+            ).scalar() or 0
+
+        groups = [[] for _ in range(max(depths, default=-1) + 1)]
+        for i, item in enumerate(items):
+            groups[depths[i]].append((i, item.temp_id, item.parent_temp_id, {
+                "project_id": project_id,
+                "parent_task_id": item.parent_task_id,
+                "level": levels[i],
+                "name": item.name,
+                "description": item.description,
+                "planned_start_date": item.planned_start_date,
+                "planned_end_date": item.planned_end_date,
+                "estimated_hours": item.estimated_hours,
+                "priority": item.priority,
+                "category": item.category,
+                "is_milestone": item.is_milestone,
+                "sort_order": max_sort_order + (i + 1) * SORT_ORDER_GAP
+            }))
+        return groups
+
+    def move_task(
+        self, 
+        task_id: int, 
+        move: TaskMoveRequest, 
+        user_id: int, 
+        user_role: str
+    ) -> Tuple[Task, bool]:
+        """タスクの表示順を移動（通常は移動するタスク1行のみ更新）
+
+        after_task_id の直後、before_task_id の直前、どちらも未指定なら末尾に移動する。
+        戻り値の2番目は前後との間隔が尽きており、sort_orderの振り直しが望ましいかどうか。
+        """
+        task = self.db.query(Task).filter(Task.id == task_id).first()
+        if not task:
+            raise NotFoundError("タスク")
+        
+        # 移動権限チェック
+        if not self._can_modify_project(task.project_id, user_id, user_role):
+            raise AuthorizationError("タスクを移動する権限がありません")
+
+        if move.after_task_id is not None and move.before_task_id is not None:
+            raise ValidationError("after_task_id と before_task_id は同時に指定できません")
+        if task_id in (move.after_task_id, move.before_task_id):
+            raise ValidationError("移動先の基準に自分自身は指定できません")
+
+        prev_key, next_key = self._neighbour_sort_orders(task, move)
+        if prev_key is not None and next_key is not None and next_key - prev_key < 2:
+            # 間に入る値がない場合のみ、このトランザクション内で全体を振り直す
+            renumber_sort_orders(self.db, task.project_id)
+            prev_key, next_key = self._neighbour_sort_orders(task, move)
+
+        if prev_key is None and next_key is None:
+            new_key = SORT_ORDER_GAP
+        elif next_key is None:
+            new_key = prev_key + SORT_ORDER_GAP
+        elif prev_key is None:
+            new_key = next_key - SORT_ORDER_GAP
+        else:
+            new_key = (prev_key + next_key) // 2
+
+        task.sort_order = new_key
+        crowded = (
+            prev_key is not None and next_key is not None
+            and min(new_key - prev_key, next_key - new_key) < 2
+        )
+
+        self.db.commit()
+        self._invalidate_project_cache(task.project_id)
+        self.db.refresh(task)
+        return task, crowded
+
+    def _neighbour_sort_orders(self, task: Task, move: TaskMoveRequest) -> Tuple[Optional[int], Optional[int]]:
+        """移動先の直前・直後のタスクのsort_orderを取得（移動するタスク自身は除く）"""
+        others = self.db.query(Task.sort_order).filter(
+            Task.project_id == task.project_id,
+            Task.id != task.id
+        )
+        anchor_id = move.after_task_id if move.after_task_id is not None else move.before_task_id
+        if anchor_id is None:
+            # 末尾へ移動
+            return others.order_by(Task.sort_order.desc(), Task.id.desc()).limit(1).scalar(), None
+
+        anchor = self.db.query(Task.id, Task.sort_order).filter(
+            Task.id == anchor_id,
+            Task.project_id == task.project_id
+        ).first()
+        if not anchor:
+            raise NotFoundError("移動先のタスク")
+
+        position = tuple_(Task.sort_order, Task.id)
+        if move.after_task_id is not None:
+            following = others.filter(position > (anchor.sort_order, anchor.id)).order_by(
+                Task.sort_order, Task.id
+            ).limit(1).scalar()
+            return anchor.sort_order, following
+        preceding = others.filter(position < (anchor.sort_order, anchor.id)).order_by(
+            Task.sort_order.desc(), Task.id.desc()
+        ).limit(1).scalar()
+        return preceding, anchor.sort_order
+
+    def reorder_tasks(
+        self, 
+        project_id: int, 
+        task_ids: List[int], 
+        user_id: int, 
+        user_role: str
+    ) -> List[TaskSortOrder]:
+        """指定タスクを指定順に並べ替え（1文のUPDATE）
+
+        指定タスクが現在占めているsort_orderを新しい順に割り当て直すため、
+        指定外のタスクの位置は変わらない（全タスクを指定すれば全体の並べ替えになる）。
+        """
+        # 並べ替え権限チェック
+        if not self._can_modify_project(project_id, user_id, user_role):
+            raise AuthorizationError("タスクを並べ替える権限がありません")
+        if len(set(task_ids)) != len(task_ids):
+            raise ValidationError("タスクIDが重複しています")
+        if not task_ids:
+            return []
+
+        def current_slots():
+            return self.db.query(Task.id, Task.sort_order).filter(
+                Task.project_id == project_id,
+                Task.id.in_(task_ids)
+            ).order_by(Task.sort_order, Task.id).all()
+
+        rows = current_slots()
+        if len(rows) != len(task_ids):
+            raise NotFoundError("タスク")
+        slots = [row.sort_order for row in rows]
+        if any(a >= b for a, b in zip(slots, slots[1:])):
+            # 同じsort_orderのタスクがあると順序をidに委ねてしまうため先に振り直す
+            renumber_sort_orders(self.db, project_id)
+            rows = current_slots()
+            slots = [row.sort_order for row in rows]
+
+        current = {row.id: row.sort_order for row in rows}
+        new_orders = dict(zip(task_ids, slots))
+        changed = {task_id: order for task_id, order in new_orders.items() if current[task_id] != order}
+        if changed:
+            self.db.execute(
+                update(Task)
+                .where(Task.id.in_(changed))
+                .values(sort_order=case(changed, value=Task.id))
+                .execution_options(synchronize_session=False)
+            )
+        self.db.commit()
+        self._invalidate_project_cache(project_id)
+        return [TaskSortOrder(id=task_id, sort_order=new_orders[task_id]) for task_id in task_ids]
+
     def assign_task(
         self, 
         task_id: int, 
@@ -277,6 +840,7 @@ class TaskService:
         if not assignment:
             raise NotFoundError("タスク割り当て")
 
+        self._record_deletions(task.project_id, "assignment", [assignment.id])
         self.db.delete(assignment)
         self.db.commit()
         return True
@@ -317,7 +881,8 @@ class TaskService:
         if existing_dependency:
             raise ConflictError("この依存関係は既に存在します")
 
-        # 循環依存チェック（簡易版）
+        # 循環依存チェック（同じプロジェクトの依存関係の作成を直列化し、並行する作成同士の循環も防ぐ）
+        self.db.execute(select(Project.id).where(Project.id == predecessor.project_id).with_for_update())
         if self._creates_circular_dependency(dependency_data.predecessor_id, dependency_data.successor_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -334,6 +899,7 @@ class TaskService:
         
         self.db.add(db_dependency)
         self.db.commit()
+        self._invalidate_project_cache(predecessor.project_id)
         self.db.refresh(db_dependency)
         return db_dependency
 
@@ -367,44 +933,6 @@ class TaskService:
             joinedload(TaskComment.user)
         ).filter(TaskComment.task_id == task_id).order_by(TaskComment.created_at.desc()).all()
     
-    def get_task_hierarchy(
-        self, 
-        project_id: int, 
-        user_id: int, 
-        user_role: str
-    ) -> List[TaskHierarchy]:
-        """プロジェクトのタスク階層取得"""
-        self._check_project_access(project_id, user_id, user_role)
-        
-        # ルートタスク（level=0）を取得
-        root_tasks = self.db.query(Task).filter(
-            and_(Task.project_id == project_id, Task.level == 0)
-        ).order_by(Task.sort_order, Task.id).all()
-        
-        result = []
-        for root_task in root_tasks:
-            hierarchy = self._build_task_hierarchy(root_task)
-            result.append(hierarchy)
-        
-        return result
-    
-    def _build_task_hierarchy(self, task: Task) -> TaskHierarchy:
-        """タスク階層を再帰的に構築"""
-        subtasks = []
-        for subtask in task.subtasks:
-            subtask_hierarchy = self._build_task_hierarchy(subtask)
-            subtasks.append(subtask_hierarchy)
-        
-        return TaskHierarchy(
-            id=task.id,
-            name=task.name,
-            level=task.level,
-            parent_task_id=task.parent_task_id,
-            status=task.status,
-            progress_rate=task.progress_rate,
-            subtasks=subtasks
-        )
-    
     def get_valid_predecessors(
         self, 
         task_id: int, 
@@ -414,171 +942,327 @@ class TaskService:
         """同じグループ内での有効な先行タスク一覧を取得"""
         task = self.get_task_by_id(task_id, user_id, user_role)
         
-        valid_predecessors = []
-        
         if task.level == 0:
             # ルートタスクの場合、同じプロジェクト内の他のルートタスクが対象
-            root_tasks = self.db.query(Task).filter(
+            rows = self.db.query(
+                Task.id, Task.name, Task.level, Task.parent_task_id
+            ).filter(
                 and_(
                     Task.project_id == task.project_id,
                     Task.level == 0,
                     Task.id != task.id
                 )
             ).all()
-            valid_predecessors = root_tasks
         else:
-            # サブタスクの場合、同じ親を持つタスクと上位階層のタスクが対象
-            if task.parent_task:
-                # 同じ親を持つ兄弟タスク
-                siblings = self.db.query(Task).filter(
-                    and_(
-                        Task.parent_task_id == task.parent_task_id,
-                        Task.id != task.id
+            # サブタスクの場合、同じ親を持つ兄弟タスクと親タスクとその祖先が対象（祖先はpathから取得）
+            rows = []
+            if task.parent_task_id is not None:
+                ancestor_ids = task.ancestor_ids
+                candidates = self.db.query(
+                    Task.id, Task.name, Task.level, Task.parent_task_id
+                ).filter(
+                    Task.project_id == task.project_id,
+                    or_(
+                        and_(Task.parent_task_id == task.parent_task_id, Task.id != task.id),
+                        Task.id.in_(ancestor_ids)
                     )
-                ).all()
-                valid_predecessors.extend(siblings)
-                
-                # 親タスクとその祖先
-                current_parent = task.parent_task
-                while current_parent:
-                    valid_predecessors.append(current_parent)
-                    current_parent = current_parent.parent_task
+                ).order_by(Task.sort_order, Task.id).all()
+                # 兄弟→親→祖先の順を維持
+                ancestors = {row.id: row for row in candidates if row.id in ancestor_ids}
+                rows = [row for row in candidates if row.id not in ancestors] + [
+                    ancestors[t] for t in reversed(ancestor_ids) if t in ancestors
+                ]
         
         # ValidPredecessorTaskスキーマに変換
-        result = []
-        for predecessor in valid_predecessors:
-            result.append(ValidPredecessorTask(
-                id=predecessor.id,
-                name=predecessor.name,
-                level=predecessor.level,
-                parent_task_id=predecessor.parent_task_id
-            ))
-        
-        return result
+        return [
+            ValidPredecessorTask(
+                id=row.id,
+                name=row.name,
+                level=row.level,
+                parent_task_id=row.parent_task_id
+            )
+            for row in rows
+        ]
 
     def _check_project_access(self, project_id: int, user_id: int, user_role: str):
         """プロジェクトアクセス権限チェック"""
         if user_role == "admin":
             return True
             
-        project = self.db.query(Project).options(
-            joinedload(Project.members)
-        ).filter(Project.id == project_id).first()
-        
-        if not project:
+        access = get_project_access(self.db, project_id, user_id)
+        if access is None:
             raise NotFoundError("プロジェクト")
             
         # プロジェクトメンバーかチェック
-        is_member = any(member.user_id == user_id for member in project.members)
-        if not is_member:
+        if not access.is_member:
             raise AuthorizationError("このプロジェクトにアクセスする権限がありません")
 
     def _can_modify_project(self, project_id: int, user_id: int, user_role: str) -> bool:
-        """プロジェクト変更権限チェック"""
+        """プロジェクト変更権限チェック（作成者またはマネージャー）"""
         if user_role == "admin":
             return True
             
-        project = self.db.query(Project).options(
-            joinedload(Project.members)
-        ).filter(Project.id == project_id).first()
-        
-        if not project:
-            return False
-            
-        # プロジェクト作成者またはマネージャーかチェック
-        if project.created_by == user_id:
-            return True
-            
-        # マネージャー権限チェック
-        member = next((m for m in project.members if m.user_id == user_id), None)
-        return member and member.role == "manager"
+        access = get_project_access(self.db, project_id, user_id)
+        return access is not None and access.can_modify
 
     def _creates_circular_dependency(self, predecessor_id: int, successor_id: int) -> bool:
-        """循環依存チェック（簡易版）"""
-        # successor_idから辿ってpredecessor_idに到達するかチェック
-        visited = set()
-        stack = [successor_id]
+        """循環依存チェック（successorから後続方向に辿ってpredecessorに到達するか）
+
+        キャッシュしたグラフは他プロセスの書き込みを反映していない場合があるため、
+        書き込みと同じトランザクションで再帰CTEによりDBを検索する。
+        """
+        reachable = select(TaskDependency.successor_id.label("id")).where(
+            TaskDependency.predecessor_id == successor_id
+        ).cte("reachable", recursive=True)
+        reachable = reachable.union(
+            select(TaskDependency.successor_id).where(TaskDependency.predecessor_id == reachable.c.id)
+        )
+        return self.db.query(
+            select(reachable.c.id).where(reachable.c.id == predecessor_id).exists()
+        ).scalar()
+
+    def _invalidate_project_cache(self, project_id: int):
+        """タスク・依存関係の書き込み後にプロジェクト単位のキャッシュを無効化"""
+        bump_project_version(project_id)
+
+    def _propagate_task_dates(self, task: Task) -> List[TaskDateShift]:
+        """変更タスクから後続タスクへトポロジカル順に日程を伝播
+
+        依存種別とラグ日数から求めた最早開始より前にある後続タスクのみを
+        所要日数を保ったまま後ろへ移動する（前倒しはしない）。
+        移動した全タスクは1回の一括UPDATEで書き込む。
+        """
+        if task.planned_start_date is None:
+            return []
+        
+        graph = get_project_graph(self.db, task.project_id)
+        if task.id not in graph:
+            return []
         
+        # 変更タスクから到達可能な後続タスクを収集（変更タスクに戻る依存は循環）
+        reachable = set()
+        stack = [task.id]
         while stack:
-            current_id = stack.pop()
-            if current_id in visited:
-                continue
-            visited.add(current_id)
-            
-            if current_id == predecessor_id:
-                return True
-                
-            # current_idが依存しているタスクを取得
-            dependencies = self.db.query(TaskDependency).filter(
-                TaskDependency.successor_id == current_id
-            ).all()
-            
-            for dep in dependencies:
-                if dep.predecessor_id not in visited:
-                    stack.append(dep.predecessor_id)
+            for successor_id, _, _ in graph.successors(stack.pop()):
+                if successor_id == task.id:
+                    raise ValidationError("依存関係に循環があるため日程を伝播できません")
+                if successor_id not in reachable:
+                    reachable.add(successor_id)
+                    stack.append(successor_id)
+        if not reachable:
+            return []
+        
+        dates = {
+            row.id: (row.planned_start_date, row.planned_end_date)
+            for row in self.db.query(
+                Task.id, Task.planned_start_date, Task.planned_end_date
+            ).filter(Task.id.in_(reachable))
+        }
+        dates[task.id] = (task.planned_start_date, task.planned_end_date or task.planned_start_date)
+        
+        # 到達可能な部分グラフ内でのトポロジカル順
+        in_degree = {task_id: 0 for task_id in reachable}
+        for task_id in reachable:
+            in_degree[task_id] = sum(
+                1 for predecessor_id, _, _ in graph.predecessors(task_id)
+                if predecessor_id in reachable or predecessor_id == task.id
+            )
+        
+        changed = {task.id}
+        shifts = {}
+        queue = deque([task.id])
+        processed = 0
+        while queue:
+            current_id = queue.popleft()
+            processed += 1
+            current_start, current_end = dates[current_id]
+            for successor_id, dependency_type, lag in graph.successors(current_id):
+                if successor_id == task.id:
+                    continue
+                in_degree[successor_id] -= 1
+                start, end = dates.get(successor_id, (None, None))
+                if current_id in changed and start is not None:
+                    duration = (end - start).days + 1 if end is not None else 1
+                    required = earliest_start(
+                        dependency_type, lag,
+                        current_start.toordinal(),
+                        (current_end or current_start).toordinal(),
+                        duration
+                    )
+                    delta = required - start.toordinal()
+                    if delta > 0:
+                        start = start + timedelta(days=delta)
+                        end = end + timedelta(days=delta) if end is not None else None
+                        dates[successor_id] = (start, end)
+                        shifts[successor_id] = (start, end)
+                        changed.add(successor_id)
+                if in_degree[successor_id] == 0:
+                    queue.append(successor_id)
+        
+        # 循環に含まれる後続タスクは入次数が0にならず処理されない
+        if processed != len(reachable) + 1:
+            raise ValidationError("依存関係に循環があるため日程を伝播できません")
         
-        return False
+        if not shifts:
+            return []
+        
+        self.db.execute(
+            update(Task),
+            [
+                {"id": task_id, "planned_start_date": start, "planned_end_date": end}
+                for task_id, (start, end) in shifts.items()
+            ]
+        )
+        
+        return [
+            TaskDateShift(id=task_id, planned_start_date=start, planned_end_date=end)
+            for task_id, (start, end) in shifts.items()
+        ]
 
-    def _update_parent_progress(self, task: Task):
-        """親タスクの進捗率を子タスクの平均から自動算出・更新"""
+    def _update_parent_progress(self, task: Task, weight_by_hours: Optional[bool] = None):
+        """更新タスクの祖先チェーンのみ進捗率を再計算し、変更分を一括更新"""
         if not task.parent_task_id:
             return  # ルートタスクの場合は何もしない
         
-        parent_task = task.parent_task
-        if not parent_task:
+        if weight_by_hours is None:
+            weight_by_hours = settings.progress_weight_by_hours
+        
+        # 祖先は親から順に（pathから取得、グラフの読み込み不要）
+        ancestors = task.ancestor_ids[::-1]
+        if not ancestors:
             return
         
-        # 親タスクの全子タスクの進捗率を取得
-        subtasks = self.db.query(Task).filter(
-            Task.parent_task_id == parent_task.id
+        # 祖先チェーン上の各タスクの子タスクと祖先自身を1回のクエリで取得
+        rows = self.db.query(
+            Task.id, Task.parent_task_id, Task.progress_rate, Task.estimated_hours
+        ).filter(
+            or_(Task.parent_task_id.in_(ancestors), Task.id.in_(ancestors))
         ).all()
         
-        if not subtasks:
-            return
+        children = defaultdict(list)
+        progress = {}
+        hours = {}
+        for row in rows:
+            children[row.parent_task_id].append(row.id)
+            progress[row.id] = row.progress_rate or 0
+            hours[row.id] = row.estimated_hours or 0
+        # 未フラッシュの更新値を反映
+        progress[task.id] = task.progress_rate or 0
+        hours[task.id] = task.estimated_hours or 0
         
-        # 子タスクの進捗率の平均を計算
-        total_progress = sum(subtask.progress_rate for subtask in subtasks)
-        average_progress = int(total_progress / len(subtasks))
-        
-        # 親タスクの進捗率を更新
-        parent_task.progress_rate = average_progress
+        updates = []
+        for ancestor_id in ancestors:
+            child_ids = children.get(ancestor_id)
+            if not child_ids:
+                break
+            new_progress = rollup_progress(
+                [(progress[c], hours[c]) for c in child_ids], weight_by_hours
+            )
+            # 変化がなければ上位の祖先も変わらない
+            if new_progress == progress.get(ancestor_id):
+                break
+            progress[ancestor_id] = new_progress
+            updates.append({"id": ancestor_id, "progress_rate": new_progress})
         
-        # さらに上位の親タスクも再帰的に更新
-        self._update_parent_progress(parent_task)
+        if updates:
+            self.db.execute(update(Task), updates)
 
     def get_task_hierarchy(self, project_id: int, user_id: int, user_role: str) -> List[TaskHierarchy]:
         """プロジェクトのタスク階層構造取得（ガンチャート用）"""
         # プロジェクトアクセス権限チェック
         self._check_project_access(project_id, user_id, user_role)
         
-        # 全てのタスクを取得
-        tasks = self.db.query(Task).filter(Task.project_id == project_id).order_by(
-            Task.level, Task.sort_order, Task.id
+        # 階層構築に必要な列のみを1回のクエリで取得（兄弟順はsort_order, id）
+        rows = self.db.query(
+            Task.id,
+            Task.name,
+            Task.level,
+            Task.parent_task_id,
+            Task.status,
+            Task.progress_rate
+        ).filter(Task.project_id == project_id).order_by(
+            Task.sort_order, Task.id
         ).all()
         
-        # 階層構造を構築
-        task_dict = {task.id: task for task in tasks}
-        hierarchy = []
-        
-        def build_hierarchy(parent_id: Optional[int] = None, level: int = 0) -> List[TaskHierarchy]:
-            result = []
-            parent_tasks = [t for t in tasks if t.parent_task_id == parent_id and t.level == level]
-            
-            for task in parent_tasks:
-                task_hierarchy = TaskHierarchy(
-                    id=task.id,
-                    name=task.name,
-                    level=task.level,
-                    parent_task_id=task.parent_task_id,
-                    status=task.status,
-                    progress_rate=task.progress_rate,
-                    subtasks=build_hierarchy(task.id, level + 1)
-                )
-                result.append(task_hierarchy)
-            
-            return result
-        
-        return build_hierarchy()
+        return build_task_hierarchy(rows)
+
+    def get_project_changes(
+        self, project_id: int, user_id: int, user_role: str, since: Optional[str] = None
+    ) -> TaskChanges:
+        """前回カーソル以降に作成・更新・削除されたタスク・依存関係・担当者を取得
+
+        sinceを省略した場合、または削除記録の保持期間より古いカーソルの場合は全件を返す。
+        返却するカーソルは未コミットの書き込みより前の時刻（_sync_horizon）で、
+        取りこぼさない代わりに同じ行が再送されることがある（クライアントはIDで上書きする）。
+        """
+        # プロジェクトアクセス権限チェック
+        self._check_project_access(project_id, user_id, user_role)
+
+        since_at = decode_time_cursor(since) if since else None
+        read_at, horizon = self._sync_horizon()
+        cursor = encode_time_cursor(horizon)
+        if since_at is not None and since_at < read_at - timedelta(days=settings.deleted_record_retention_days):
+            since_at = None  # 削除記録が削除済みの可能性があるため全件を返す
+
+        tasks = self.db.query(Task).filter(Task.project_id == project_id)
+        dependencies = self.db.query(TaskDependency).join(
+            Task, Task.id == TaskDependency.successor_id
+        ).filter(Task.project_id == project_id)
+        assignments = self.db.query(TaskAssignment).join(
+            Task, Task.id == TaskAssignment.task_id
+        ).filter(Task.project_id == project_id)
+        deleted = []
+
+        if since_at is not None:
+            tasks = tasks.filter(Task.updated_at >= since_at)
+            dependencies = dependencies.filter(TaskDependency.created_at >= since_at)
+            assignments = assignments.filter(TaskAssignment.assigned_at >= since_at)
+            deleted = self.db.query(DeletedRecord).filter(
+                DeletedRecord.project_id == project_id,
+                DeletedRecord.deleted_at >= since_at
+            ).order_by(DeletedRecord.deleted_at, DeletedRecord.id).all()
+
+        return TaskChanges(
+            project_id=project_id,
+            cursor=cursor,
+            full=since_at is None,
+            tasks=tasks.order_by(Task.sort_order, Task.id).all(),
+            dependencies=dependencies.order_by(TaskDependency.id).all(),
+            assignments=assignments.order_by(TaskAssignment.id).all(),
+            deleted=deleted
+        )
+
+    def _sync_horizon(self) -> Tuple[datetime, datetime]:
+        """(DBの現在時刻, 差分同期カーソルの時刻) を取得
+
+        書き込み時刻の now() はトランザクション開始時刻のため、コミット前の行は
+        実行中で最も古いトランザクションの開始時刻以降の時刻を持つ。PostgreSQLではその時刻を
+        カーソルにし、長いトランザクション（一括更新など）の行も取りこぼさない。
+        それ以外のDBでは settings.sync_cursor_overlap_seconds 秒遡らせる。
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            row = self.db.execute(text(
+                "SELECT now(), least(now(), min(xact_start)) FROM pg_stat_activity "
+                "WHERE datname = current_database() AND xact_start IS NOT NULL"
+            )).one()
+            return row[0], row[1]
+        read_at = self.db.scalar(select(func.now()))
+        if read_at.tzinfo is None:
+            read_at = read_at.replace(tzinfo=timezone.utc)
+        return read_at, read_at - timedelta(seconds=settings.sync_cursor_overlap_seconds)
+
+    def _record_deletions(self, project_id: int, entity_type: str, entity_ids):
+        """差分同期用に削除記録を追加し、保持期間を過ぎたプロジェクトの記録を削除（コミットは呼び出し側）"""
+        if entity_ids:
+            self.db.execute(insert(DeletedRecord), [
+                {"project_id": project_id, "entity_type": entity_type, "entity_id": entity_id}
+                for entity_id in entity_ids
+            ])
+            self.db.execute(delete(DeletedRecord).where(
+                DeletedRecord.project_id == project_id,
+                DeletedRecord.deleted_at
+                < datetime.now(timezone.utc) - timedelta(days=settings.deleted_record_retention_days)
+            ))
 
     def get_project_dependencies(self, project_id: int, user_id: int, user_role: str) -> List[TaskDependency]:
         """プロジェクトのタスク依存関係一覧取得（ガンチャート用）"""
@@ -592,83 +1276,201 @@ class TaskService:
         
         return dependencies
 
+    def get_project_schedule(
+        self, 
+        project_id: int, 
+        user_id: int, 
+        user_role: str, 
+        persist: bool = False
+    ) -> ProjectSchedule:
+        """プロジェクトのクリティカルパス計算（最早/最遅日程・フロート）"""
+        # プロジェクトアクセス権限チェック
+        self._check_project_access(project_id, user_id, user_role)
+        
+        if persist and not self._can_modify_project(project_id, user_id, user_role):
+            raise AuthorizationError("スケジュールを保存する権限がありません")
+        
+        project = self.db.query(Project.start_date).filter(Project.id == project_id).first()
+        if not project:
+            raise NotFoundError("プロジェクト")
+        
+        graph = get_project_graph(self.db, project_id)
+        task_dates = {
+            row.id: (row.planned_start_date, row.planned_end_date)
+            for row in self.db.query(
+                Task.id, Task.planned_start_date, Task.planned_end_date
+            ).filter(Task.project_id == project_id)
+        }
+        result = compute_schedule(graph, task_dates, project.start_date)
+        
+        from_ordinal = date.fromordinal
+        critical_ids = set(result.critical_path)
+        entries = [
+            TaskScheduleEntry(
+                task_id=task_id,
+                early_start_date=from_ordinal(result.early_start[i]),
+                early_finish_date=from_ordinal(result.early_finish[i]),
+                late_start_date=from_ordinal(result.late_start[i]),
+                late_finish_date=from_ordinal(result.late_finish[i]),
+                total_float=result.total_float[i],
+                free_float=result.free_float[i],
+                is_critical=task_id in critical_ids
+            )
+            for i, task_id in enumerate(result.task_ids)
+        ]
+        
+        if persist:
+            self._persist_schedule(project_id, entries)
+        
+        return ProjectSchedule(
+            project_id=project_id,
+            project_start_date=from_ordinal(result.project_start),
+            project_finish_date=from_ordinal(result.project_finish),
+            critical_path=result.critical_path,
+            tasks=entries,
+            persisted=persist
+        )
+
+    def _persist_schedule(self, project_id: int, entries: List[TaskScheduleEntry]):
+        """スケジュール計算結果を保存（プロジェクト単位で置き換え）"""
+        self.db.execute(delete(TaskSchedule).where(TaskSchedule.project_id == project_id))
+        if entries:
+            self.db.execute(
+                insert(TaskSchedule),
+                [dict(entry.model_dump(), project_id=project_id) for entry in entries]
+            )
+        self.db.commit()
+
     def update_task_parent(
         self, 
         task_id: int, 
         parent_task_id: Optional[int], 
-        level: int, 
         user_id: int, 
         user_role: str
     ) -> Task:
-        """タスクの親子関係更新"""
+        """タスクの親子関係更新（子孫タスクの階層・pathもまとめて更新）"""
         task = self.get_task_by_id(task_id, user_id, user_role)
+
+        # 更新権限チェック
+        if not self._can_modify_project(task.project_id, user_id, user_role):
+            raise AuthorizationError("タスクを更新する権限がありません")
         
-        # 親タスクの循環参照チェック
+        new_level, new_path, new_root_id = 0, task_path(None, None), task.id
         if parent_task_id:
-            if self._check_parent_cycle(task_id, parent_task_id):
+            parent = self.db.query(Task.id, Task.level, Task.path, Task.root_task_id).filter(
+                Task.id == parent_task_id,
+                Task.project_id == task.project_id
+            ).first()
+            if not parent:
+                raise NotFoundError("親タスク")
+
+            # 親タスクの循環参照チェック（移動先が自身または子孫）
+            new_path = task_path(parent.path, parent.id)
+            if parent.id == task.id or new_path.startswith(task.descendant_path_prefix):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="親子関係で循環参照が発生します"
                 )
+            new_level, new_root_id = parent.level + 1, parent.root_task_id
+
+        # 移動後のサブツリー全体が3階層以内に収まるかチェック
+        subtree = self._subtree_filter(task)
+        max_level = self.db.query(func.max(Task.level)).filter(subtree).scalar()
+        if new_level + max_level - task.level > 3:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="サブタスクは3階層までしか作成できません"
+            )
         
-        # 更新
+        # 親を付け替え、サブツリーの階層・path・ルートを1文で更新
+        old_path = task.path
+        self.db.execute(
+            update(Task)
+            .where(subtree)
+            .values(
+                level=Task.level + (new_level - task.level),
+                path=literal(new_path, String) + func.substr(Task.path, len(old_path) + 1),
+                root_task_id=new_root_id
+            )
+            .execution_options(synchronize_session=False)
+        )
         task.parent_task_id = parent_task_id
-        task.level = level
         
         self.db.commit()
+        self._invalidate_project_cache(task.project_id)
         self.db.refresh(task)
         
         return task
 
-    def calculate_parent_progress(self, project_id: int, user_id: int, user_role: str) -> List[Task]:
-        """親タスクの進捗率自動計算"""
+    def calculate_parent_progress(
+        self, 
+        project_id: int, 
+        user_id: int, 
+        user_role: str,
+        weight_by_hours: Optional[bool] = None
+    ) -> List[dict]:
+        """親タスクの進捗率自動計算（プロジェクト全体を1回のボトムアップ走査で再計算）"""
         # プロジェクトアクセス権限チェック
         self._check_project_access(project_id, user_id, user_role)
         
-        updated_tasks = []
+        updated_tasks = self._rollup_project_progress(project_id, weight_by_hours)
+        if updated_tasks:
+            self.db.commit()
+            self._invalidate_project_cache(project_id)
+        return updated_tasks
+
+    def _rollup_project_progress(
+        self, project_id: int, weight_by_hours: Optional[bool] = None
+    ) -> List[dict]:
+        """プロジェクト全体の親タスク進捗率を再計算して一括更新（コミットは呼び出し側）"""
+        if weight_by_hours is None:
+            weight_by_hours = settings.progress_weight_by_hours
         
-        # 親タスクを持つタスク（レベル1以上）を取得してレベル順にソート
-        parent_tasks = self.db.query(Task).filter(
-            and_(Task.project_id == project_id, Task.level > 0)
-        ).order_by(Task.level.desc()).all()  # 下位レベルから更新
+        rows = self.db.query(
+            Task.id, Task.parent_task_id, Task.progress_rate, Task.estimated_hours
+        ).filter(Task.project_id == project_id).all()
         
-        for parent_task in parent_tasks:
-            # 子タスクの進捗率を計算
-            subtasks = self.db.query(Task).filter(
-                Task.parent_task_id == parent_task.id
-            ).all()
-            
-            if subtasks:
-                # 子タスクの進捗率の平均を計算
-                total_progress = sum(subtask.progress_rate for subtask in subtasks)
-                average_progress = int(total_progress / len(subtasks))
-                
-                # 進捗率が変更された場合のみ更新
-                if parent_task.progress_rate != average_progress:
-                    parent_task.progress_rate = average_progress
-                    updated_tasks.append(parent_task)
+        progress = {row.id: row.progress_rate or 0 for row in rows}
+        hours = {row.id: row.estimated_hours or 0 for row in rows}
+        children = defaultdict(list)
+        roots = []
+        for row in rows:
+            if row.parent_task_id in progress:
+                children[row.parent_task_id].append(row.id)
+            else:
+                roots.append(row.id)
         
-        self.db.commit()
+        # ルートからの幅優先順を逆にたどり、子→親の順に集計（ルートタスクも対象）
+        order = roots
+        for task_id in order:
+            order.extend(children.get(task_id, ()))
+        
+        updated_tasks = []
+        for task_id in reversed(order):
+            child_ids = children.get(task_id)
+            if not child_ids:
+                continue
+            new_progress = rollup_progress(
+                [(progress[c], hours[c]) for c in child_ids], weight_by_hours
+            )
+            # 進捗率が変更された場合のみ更新
+            if new_progress != progress[task_id]:
+                progress[task_id] = new_progress
+                updated_tasks.append({"id": task_id, "progress_rate": new_progress})
+        
+        if updated_tasks:
+            self.db.execute(update(Task), updated_tasks)
         return updated_tasks
 
-    def _check_parent_cycle(self, task_id: int, parent_task_id: int) -> bool:
-        """親子関係の循環参照チェック"""
-        visited = set()
-        current_id = parent_task_id
-        
-        while current_id:
-            if current_id in visited:
-                return True
-            if current_id == task_id:
-                return True
-                
-            visited.add(current_id)
-            
-            # 親タスクを取得
-            parent_task = self.db.query(Task).filter(Task.id == current_id).first()
-            if not parent_task:
-                break
-                
-            current_id = parent_task.parent_task_id
-        
-        return False
\ No newline at end of file
+    def _subtree_filter(self, *tasks):
+        """タスク自身とその子孫を選択する条件（pathの前方一致、インデックス検索）
+
+        tasks は同じプロジェクトの id・project_id・path を持つタスクまたは行。
+        """
+        return and_(
+            Task.project_id == tasks[0].project_id,
+            or_(
+                Task.id.in_([task.id for task in tasks]),
+                *(Task.path.like(task_path(task.path, task.id) + "%") for task in tasks)
+            )
+        )
@@ -6,6 +6,8 @@ from ..models.template import ProjectTemplate, TemplateRating
 from ..models.project import Project
 from ..models.task import Task, TaskDependency
 from ..models.user import User
+from .task_service import rebuild_task_paths
+from ..utils.project_version import bump_project_version
 
 class TemplateService:
     def create_template_from_project(self, db: Session, project_id: int, 
@@ -210,6 +212,10 @@ class TemplateService:
                     task.parent_task_id = parent_task_id
                     db.commit()
         
+        # 親子関係の確定後に root_task_id / path をまとめて設定
+        rebuild_task_paths(db, project.id)
+        db.commit()
+        
         # 依存関係を作成
         for template_dependency in template_data.get("dependencies", []):
             predecessor_id = task_id_mapping[template_dependency["predecessor_id"]]
@@ -225,6 +231,7 @@ class TemplateService:
             db.add(dependency)
         
         db.commit()
+        bump_project_version(project.id)
         return project
     
     def rate_template(self, db: Session, template_id: int, user_id: int, 
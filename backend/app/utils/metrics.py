@@ -0,0 +1,108 @@
+import time
+from typing import Dict
+from prometheus_client import Counter, Gauge, Histogram, disable_created_metrics
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Prometheus メトリクス（prometheus_client のデフォルトレジストリに登録し、/metrics で出力）
+#   値はプロセス単位のため、複数ワーカーで起動した場合はワーカーごとの値になる。
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# *_created（生成時刻）の系列は出力しない
+disable_created_metrics()
+
+# HTTP
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "Requests currently being processed"
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency until the response is complete",
+    ("method", "route"), buckets=LATENCY_BUCKETS
+)
+http_responses = Counter(
+    "http_responses_total", "Responses by status code", ("method", "route", "status")
+)
+
+class MetricsMiddleware:
+    """ルート（パステンプレート）単位のレイテンシ・ステータス・処理中リクエスト数を記録するASGIミドルウェア"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = "500"  # レスポンス開始前に例外で終わった場合
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # ルーティング後のscopeにはマッチしたルートが入る（未マッチはまとめてラベル数を抑える）
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            method = scope["method"]
+            http_request_duration.labels(method, path).observe(time.perf_counter() - started)
+            http_responses.labels(method, path, status).inc()
+
+# DB接続プール
+db_pool_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection",
+    ("pool",), buckets=POOL_WAIT_BUCKETS
+)
+_pools: Dict[str, Pool] = {}
+
+class _PoolCollector:
+    """登録済みプールの状態を出力時に取得する"""
+
+    def collect(self):
+        families = {
+            field: GaugeMetricFamily(f"db_pool_{field}", documentation, labels=("pool",))
+            for field, documentation in [
+                ("size", "Configured pool size"),
+                ("checked_out", "Connections currently checked out"),
+                ("overflow", "Connections open beyond the pool size"),
+                ("checked_in", "Idle connections in the pool"),
+            ]
+        }
+        for name, pool in list(_pools.items()):
+            if isinstance(pool, QueuePool):
+                families["size"].add_metric((name,), pool.size())
+                families["checked_out"].add_metric((name,), pool.checkedout())
+                families["overflow"].add_metric((name,), max(0, pool.overflow()))
+                families["checked_in"].add_metric((name,), pool.checkedin())
+        return list(families.values())
+
+REGISTRY.register(_PoolCollector())
+
+def register_pool(name: str, pool: Pool):
+    """プールの状態を /metrics に出力する"""
+    _pools[name] = pool
+
+class _TimedCheckoutMixin:
+    """接続の取得待ち時間（プールが空の場合の待機を含む）を計測"""
+    metrics_name = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.labels(self.metrics_name).observe(time.perf_counter() - started)
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics_name = "sync"
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
@@ -0,0 +1,56 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, NamedTuple, Optional, Tuple
+from fastapi import Response
+from app.utils.exceptions import ValidationError
+
+# キーセットページネーション用のカーソル
+# 最後に返した行のソートキーを不透明な文字列として返し、次ページはその続きから取得する
+
+_MICROSECOND = timedelta(microseconds=1)
+
+class Page(NamedTuple):
+    """1ページ分の取得結果"""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+def encode_cursor(*keys: Any) -> str:
+    """ソートキーをカーソル文字列に変換"""
+    raw = json.dumps(list(keys), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> Tuple:
+    """カーソル文字列をソートキーに戻す（キー数が一致しない場合はエラー）"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        keys = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError("カーソルが不正です")
+    if not isinstance(keys, list) or len(keys) != size or not all(isinstance(k, int) for k in keys):
+        raise ValidationError("カーソルが不正です")
+    return tuple(keys)
+
+def encode_time_cursor(moment: datetime) -> str:
+    """時刻をカーソル文字列に変換（タイムゾーンなしの値はUTCとして扱う）"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    delta = moment - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return encode_cursor(delta // _MICROSECOND)
+
+def decode_time_cursor(cursor: str) -> datetime:
+    """カーソル文字列をUTC時刻に戻す"""
+    microseconds, = decode_cursor(cursor, 1)
+    try:
+        return datetime(1970, 1, 1, tzinfo=timezone.utc) + microseconds * _MICROSECOND
+    except OverflowError:
+        raise ValidationError("カーソルが不正です")
+
+def set_page_headers(response: Response, page: Page):
+    """次ページのカーソルと総件数をレスポンスヘッダーに設定"""
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.project import Project, ProjectMember
+
+# プロジェクト権限チェックのキャッシュ
+# (user_id, project_id) → 作成者かどうか・メンバーロール を2段で保持する
+#   1. リクエスト（DBセッション）単位のメモ: 同一リクエスト内の繰り返しチェックでクエリを発行しない
+#   2. プロセス内の短TTL共有キャッシュ: メンバー変更時は明示的に無効化し、
+#      他プロセスでの変更はTTL経過で反映される
+
+_SESSION_KEY = "project_access"
+
+class ProjectAccess(NamedTuple):
+    """ユーザーのプロジェクトに対する権限情報"""
+    is_creator: bool
+    member_role: Optional[str]
+
+    @property
+    def is_member(self) -> bool:
+        return self.member_role is not None
+
+    @property
+    def can_modify(self) -> bool:
+        """作成者またはマネージャーなら変更可能"""
+        return self.is_creator or self.member_role == "manager"
+
+_cache: "OrderedDict[Tuple[int, int], Tuple[float, ProjectAccess]]" = OrderedDict()
+_lock = threading.Lock()
+
+def get_project_access(db: Session, project_id: int, user_id: int) -> Optional[ProjectAccess]:
+    """ユーザーのプロジェクト権限を取得（プロジェクトが存在しない場合はNone）"""
+    key = (user_id, project_id)
+    memo = db.info.setdefault(_SESSION_KEY, {})
+    if key in memo:
+        return memo[key]
+
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] > now:
+            _cache.move_to_end(key)
+            memo[key] = entry[1]
+            return entry[1]
+
+    # 作成者とメンバーロールを1行で取得（メンバー一覧は読み込まない）
+    row = db.query(Project.created_by, ProjectMember.role).outerjoin(
+        ProjectMember,
+        and_(ProjectMember.project_id == Project.id, ProjectMember.user_id == user_id)
+    ).filter(Project.id == project_id).first()
+
+    # 存在しないプロジェクトは作成直後に参照される可能性があるため共有キャッシュしない
+    access = ProjectAccess(row.created_by == user_id, row.role) if row else None
+    memo[key] = access
+    if access is not None and settings.permission_cache_ttl_seconds > 0:
+        with _lock:
+            _cache[key] = (now + settings.permission_cache_ttl_seconds, access)
+            _cache.move_to_end(key)
+            while len(_cache) > settings.permission_cache_size:
+                _cache.popitem(last=False)
+    return access
+
+def invalidate_project_access(project_id: int, user_id: Optional[int] = None, db: Optional[Session] = None):
+    """プロジェクト（user_id指定時はそのユーザー分のみ）の権限キャッシュを破棄"""
+    def matches(key):
+        return key[1] == project_id and (user_id is None or key[0] == user_id)
+
+    with _lock:
+        for key in [key for key in _cache if matches(key)]:
+            del _cache[key]
+    if db is not None:
+        memo = db.info.get(_SESSION_KEY)
+        if memo:
+            for key in [key for key in memo if matches(key)]:
+                del memo[key]
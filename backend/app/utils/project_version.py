@@ -0,0 +1,66 @@
+import threading
+from typing import Dict, Optional
+from app.utils.redis_client import get_redis, mark_redis_unavailable, redis_errors
+
+# プロジェクトごとのデータ版数（タスク・依存関係・プロジェクトの書き込みで加算）
+# キャッシュは取得時の版数と比較して古くなったかを判定する
+#   settings.redis_url 設定時はRedisのカウンタを全プロセスで共有し、
+#   未設定・障害中はプロセス内のカウンタを使う（他プロセスの書き込みは各キャッシュのTTLで反映）。
+#   全プロジェクト横断の集計用に、いずれかのプロジェクトの書き込みで加算される全体の版数も持つ。
+
+_GLOBAL = "all"
+_KEY_PREFIX = "project_version:"
+
+_versions: Dict[object, int] = {}
+_lock = threading.Lock()
+
+def _get(scope) -> int:
+    client = get_redis()
+    if client is not None:
+        try:
+            value = client.get(f"{_KEY_PREFIX}{scope}")
+            return int(value) if value is not None else 0
+        except redis_errors() as e:
+            mark_redis_unavailable(e)
+    return _versions.get(scope, 0)
+
+def get_shared_project_version(project_id: int) -> Optional[int]:
+    """全プロセスで共有する（Redisの）版数を取得（Redis未設定・障害中はNone）
+
+    他プロセスの書き込みをTTLなしで検知する必要があるキャッシュはこちらを使う。
+    """
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        value = client.get(f"{_KEY_PREFIX}{project_id}")
+    except redis_errors() as e:
+        mark_redis_unavailable(e)
+        return None
+    return int(value) if value is not None else 0
+
+def get_project_version(project_id: int) -> int:
+    """プロジェクトの現在の版数を取得"""
+    return _get(project_id)
+
+def get_global_version() -> int:
+    """全プロジェクト横断の版数を取得"""
+    return _get(_GLOBAL)
+
+def bump_project_version(project_id: int) -> int:
+    """プロジェクトと全体の版数を加算（書き込みのコミット後に呼び出す）"""
+    with _lock:
+        version = _versions.get(project_id, 0) + 1
+        _versions[project_id] = version
+        _versions[_GLOBAL] = _versions.get(_GLOBAL, 0) + 1
+
+    client = get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.incr(f"{_KEY_PREFIX}{project_id}")
+            pipe.incr(f"{_KEY_PREFIX}{_GLOBAL}")
+            return pipe.execute()[0]
+        except redis_errors() as e:
+            mark_redis_unavailable(e)
+    return version
@@ -0,0 +1,187 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+# SQL発行数・DB時間のリクエスト単位の計測とN+1検出
+#   engineの before/after_cursor_execute イベントで、現在のリクエストの QueryStats に記録する。
+#   リクエストはコンテキスト変数で識別するため、スレッドプールで実行される同期エンドポイントも対象になる。
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+_START_KEY = "query_counter_start"
+
+# 文の形（パラメータの値や IN リストの長さが違うだけの文は同じ形とみなす）
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+|\$\d+|'[^']*'|-?\d+(?:\.\d+)?)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+|\$\d+|'[^']*'|-?\d+(?:\.\d+)?))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """SQL文を正規化して形を返す（値リテラル・INリスト・空白の違いを無視）"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _IN_LIST.sub("(?)", shape)
+    return _NUMBER.sub("N", shape)
+
+class QueryStats:
+    """1リクエスト（または計測ブロック）分のSQL発行数・DB時間・文の形ごとの回数"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float):
+        shape = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            self.shapes[shape] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """threshold回を超えて繰り返された文の形を (形, 回数) で多い順に返す"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+def current_query_stats() -> Optional[QueryStats]:
+    """現在のリクエストの計測結果（計測中でなければNone）"""
+    return _current.get()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info[_START_KEY].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+def _handle_error(exception_context):
+    # 失敗した文の開始時刻を捨てる（afterイベントは呼ばれない）
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_KEY):
+        connection.info[_START_KEY].pop()
+
+def instrument_engine(engine: Engine):
+    """engine（AsyncEngineの場合は sync_engine）の全SQLを計測対象にする"""
+    if not settings.query_counter_enabled or event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+def warn_repeated_statements(stats: QueryStats, label: str, threshold: Optional[int] = None):
+    """同じ形の文が閾値を超えて繰り返されていれば警告ログを出す（N+1の検出）"""
+    threshold = settings.query_repeat_warning_threshold if threshold is None else threshold
+    if threshold <= 0:
+        return
+    for shape, n in stats.repeated(threshold):
+        logger.warning(f"N+1の可能性: {label} で同じ形のSQLが{n}回実行されました: {shape[:300]}")
+
+@contextmanager
+def track_queries(label: str = "block"):
+    """ブロック内（同じコンテキスト）で発行されたSQLを計測し、終了時にN+1を警告する
+
+    バッチ処理やCeleryタスクなど、リクエスト以外の処理の計測に使う。
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        warn_repeated_statements(stats, label)
+
+class QueryBudgetExceeded(AssertionError):
+    """query_budget の上限を超えた"""
+
+@contextmanager
+def query_budget(max_queries: int, engine: Optional[Engine] = None, max_repeats: Optional[int] = None):
+    """ブロック内で発行されたSQLが max_queries 件以下であることを検証する（テスト用）
+
+    スレッドやイベントループをまたいでも数えられるよう、コンテキスト変数ではなく
+    engineのイベントで全接続を数える。engine 省略時は同期engineと非同期engine
+    （sync_engine）の両方を数える。max_repeats を指定すると同じ形の文の繰り返しも検証する。
+
+        with query_budget(5):
+            client.get(f"/api/tasks/projects/{project_id}/gantt", headers=headers)
+    """
+    if engine is None:
+        from app.database.connection import engine as sync_engine, get_async_engine
+        engines = [sync_engine, get_async_engine().sync_engine]
+    else:
+        engines = [engine]
+    stats = QueryStats()
+    # 非同期engineでは同じスレッドで複数の文が並行するため、開始時刻は接続ごとに持つ
+    start_key = object()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(start_key, []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(start_key)
+        stats.record(statement, time.perf_counter() - starts.pop() if starts else 0.0)
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", before)
+        event.listen(target, "after_cursor_execute", after)
+    try:
+        yield stats
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", before)
+            event.remove(target, "after_cursor_execute", after)
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries (budget {max_queries})")
+    if max_repeats is not None and stats.repeated(max_repeats):
+        problems.append(f"statements repeated more than {max_repeats} times")
+    if problems:
+        details = "\n".join(f"  {n}x {shape[:200]}" for shape, n in stats.shapes.most_common(10))
+        raise QueryBudgetExceeded(", ".join(problems) + "\n" + details)
+
+class QueryCounterMiddleware:
+    """リクエストごとにSQL発行数とDB時間を計測するASGIミドルウェア
+
+    本番以外（settings.environment != "production"）ではレスポンスヘッダー
+    X-DB-Queries（件数）・X-DB-Time（ミリ秒）を付与する。ヘッダー送信後に
+    発行されたSQL（ストリーミングレスポンス）はN+1の警告にのみ反映される。
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.expose_headers = settings.environment != "production"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and self.expose_headers:
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-db-queries", str(stats.count).encode()),
+                    (b"x-db-time", f"{stats.milliseconds:.1f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            warn_repeated_statements(stats, f"{scope['method']} {scope['path']}")
@@ -0,0 +1,51 @@
+import logging
+import threading
+import time
+from app.config import settings
+
+# キャッシュ・版数カウンタ用の共有Redis（settings.redis_url 未設定時は使わない）
+#   Redisはキャッシュ用途のみのため、接続できない場合は呼び出し側がプロセス内の代替に切り替える。
+#   障害中にリクエストごとの接続タイムアウトを待たないよう、失敗後は一定時間Redisを使わない。
+
+logger = logging.getLogger(__name__)
+
+_RETRY_AFTER_SECONDS = 30.0
+
+_client = None
+_retry_at = 0.0
+_lock = threading.Lock()
+
+def get_redis():
+    """共有Redisクライアント（未設定・障害中はNone）"""
+    global _client
+    if not settings.redis_url or time.monotonic() < _retry_at:
+        return None
+    if _client is None:
+        with _lock:
+            if _client is None:
+                try:
+                    import redis
+                except ImportError:
+                    mark_redis_unavailable(ImportError("redis パッケージがインストールされていません"))
+                    return None
+                _client = redis.Redis.from_url(
+                    settings.redis_url,
+                    socket_timeout=settings.redis_socket_timeout_seconds,
+                    socket_connect_timeout=settings.redis_socket_timeout_seconds,
+                )
+    return _client
+
+def mark_redis_unavailable(error: Exception):
+    """Redisの失敗を記録し、しばらくプロセス内の代替を使わせる"""
+    global _retry_at
+    if time.monotonic() >= _retry_at:
+        logger.warning(f"Redisを利用できないためプロセス内キャッシュを使用します（{_RETRY_AFTER_SECONDS:.0f}秒後に再試行）: {error}")
+    _retry_at = time.monotonic() + _RETRY_AFTER_SECONDS
+
+def redis_errors() -> tuple:
+    """Redis呼び出しで捕捉する例外"""
+    try:
+        import redis
+    except ImportError:
+        return (OSError,)
+    return (redis.RedisError, OSError)
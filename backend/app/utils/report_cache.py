@@ -0,0 +1,121 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from prometheus_client import Counter
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+from app.config import settings
+from app.utils.project_version import get_global_version, get_project_version
+from app.utils.redis_client import get_redis, mark_redis_unavailable, redis_errors
+
+# レポート結果のキャッシュ
+#   キー = レポート種別・プロジェクト・パラメータ・データ版数。タスクやプロジェクトの書き込みで
+#   版数が加算されると以降は別キーになるため、古い結果は参照されずTTLで消える。
+#   settings.redis_url 設定時はRedisに保存して全プロセスで共有し、未設定・障害中はプロセス内のLRUを使う。
+#   値はJSONに変換して保存するため、ヒット時もミス時も同じ（JSON互換の）値を返す。
+
+_KEY_PREFIX = "report:"
+
+class CachedReport(NamedTuple):
+    """レポートの値と取得結果（hit / miss / bypass）"""
+    value: Any
+    status: str
+
+report_cache_requests = Counter(
+    "report_cache_requests_total", "Report cache lookups by result (hit, miss, bypass)", ("report", "result")
+)
+
+class _HitRatioCollector:
+    """レポートごとのヒット率（bypassを除く）を出力時に算出する"""
+
+    def collect(self):
+        totals: Dict[str, Dict[str, float]] = {}
+        for metric in report_cache_requests.collect():
+            for sample in metric.samples:
+                if sample.name == "report_cache_requests_total":
+                    totals.setdefault(sample.labels["report"], {})[sample.labels["result"]] = sample.value
+        family = GaugeMetricFamily(
+            "report_cache_hit_ratio", "Report cache hits / (hits + misses), excluding bypassed requests",
+            labels=("report",)
+        )
+        for report, counts in totals.items():
+            hits, misses = counts.get("hit", 0), counts.get("miss", 0)
+            if hits + misses > 0:
+                family.add_metric((report,), hits / (hits + misses))
+        yield family
+
+REGISTRY.register(_HitRatioCollector())
+
+_local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_lock = threading.Lock()
+
+def _cache_key(report: str, project_id: Optional[int], params: Dict[str, Any]) -> Tuple[str, Any]:
+    """(キー, 保存先のRedisクライアント（プロセス内ならNone）)"""
+    if project_id is None:
+        scope, version = "all", get_global_version()
+    else:
+        scope, version = project_id, get_project_version(project_id)
+    # 版数の取得でRedisの障害を検知した場合はプロセス内に切り替わっている
+    client = get_redis()
+    digest = hashlib.sha1(json.dumps(jsonable_encoder(params), sort_keys=True).encode()).hexdigest()[:16]
+    # Redisとプロセス内では版数のカウンタが異なるため、キーを分ける
+    return f"{_KEY_PREFIX}{report}:{scope}:{'l' if client is None else 'r'}{version}:{digest}", client
+
+def _load(key: str, client) -> Optional[str]:
+    if client is not None:
+        try:
+            payload = client.get(key)
+            return payload.decode() if payload is not None else None
+        except redis_errors() as e:
+            mark_redis_unavailable(e)
+            return None
+    with _lock:
+        entry = _local.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _local[key]
+            return None
+        _local.move_to_end(key)
+        return entry[1]
+
+def _store(key: str, payload: str, client):
+    ttl = settings.report_cache_ttl_seconds
+    if client is not None:
+        try:
+            client.setex(key, ttl, payload)
+        except redis_errors() as e:
+            mark_redis_unavailable(e)
+        return
+    with _lock:
+        _local[key] = (time.monotonic() + ttl, payload)
+        _local.move_to_end(key)
+        while len(_local) > settings.report_cache_size:
+            _local.popitem(last=False)
+
+def get_or_compute_report(report: str, project_id: Optional[int], params: Dict[str, Any],
+                          compute: Callable[[], Any], refresh: bool = False) -> CachedReport:
+    """キャッシュ済みのレポートを返す（なければ compute() で生成して保存）
+
+    project_id がNoneのレポートは全プロジェクトの書き込みで無効化される。
+    refresh=True の場合はキャッシュを読まずに再計算し、結果で置き換える。
+    """
+    if settings.report_cache_ttl_seconds <= 0:
+        return CachedReport(jsonable_encoder(compute()), "bypass")
+
+    # 生成前に版数を取得し、生成中の書き込みは次回の再生成で反映させる
+    key, client = _cache_key(report, project_id, params)
+    if not refresh:
+        payload = _load(key, client)
+        if payload is not None:
+            report_cache_requests.labels(report, "hit").inc()
+            return CachedReport(json.loads(payload), "hit")
+
+    value = jsonable_encoder(compute())
+    _store(key, json.dumps(value, ensure_ascii=False), client)
+    status = "bypass" if refresh else "miss"
+    report_cache_requests.labels(report, status).inc()
+    return CachedReport(value, status)
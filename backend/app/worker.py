@@ -0,0 +1,30 @@
+from celery import Celery
+from celery.signals import worker_process_init
+from app.config import settings
+
+# レポート出力ジョブのCeleryワーカー（settings.export_job_broker_url 設定時に使用）
+#   celery -A app.worker worker --queues reports --concurrency 4 --loglevel info
+#   成果物は settings.export_dir に保存するため、APIと同じディスクを参照できる環境で起動する。
+
+celery_app = Celery("gunchart", broker=settings.export_job_broker_url)
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,  # 結果はジョブのJSONに保存する
+    task_default_queue="reports",
+    task_acks_late=True,  # ワーカーが停止したジョブは再配送する（実行済みのジョブは run_export_job が無視する）
+    worker_prefetch_multiplier=1,  # 生成は重いため1件ずつ受け取り、空いているワーカーに配る
+    broker_connection_timeout=2,
+    task_publish_retry_policy={"max_retries": 2, "interval_start": 0, "interval_step": 0.5},
+)
+
+@worker_process_init.connect
+def render_pdf_in_worker_process(**kwargs):
+    # ワーカープロセスが並列実行の単位になるため、PDFは描画プロセスを使わずにそのプロセスで描画する
+    from app.services.report_service import report_service
+    report_service.pdf_renderer.use_processes = False
+
+@celery_app.task(name="reports.render_export")
+def render_export(job_id: str):
+    from app.services.export_jobs import run_export_job
+    run_export_job(job_id)
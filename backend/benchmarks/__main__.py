@@ -0,0 +1,6 @@
+"""
+python -m benchmarks runs the micro-benchmark suite (see benchmarks.micro_benchmarks)
+"""
+from benchmarks.micro_benchmarks import main
+
+main()
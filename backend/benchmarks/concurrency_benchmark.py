@@ -0,0 +1,172 @@
+"""
+Concurrency benchmark for sync-DB endpoints: blocking async vs threadpool vs AsyncSession
+
+Starts the backend under uvicorn in a subprocess with three extra routes that
+all build the same task hierarchy:
+
+    blocking    async def + sync Session called inline (the old pattern: each
+                query blocks the event loop)
+    threadpool  def + sync Session (FastAPI runs it in the bounded threadpool)
+    asyncio     async def + AsyncSession.run_sync over the same service
+
+and drives each with concurrent clients, reporting requests/second and latency
+percentiles. --db-latency-ms adds a sleep per statement on the sync engine to
+emulate the network round trip to a remote PostgreSQL; it cannot be applied to
+the async driver, so compare the asyncio row only against a real server
+(DATABASE_URL=postgresql://...). Requires httpx and uvicorn.
+
+Usage (from the backend directory):
+    python -m benchmarks.concurrency_benchmark [--concurrency 50] [--requests 1000] [--db-latency-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+VARIANTS = ["blocking", "threadpool", "asyncio"]
+
+def create_app():
+    """uvicorn --factory 用: 比較用ルートを追加したアプリを作成"""
+    from fastapi import Depends
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+    from app.main import app
+    from app.api.auth import get_current_active_user
+    from app.database.connection import engine, get_db, get_async_db
+    from app.schemas.auth import UserInfo
+    from app.services.task_service import TaskService
+
+    latency = float(os.environ.get("BENCH_DB_LATENCY_MS", "0")) / 1000
+    if latency > 0:
+        @event.listens_for(engine, "before_cursor_execute")
+        def emulate_round_trip(*args):
+            time.sleep(latency)
+
+    def hierarchy(db: Session, project_id: int, user: UserInfo):
+        tasks = TaskService(db).get_task_hierarchy(project_id, user.id, user.role_level)
+        return [task.model_dump() for task in tasks]
+
+    @app.get("/bench/blocking/{project_id}")
+    async def blocking(project_id: int, user: UserInfo = Depends(get_current_active_user),
+                       db: Session = Depends(get_db)):
+        return hierarchy(db, project_id, user)
+
+    @app.get("/bench/threadpool/{project_id}")
+    def threadpool(project_id: int, user: UserInfo = Depends(get_current_active_user),
+                   db: Session = Depends(get_db)):
+        return hierarchy(db, project_id, user)
+
+    @app.get("/bench/asyncio/{project_id}")
+    async def asyncio_route(project_id: int, user: UserInfo = Depends(get_current_active_user),
+                            db: AsyncSession = Depends(get_async_db)):
+        return await db.run_sync(lambda session: hierarchy(session, project_id, user))
+
+    return app
+
+def seed(size: int):
+    """ベンチマーク用ユーザーとプロジェクトを作成し、(project_id, ユーザー名) を返す"""
+    from app.database.connection import Base, engine, SessionLocal
+    from app.models.user import User
+    from benchmarks.gantt_payload_benchmark import seed_project
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        owner = User(username="concurrency_owner", email="concurrency@example.com",
+                     password_hash="x", full_name="Owner", role_level="member")
+        db.add(owner)
+        db.commit()
+        return seed_project(db, size, owner.id, []), owner.username
+    finally:
+        db.close()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def drive(base_url: str, path: str, headers, concurrency: int, total: int):
+    """concurrency本の並行クライアントでtotal件のリクエストを送る"""
+    latencies = []
+    remaining = total
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        await client.get(path)  # ウォームアップ
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return elapsed, sorted(latencies)
+
+def percentile(values, fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run(args):
+    tmpdir = tempfile.TemporaryDirectory()
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{tmpdir.name}/concurrency_benchmark.db")
+    env["DEBUG"] = "false"
+    env["BENCH_DB_LATENCY_MS"] = str(args.db_latency_ms)
+    os.environ.update({"DATABASE_URL": env["DATABASE_URL"], "DEBUG": "false"})
+
+    from app.utils.auth import create_access_token
+    project_id, username = seed(args.tasks)
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": username})}
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.concurrency_benchmark:create_app",
+         "--factory", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base_url}/health")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+
+        print(f"tasks={args.tasks} concurrency={args.concurrency} requests={args.requests} "
+              f"db_latency_ms={args.db_latency_ms}")
+        print(f"{'variant':>11} {'req/s':>9} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}")
+        for variant in args.variants:
+            elapsed, latencies = asyncio.run(drive(
+                base_url, f"/bench/{variant}/{project_id}", headers, args.concurrency, args.requests
+            ))
+            print(f"{variant:>11} {len(latencies) / elapsed:>9.1f} "
+                  f"{percentile(latencies, 0.5) * 1000:>10.1f} {percentile(latencies, 0.99) * 1000:>10.1f} "
+                  f"{latencies[-1] * 1000:>10.1f}")
+    finally:
+        server.terminate()
+        server.wait()
+        tmpdir.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync-DB endpoint concurrency benchmark")
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--db-latency-ms", type=float, default=5.0)
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
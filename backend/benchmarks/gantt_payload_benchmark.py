@@ -0,0 +1,152 @@
+"""
+Benchmark for the consolidated Gantt payload against the per-resource fan-out
+
+Compares the four backend calls the Gantt page used to make (hierarchy,
+dependencies, project detail, members) with the single /gantt endpoint:
+response bytes (raw and gzip) and best-of-N latency through the ASGI app.
+Runs against a throwaway SQLite database unless DATABASE_URL is set.
+Requires httpx (used by FastAPI's TestClient).
+
+Usage (from the backend directory):
+    python -m benchmarks.gantt_payload_benchmark [--sizes 500 5000] [--repeat 5]
+"""
+import argparse
+import gzip
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir.name}/gantt_benchmark.db")
+os.environ.setdefault("DEBUG", "false")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.main import app
+from app.database.connection import Base, engine, SessionLocal
+from app.models.user import User
+from app.models.project import Project, ProjectMember
+from app.models.task import Task, TaskDependency, TaskAssignment
+from app.services.task_service import rebuild_task_paths
+from app.utils.auth import create_access_token
+
+STATUSES = ["not_started", "in_progress", "completed", "on_hold"]
+PRIORITIES = ["high", "medium", "low"]
+CATEGORIES = [None, "設計", "開発", "テスト", "リリース"]
+
+def seed_project(db, size: int, owner_id: int, member_ids, seed: int = 42) -> int:
+    """sizeタスク（4階層）と依存関係・担当者を持つプロジェクトを作成"""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    project = Project(
+        name=f"Benchmark {size}", start_date=start,
+        end_date=start + timedelta(days=365), created_by=owner_id
+    )
+    db.add(project)
+    db.flush()
+    db.execute(insert(ProjectMember), [
+        {"project_id": project.id, "user_id": user_id, "role": "manager" if user_id == owner_id else "member"}
+        for user_id in [owner_id, *member_ids]
+    ])
+
+    task_ids = []
+    by_level = {0: [], 1: [], 2: []}
+    for i in range(size):
+        level = 0 if not by_level[0] else rng.choice([0, 1, 1, 2, 2, 3, 3, 3])
+        while level > 0 and not by_level[level - 1]:
+            level -= 1
+        parent_id = rng.choice(by_level[level - 1]) if level > 0 else None
+        planned_start = start + timedelta(days=rng.randrange(300))
+        task_id = db.scalar(insert(Task).returning(Task.id), {
+            "project_id": project.id,
+            "parent_task_id": parent_id,
+            "level": level,
+            "name": f"タスク {i + 1}",
+            "planned_start_date": planned_start,
+            "planned_end_date": planned_start + timedelta(days=rng.randrange(1, 30)),
+            "status": rng.choice(STATUSES),
+            "priority": rng.choice(PRIORITIES),
+            "category": rng.choice(CATEGORIES),
+            "progress_rate": rng.randrange(0, 101, 10),
+            "sort_order": i + 1
+        })
+        task_ids.append(task_id)
+        if level < 3:
+            by_level[level].append(task_id)
+    rebuild_task_paths(db, project.id)
+
+    # 依存関係はタスク数程度、担当者は各タスク1名
+    dependencies = set()
+    for _ in range(size):
+        a, b = sorted(rng.sample(range(len(task_ids)), 2)) if len(task_ids) > 1 else (0, 0)
+        if a != b:
+            dependencies.add((task_ids[a], task_ids[b]))
+    if dependencies:
+        db.execute(insert(TaskDependency), [
+            {"predecessor_id": p, "successor_id": s, "dependency_type": "finish_to_start", "lag_days": 0}
+            for p, s in dependencies
+        ])
+    db.execute(insert(TaskAssignment), [
+        {"task_id": task_id, "user_id": rng.choice([owner_id, *member_ids])} for task_id in task_ids
+    ])
+    db.commit()
+    return project.id
+
+def measure(client: TestClient, headers, paths, repeat: int):
+    """pathsを順に呼び出した合計の最良時間とレスポンスサイズを返す"""
+    best = float("inf")
+    raw = compressed = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        bodies = []
+        for path in paths:
+            response = client.get(path, headers=headers)
+            response.raise_for_status()
+            bodies.append(response.content)
+        best = min(best, time.perf_counter() - start)
+        raw = sum(len(body) for body in bodies)
+        compressed = sum(len(gzip.compress(body)) for body in bodies)
+    return best, raw, compressed
+
+def run(sizes, repeat: int = 5):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    owner = User(username="bench_owner", email="owner@example.com", password_hash="x", full_name="Owner", role_level="member")
+    others = [
+        User(username=f"bench_member{i}", email=f"member{i}@example.com", password_hash="x", full_name=f"Member {i}", role_level="member")
+        for i in range(5)
+    ]
+    db.add_all([owner, *others])
+    db.commit()
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": owner.username})}
+    client = TestClient(app)
+
+    print(f"{'tasks':>8} {'variant':>10} {'calls':>6} {'best (ms)':>10} {'bytes':>11} {'gzip':>10}")
+    for size in sizes:
+        project_id = seed_project(db, size, owner.id, [user.id for user in others])
+        variants = {
+            "fan-out": [
+                f"/api/tasks/projects/{project_id}/hierarchy",
+                f"/api/tasks/projects/{project_id}/dependencies",
+                f"/api/projects/{project_id}",
+                f"/api/projects/{project_id}/members",
+            ],
+            "gantt": [f"/api/tasks/projects/{project_id}/gantt"],
+        }
+        for name, paths in variants.items():
+            best, raw, compressed = measure(client, headers, paths, repeat)
+            print(f"{size:>8} {name:>10} {len(paths):>6} {best * 1000:>10.1f} {raw:>11,} {compressed:>10,}")
+    db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Gantt payload benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+if __name__ == "__main__":
+    main()
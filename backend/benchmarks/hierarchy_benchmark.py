@@ -0,0 +1,64 @@
+"""
+Benchmark for the Gantt task hierarchy builder
+
+Usage (from the backend directory):
+    python -m benchmarks.hierarchy_benchmark [--sizes 1000 10000 100000]
+"""
+import argparse
+import gc
+import random
+import time
+from collections import namedtuple
+
+from app.services.task_service import build_task_hierarchy
+
+HierarchyRow = namedtuple(
+    "HierarchyRow", ["id", "name", "level", "parent_task_id", "status", "progress_rate"]
+)
+
+def generate_rows(size: int, seed: int = 42):
+    """4階層（level 0-3）のタスク行をsort_order順で生成"""
+    rng = random.Random(seed)
+    rows = []
+    by_level = {0: [], 1: [], 2: []}
+    for task_id in range(1, size + 1):
+        level = 0 if not by_level[0] else rng.choice([0, 1, 1, 2, 2, 3, 3, 3])
+        while level > 0 and not by_level[level - 1]:
+            level -= 1
+        parent_id = rng.choice(by_level[level - 1]) if level > 0 else None
+        if level < 3:
+            by_level[level].append(task_id)
+        rows.append(HierarchyRow(task_id, f"Task {task_id}", level, parent_id, "not_started", 0))
+    return rows
+
+def run(sizes, repeat: int = 3):
+    print(f"{'tasks':>10} {'best (ms)':>12} {'us/task':>10} {'scale':>8}")
+    baseline = None
+    for size in sizes:
+        rows = generate_rows(size)
+        best = float("inf")
+        for _ in range(repeat):
+            # timeitと同様にGCを止めてアルゴリズム自体のコストを測る
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                build_task_hierarchy(rows)
+                best = min(best, time.perf_counter() - start)
+            finally:
+                gc.enable()
+        per_task = best / size * 1_000_000
+        if baseline is None:
+            baseline = per_task
+        # scaleが1付近で一定なら線形にスケールしている
+        print(f"{size:>10} {best * 1000:>12.2f} {per_task:>10.2f} {per_task / baseline:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Task hierarchy builder benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""
+Micro-benchmark suite for the TaskService / ReportService algorithms
+
+Times each algorithmic hot spot on one synthetic project per dataset size and
+prints a scaling table per case: best wall time, time per task, peak Python
+memory (tracemalloc, measured on a separate run) and the growth exponent
+between neighbouring sizes (~1.0 linear, ~2.0 quadratic). Sizes whose time,
+extrapolated from the smaller ones, would exceed --max-seconds are skipped.
+
+Datasets are generated with app.database.synthetic_seeds (4-level
+hierarchies, dependency DAGs, assignments) into a throwaway SQLite database
+unless DATABASE_URL is set. Cases that need an optional dependency that is
+not importable (e.g. WeasyPrint for ReportService) are reported as skipped.
+
+Usage (from the backend directory):
+    python -m benchmarks [--sizes 100 1000 10000 100000] [--cases hierarchy excel] [--output results.json]
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir.name}/micro_benchmarks.db")
+os.environ.setdefault("DEBUG", "false")
+
+from sqlalchemy import func, select
+
+from app.database.connection import SessionLocal, engine
+from app.database.synthetic_seeds import SyntheticConfig, create_tables, seed_synthetic_data
+from app.models.project import Project
+from app.models.task import Task
+from app.services.dependency_graph import ProjectTaskGraph
+from app.services.task_service import TaskService, build_task_hierarchy
+
+class Dataset(NamedTuple):
+    size: int
+    project_id: int
+
+class Case(NamedTuple):
+    """setup(dataset) が計測対象の呼び出し（引数なし）を返す"""
+    name: str
+    description: str
+    setup: Callable[[Dataset], Callable[[], object]]
+
+def seed_dataset(size: int, seed: int) -> Dataset:
+    """sizeタスクのプロジェクトを1つ作成"""
+    config = SyntheticConfig(
+        users=30, projects=1, tasks=size, max_tasks_per_project=size, members_per_project=10,
+        comment_rate=0.0, notifications_per_user=0, seed=seed, prefix=f"micro{size}_{seed}"
+    )
+    seed_synthetic_data(config)
+    with SessionLocal() as db:
+        return Dataset(size, db.scalar(select(func.max(Project.id))))
+
+# 計測ケース
+
+def hierarchy_case(dataset: Dataset):
+    with SessionLocal() as db:
+        rows = db.query(
+            Task.id, Task.name, Task.level, Task.parent_task_id, Task.status, Task.progress_rate
+        ).filter(Task.project_id == dataset.project_id).order_by(Task.sort_order, Task.id).all()
+    return lambda: build_task_hierarchy(rows)
+
+def graph_load_case(dataset: Dataset):
+    def run():
+        with SessionLocal() as db:
+            return ProjectTaskGraph.load(db, dataset.project_id)
+    return run
+
+def cycle_check_case(dataset: Dataset):
+    with SessionLocal() as db:
+        graph = ProjectTaskGraph.load(db, dataset.project_id)
+        first, second = db.scalars(
+            select(Task.id).where(Task.project_id == dataset.project_id)
+            .order_by(Task.sort_order, Task.id).limit(2)
+        ).all()
+    # 依存関係は常に表示順で前→後のため、先頭2件の逆向きの依存は循環せず、到達可能な範囲を全探索する
+    return lambda: graph.creates_dependency_cycle(second, first)
+
+def progress_rollup_case(dataset: Dataset):
+    with SessionLocal() as db:
+        leaf_id = db.scalar(
+            select(Task.id).where(Task.project_id == dataset.project_id)
+            .order_by(Task.level.desc(), Task.id).limit(1)
+        )
+    counter = iter(range(10**9))
+
+    def run():
+        with SessionLocal() as db:
+            leaf = db.get(Task, leaf_id)
+            leaf.progress_rate = next(counter) * 37 % 101  # 毎回値を変えて祖先まで再計算させる
+            TaskService(db)._update_parent_progress(leaf)
+            db.rollback()
+    return run
+
+def sort_by_hierarchy_case(dataset: Dataset):
+    from app.services.template_service import TemplateService
+    db = SessionLocal()
+    tasks = db.query(Task).filter(Task.project_id == dataset.project_id).all()
+    db.expunge_all()
+    db.close()
+    service = TemplateService()
+    return lambda: service._sort_tasks_by_hierarchy(tasks)
+
+def _report_service():
+    from app.services.report_service import ReportService  # WeasyPrint（ネイティブライブラリ）が必要
+    return ReportService()
+
+def progress_report_case(dataset: Dataset):
+    service = _report_service()
+
+    def run():
+        with SessionLocal() as db:
+            return service.generate_project_progress_report(db, dataset.project_id, date(2025, 6, 1))
+    return run
+
+def workload_report_case(dataset: Dataset):
+    service = _report_service()
+
+    def run():
+        with SessionLocal() as db:
+            return service.generate_user_workload_report(db, date(2025, 1, 1), date(2025, 12, 31))
+    return run
+
+def excel_case(dataset: Dataset):
+    service = _report_service()
+
+    def run():
+        with SessionLocal() as db:
+            service.export_tasks_to_excel_file(db, dataset.project_id).close()
+    return run
+
+CASES = [
+    Case("hierarchy", "build_task_hierarchy (rows -> nested TaskHierarchy)", hierarchy_case),
+    Case("graph_load", "ProjectTaskGraph.load (query + CSR build)", graph_load_case),
+    Case("cycle_check", "ProjectTaskGraph.creates_dependency_cycle (full traversal)", cycle_check_case),
+    Case("progress_rollup", "TaskService._update_parent_progress (deepest leaf)", progress_rollup_case),
+    Case("sort_by_hierarchy", "TemplateService._sort_tasks_by_hierarchy", sort_by_hierarchy_case),
+    Case("progress_report", "ReportService.generate_project_progress_report", progress_report_case),
+    Case("workload_report", "ReportService.generate_user_workload_report", workload_report_case),
+    Case("excel", "ReportService.export_tasks_to_excel_file (write-only, temp file)", excel_case),
+]
+
+# 計測
+
+def time_call(call: Callable[[], object], repeat: int) -> float:
+    """最良時間（秒）。1回が1秒を超える場合は繰り返さない"""
+    best = float("inf")
+    for _ in range(repeat):
+        # timeitと同様にGCを止めてアルゴリズム自体のコストを測る
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            call()
+            best = min(best, time.perf_counter() - start)
+        finally:
+            gc.enable()
+        if best > 1.0:
+            break
+    return best
+
+def peak_memory(call: Callable[[], object]) -> int:
+    """呼び出し中に確保されたPythonオブジェクトの最大バイト数"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_case(case: Case, datasets: List[Dataset], repeat: int, max_seconds: float,
+             measure_memory: bool) -> List[dict]:
+    results = []
+    for dataset in datasets:
+        row = {"size": dataset.size}
+        estimate = estimate_seconds(results, dataset.size)
+        if estimate > max_seconds:
+            row["skipped"] = f"estimated {estimate:,.0f}s > --max-seconds {max_seconds:g}"
+            results.append(row)
+            continue
+        try:
+            call = case.setup(dataset)
+        except (ImportError, OSError) as e:
+            # 依存ライブラリがない環境では全サイズをスキップ
+            reason = f"{type(e).__name__}: {str(e).splitlines()[0][:120]}"
+            return [{"size": d.size, "skipped": reason} for d in datasets]
+        row["seconds"] = time_call(call, repeat)
+        if measure_memory:
+            row["peak_bytes"] = peak_memory(call)
+        results.append(row)
+    return results
+
+def estimate_seconds(results: List[dict], size: int) -> float:
+    """計測済みの結果から size での所要時間を外挿（増加の指数は直近の値、最低でも線形）"""
+    timed = [row for row in results if "seconds" in row]
+    if not timed:
+        return 0.0
+    exponent = growth_exponent(timed[-2], timed[-1]) if len(timed) > 1 else None
+    return timed[-1]["seconds"] * (size / timed[-1]["size"]) ** max(1.0, exponent or 1.0)
+
+def growth_exponent(previous: dict, current: dict) -> Optional[float]:
+    """隣接サイズ間の増加の指数（t ∝ n^k の k）"""
+    if "seconds" not in previous or "seconds" not in current or previous["seconds"] <= 0:
+        return None
+    return math.log(current["seconds"] / previous["seconds"]) / math.log(current["size"] / previous["size"])
+
+def print_case(case: Case, results: List[dict]):
+    print(f"\n{case.name}: {case.description}")
+    reasons = {row.get("skipped") for row in results}
+    if len(reasons) == 1 and None not in reasons:
+        print(f"  skipped: {reasons.pop()}")
+        return
+    print(f"{'tasks':>9} {'best (ms)':>12} {'us/task':>10} {'peak (MB)':>10} {'~n^k':>6}  curve")
+    timed = [row["seconds"] for row in results if "seconds" in row]
+    longest = max(timed, default=0)
+    shortest = min(timed, default=0)
+    previous = None
+    for row in results:
+        if "skipped" in row:
+            print(f"{row['size']:>9} {'skipped: ' + row['skipped']}")
+            continue
+        exponent = growth_exponent(previous, row) if previous else None
+        # 対数スケールの棒（最短=1、最長=40文字）
+        if longest > shortest > 0:
+            width = 1 + round(39 * math.log(row["seconds"] / shortest) / math.log(longest / shortest))
+        else:
+            width = 1
+        peak = f"{row['peak_bytes'] / 1_048_576:>10.2f}" if "peak_bytes" in row else f"{'-':>10}"
+        print(f"{row['size']:>9} {row['seconds'] * 1000:>12.3f} {row['seconds'] / row['size'] * 1e6:>10.3f} "
+              f"{peak} {f'{exponent:.2f}' if exponent is not None else '':>6}  {'#' * width}")
+        previous = row
+
+def run(sizes: List[int], case_names: Optional[List[str]] = None, repeat: int = 3,
+        max_seconds: float = 30.0, measure_memory: bool = True, seed: int = 42) -> Dict[str, List[dict]]:
+    cases = [case for case in CASES if not case_names or case.name in case_names]
+    create_tables(engine)
+    started = time.perf_counter()
+    datasets = [seed_dataset(size, seed) for size in sorted(sizes)]
+    print(f"seeded {len(datasets)} project(s) ({', '.join(str(d.size) for d in datasets)} tasks) "
+          f"in {time.perf_counter() - started:.1f}s, dialect={engine.dialect.name}")
+
+    results = {}
+    for case in cases:
+        results[case.name] = run_case(case, datasets, repeat, max_seconds, measure_memory)
+        print_case(case, results[case.name])
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for service algorithms")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--cases", nargs="+", choices=[case.name for case in CASES])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=30.0,
+                        help="skip sizes whose extrapolated time per call exceeds this")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+    results = run(args.sizes, args.cases, args.repeat, args.max_seconds, not args.no_memory, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Query-plan regression check for the service hot paths
+
+Seeds several projects, runs each hot-path service call while recording the
+SELECT statements it emits, then EXPLAINs every statement with its actual
+parameters. A hot path fails if any plan reads one of the large tables
+(HOT_TABLES) with a full scan instead of an index search:
+
+    SQLite      EXPLAIN QUERY PLAN shows "SCAN <table>" (with or without an index)
+    PostgreSQL  EXPLAIN (FORMAT JSON) contains a "Seq Scan" node; plans are taken
+                with enable_seqscan=off so a Seq Scan means no usable index exists
+
+Runs against a throwaway SQLite database unless DATABASE_URL is set (use a
+scratch PostgreSQL database: tables are created and seeded). Exits with status
+1 when a hot path regresses, so it can run in CI after migrations change.
+
+The seed size has a floor (MIN_PROJECTS, MIN_TASKS). With only a few projects,
+one project owns a large share of each table, and SQLite legitimately prefers
+scanning the small join tables (task_dependencies, project_members). Below the
+floor the result would depend on the chosen size rather than on the indexes.
+
+Usage (from the backend directory):
+    python -m benchmarks.query_plans [--projects 10] [--tasks 1000] [--verbose]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir.name}/query_plans.db")
+os.environ.setdefault("DEBUG", "false")
+
+from sqlalchemy import event, select, text
+
+from app.database.connection import Base, engine, SessionLocal
+from app.models.user import User
+from app.models.task import Task, open_task_filter
+from app.services.gantt_service import GanttService
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+from app.utils.pagination import encode_time_cursor
+from app.utils.permission_cache import invalidate_project_access
+from benchmarks.gantt_payload_benchmark import seed_project
+
+# 全件走査を許さないテーブル（プロジェクト数・タスク数に比例して大きくなるもの）
+HOT_TABLES = {
+    "tasks", "task_assignments", "task_dependencies", "project_members", "deleted_records",
+}
+
+# これ未満のシード量では SQLite の計画が索引ではなくデータ量で変わる
+MIN_PROJECTS = 10
+MIN_TASKS = 100
+
+_SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+
+@contextmanager
+def capture_selects():
+    """ブロック内で発行されたSELECT文を (SQL, パラメータ) のリストに記録"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")) and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def _table_name(name: str) -> str:
+    """SQLAlchemyの別名（tasks_1 など）を元のテーブル名に戻す"""
+    return re.sub(r"_\d+$", "", name)
+
+def explain(conn, statement: str, parameters):
+    """実行計画を (表示用の行リスト, 全件走査されたHOT_TABLESの集合) で返す"""
+    if conn.dialect.name == "postgresql":
+        plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        lines, scans = [], set()
+
+        def walk(node, depth=0):
+            relation = node.get("Relation Name")
+            lines.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else "")
+                         + (f" using {node['Index Name']}" if "Index Name" in node else ""))
+            if node["Node Type"] == "Seq Scan" and relation in HOT_TABLES:
+                scans.add(relation)
+            for child in node.get("Plans", ()):
+                walk(child, depth + 1)
+
+        walk(plan[0]["Plan"])
+        return lines, scans
+
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    lines = [row[-1] for row in rows]
+    scans = set()
+    for line in lines:
+        match = _SQLITE_SCAN.match(line)
+        if match and _table_name(match.group(1)) in HOT_TABLES:
+            scans.add(_table_name(match.group(1)))
+    return lines, scans
+
+def seed(projects: int, tasks: int):
+    """ユーザーとプロジェクトを作成し、(owner_id, member_id, project_ids) を返す"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        owner = User(username="plans_owner", email="plans_owner@example.com",
+                     password_hash="x", full_name="Owner", role_level="member")
+        members = [
+            User(username=f"plans_member{i}", email=f"plans_member{i}@example.com",
+                 password_hash="x", full_name=f"Member {i}", role_level="member")
+            for i in range(5)
+        ]
+        db.add_all([owner, *members])
+        db.commit()
+        member_ids = [member.id for member in members]
+        # メンバーは一部のプロジェクトにだけ参加させる（member_ids[0] は 0, 5, 10, ... 番目）
+        project_ids = [
+            seed_project(db, tasks, owner.id, [member_ids[i % len(member_ids)]], seed=i)
+            for i in range(projects)
+        ]
+        db.execute(text("ANALYZE"))
+        db.commit()
+        return owner.id, member_ids[0], project_ids
+    finally:
+        db.close()
+
+def hot_paths(db, owner_id: int, member_id: int, project_id: int):
+    """(名前, 呼び出し) のリスト。各呼び出しはサービスの読み取り処理を1回実行する"""
+    tasks = TaskService(db)
+    deepest = db.scalars(
+        select(Task).where(Task.project_id == project_id).order_by(Task.level.desc(), Task.id).limit(1)
+    ).one()
+    first_page = tasks.get_tasks(project_id, owner_id, "member", limit=50)
+    an_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+
+    def deadline_scan():
+        # NotificationService.check_deadline_alerts と同じ条件
+        return db.query(Task).filter(
+            Task.planned_end_date == date(2025, 6, 1),
+            open_task_filter()
+        ).all()
+
+    return [
+        ("permission check", lambda: tasks._check_project_access(project_id, member_id, "member")),
+        ("task list", lambda: tasks.get_tasks(project_id, owner_id, "member", limit=50)),
+        ("task list (next page)", lambda: tasks.get_tasks(
+            project_id, owner_id, "member", limit=50, cursor=first_page.next_cursor)),
+        ("task list (assignee)", lambda: tasks.get_tasks(
+            project_id, owner_id, "member", assigned_to=member_id, include_total=True)),
+        ("task detail", lambda: tasks.get_task_by_id(deepest.id, owner_id, "member")),
+        ("valid predecessors", lambda: tasks.get_valid_predecessors(deepest.id, owner_id, "member")),
+        ("task comments", lambda: tasks.get_task_comments(deepest.id, owner_id, "member")),
+        ("subtree", lambda: db.scalars(select(Task.id).where(tasks._subtree_filter(deepest))).all()),
+        ("hierarchy", lambda: tasks.get_task_hierarchy(project_id, owner_id, "member")),
+        ("dependencies", lambda: tasks.get_project_dependencies(project_id, owner_id, "member")),
+        ("delta sync", lambda: tasks.get_project_changes(
+            project_id, owner_id, "member", since=encode_time_cursor(an_hour_ago))),
+        ("gantt payload", lambda: GanttService(db).get_gantt_payload(project_id, owner_id, "member")),
+        ("project list", lambda: ProjectService(db).get_projects(member_id, "member")),
+        ("deadline scan", deadline_scan),
+    ]
+
+def run(projects: int, tasks: int, verbose: bool = False) -> int:
+    owner_id, member_id, project_ids = seed(projects, tasks)
+    project_id = project_ids[0]
+
+    db = SessionLocal()
+    failures = 0
+    try:
+        cases = hot_paths(db, owner_id, member_id, project_id)
+        with engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.exec_driver_sql("SET enable_seqscan = off")
+            print(f"projects={projects} tasks/project={tasks} dialect={conn.dialect.name}")
+            for name, call in cases:
+                invalidate_project_access(project_id, db=db)
+                db.expire_all()
+                with capture_selects() as statements:
+                    call()
+                scanned = set()
+                plans = []
+                for statement, parameters in statements:
+                    lines, scans = explain(conn, statement, parameters)
+                    scanned |= scans
+                    plans.append((statement, lines, scans))
+                status = "FAIL" if scanned else "ok"
+                detail = f"  full scan: {', '.join(sorted(scanned))}" if scanned else ""
+                print(f"{status:>4}  {name:<24} {len(statements):>2} queries{detail}")
+                if scanned or verbose:
+                    for statement, lines, scans in plans:
+                        if scans or verbose:
+                            print("        " + " ".join(statement.split())[:160])
+                            for line in lines:
+                                print("          " + line)
+                failures += bool(scanned)
+    finally:
+        db.close()
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Query-plan regression check for hot paths")
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+    if args.projects < MIN_PROJECTS or args.tasks < MIN_TASKS:
+        parser.error(f"--projects must be >= {MIN_PROJECTS} and --tasks >= {MIN_TASKS} "
+                     "for plans that do not depend on the data size")
+    failures = run(args.projects, args.tasks, args.verbose)
+    if failures:
+        print(f"{failures} hot path(s) regressed to a full table scan")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
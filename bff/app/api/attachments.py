@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
 from fastapi.responses import FileResponse, Response
-from ..utils.http_client import backend_client
+from ..utils.http_client import backend_client, backend_http_client
 from ..utils.session import get_session_id
 from typing import List, Dict, Any
-import httpx
 
 router = APIRouter()
 
@@ -18,7 +17,7 @@ async def upload_attachment(
         # バックエンドにファイルをアップロード
         from ..config import settings
         
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             files = {'file': (file.filename, await file.read(), file.content_type)}
             response = await client.post(
                 f"{settings.backend_url}/tasks/{task_id}/attachments",
@@ -67,7 +66,7 @@ async def download_attachment(
         # バックエンドからファイルを取得してそのまま返す
         from ..config import settings
         
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             response = await client.get(
                 f"{settings.backend_url}/attachments/{attachment_id}/download",
                 headers={'Authorization': f'Bearer {session_id}'}
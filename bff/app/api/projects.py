@@ -2,10 +2,10 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from pydantic import BaseModel
 from datetime import date
-import httpx
 from app.models.response import StandardResponse
 from app.utils.session import get_current_session, get_current_user_session, UserSession
 from app.config import settings
+from app.utils.http_client import backend_http_client
 from app.utils.data_store import data_store
 
 class SimpleProjectCreate(BaseModel):
@@ -24,6 +24,8 @@ class ProjectListRequest(BaseModel):
     skip: int = 0
     limit: int = 100
     status: Optional[str] = None
+    cursor: Optional[str] = None
+    include_total: bool = False
 
 class ProjectCreateRequest(BaseModel):
     name: str
@@ -51,7 +53,7 @@ async def get_projects(
 ):
     """プロジェクト一覧取得"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -61,6 +63,10 @@ async def get_projects(
                 "skip": request.skip,
                 "limit": request.limit
             }
+            if request.cursor:
+                params["cursor"] = request.cursor
+            if request.include_total:
+                params["include_total"] = True
             if request.status:
                 params["status"] = request.status
             
@@ -72,8 +78,11 @@ async def get_projects(
             
             if response.status_code == 200:
                 projects = response.json()
+                total = response.headers.get("X-Total-Count")
                 return StandardResponse.success_response({
-                    "projects": projects
+                    "projects": projects,
+                    "next_cursor": response.headers.get("X-Next-Cursor"),
+                    "total": int(total) if total is not None else None
                 })
             else:
                 error_detail = response.json().get("detail", "プロジェクト一覧の取得に失敗しました")
@@ -89,7 +98,7 @@ async def create_project(
 ):
     """プロジェクト作成"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -173,7 +182,7 @@ async def create_project_simple(project_data: SimpleProjectCreate):
 async def get_project_summaries():
     """プロジェクト概要一覧取得（ダッシュボード用）"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             response = await client.get(f"{settings.backend_url}/projects/summaries")
             
             if response.status_code == 200:
@@ -195,7 +204,7 @@ async def get_project_detail(
 ):
     """プロジェクト詳細取得"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -226,7 +235,7 @@ async def update_project(
 ):
     """プロジェクト更新"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -272,7 +281,7 @@ async def delete_project(
 ):
     """プロジェクト削除"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -301,7 +310,7 @@ async def get_project_members(
 ):
     """プロジェクトメンバー一覧取得"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -332,7 +341,7 @@ async def add_project_member(
 ):
     """プロジェクトメンバー追加"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -370,7 +379,7 @@ async def remove_project_member(
 ):
     """プロジェクトメンバー削除"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -1,11 +1,11 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, Path
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Path, Response
 from pydantic import BaseModel
-from datetime import date
-import httpx
-from app.models.response import StandardResponse
-from app.api.auth import get_current_user_session, UserSession
+from datetime import date, datetime
+from app.models.response import StandardResponse, ResponseMetadata
+from app.utils.session import get_current_user_session, UserSession
 from app.config import settings
+from app.utils.http_client import backend_http_client
 from app.utils.data_store import data_store
 
 router = APIRouter()
@@ -69,6 +69,8 @@ class TaskListRequest(BaseModel):
     limit: int = 100
     status: Optional[str] = None
     assigned_to: Optional[int] = None
+    cursor: Optional[str] = None
+    include_total: bool = False
 
 class TaskCreateRequest(BaseModel):
     project_id: int
@@ -99,6 +101,29 @@ class TaskUpdateRequest(BaseModel):
     is_milestone: Optional[bool] = None
     sort_order: Optional[int] = None
 
+class TaskBatchCreateItem(BaseModel):
+    temp_id: Optional[str] = None
+    parent_task_id: Optional[int] = None
+    parent_temp_id: Optional[str] = None
+    level: Optional[int] = None
+    name: str
+    description: Optional[str] = None
+    planned_start_date: Optional[date] = None
+    planned_end_date: Optional[date] = None
+    estimated_hours: Optional[int] = 0
+    priority: str = "medium"
+    category: Optional[str] = None
+    is_milestone: bool = False
+
+class TaskBatchUpdateItem(TaskUpdateRequest):
+    id: int
+
+class TaskBatchRequest(BaseModel):
+    project_id: int
+    create: List[TaskBatchCreateItem] = []
+    update: List[TaskBatchUpdateItem] = []
+    delete: List[int] = []
+
 class TaskAssignRequest(BaseModel):
     user_id: int
 
@@ -118,7 +143,7 @@ async def get_tasks(
 ):
     """タスク一覧取得"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -128,6 +153,10 @@ async def get_tasks(
                 "skip": request.skip,
                 "limit": request.limit
             }
+            if request.cursor:
+                params["cursor"] = request.cursor
+            if request.include_total:
+                params["include_total"] = True
             if request.status:
                 params["status"] = request.status
             if request.assigned_to:
@@ -141,8 +170,11 @@ async def get_tasks(
             
             if response.status_code == 200:
                 tasks = response.json()
+                total = response.headers.get("X-Total-Count")
                 return StandardResponse.success_response({
-                    "tasks": tasks
+                    "tasks": tasks,
+                    "next_cursor": response.headers.get("X-Next-Cursor"),
+                    "total": int(total) if total is not None else None
                 })
             else:
                 error_detail = response.json().get("detail", "タスク一覧の取得に失敗しました")
@@ -158,7 +190,7 @@ async def create_task(
 ):
     """タスク作成"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -234,7 +266,7 @@ async def get_task_detail_post(
 ):
     """タスク詳細取得"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -327,7 +359,7 @@ async def update_task(
 ):
     """タスク更新"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -382,6 +414,147 @@ async def update_task(
     except Exception as e:
         return StandardResponse.error_response(f"タスクの更新中にエラーが発生しました: {str(e)}", 500)
 
+@router.post("/reschedule/{task_id}")
+async def reschedule_task(
+    task_id: int = Path(..., description="タスクID"),
+    request: TaskUpdateRequest = ...,
+    user_session: UserSession = Depends(get_current_user_session)
+):
+    """タスク更新（計画日の変更を後続タスクへ伝播）"""
+    try:
+        async with backend_http_client() as client:
+            headers = {
+                "Authorization": f"Bearer {user_session.access_token}",
+                "Content-Type": "application/json"
+            }
+            
+            response = await client.put(
+                f"{settings.backend_url}/api/tasks/tasks/{task_id}/reschedule",
+                headers=headers,
+                json=request.model_dump(exclude_none=True, mode="json")
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                return StandardResponse.success_response({
+                    "task": result["task"],
+                    "shifted_tasks": result["shifted_tasks"],
+                    "message": "タスクが更新されました"
+                })
+            else:
+                error_detail = response.json().get("detail", "タスクの更新に失敗しました")
+                return StandardResponse.error_response(error_detail, response.status_code)
+                
+    except Exception as e:
+        return StandardResponse.error_response(f"タスクの更新中にエラーが発生しました: {str(e)}", 500)
+
+@router.post("/batch")
+async def apply_task_batch(
+    request: TaskBatchRequest,
+    user_session: UserSession = Depends(get_current_user_session)
+):
+    """タスクの一括作成・更新・削除（分割せず1リクエストでバックエンドへ転送）"""
+    try:
+        # 大きなWBSの取り込みでも1トランザクションで完了するまで待つ
+        async with backend_http_client(timeout=120.0) as client:
+            headers = {
+                "Authorization": f"Bearer {user_session.access_token}",
+                "Content-Type": "application/json"
+            }
+            
+            response = await client.post(
+                f"{settings.backend_url}/api/tasks/projects/{request.project_id}/tasks:batch",
+                headers=headers,
+                json=request.model_dump(exclude={"project_id"}, exclude_unset=True, mode="json")
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                return StandardResponse.success_response({
+                    **result,
+                    "message": (
+                        f"{len(result['created'])}件作成、{len(result['updated'])}件更新、"
+                        f"{len(result['deleted'])}件削除しました"
+                    )
+                })
+            else:
+                error_detail = response.json().get("detail", "タスクの一括更新に失敗しました")
+                return StandardResponse.error_response(error_detail, response.status_code)
+                
+    except Exception as e:
+        return StandardResponse.error_response(f"タスクの一括更新中にエラーが発生しました: {str(e)}", 500)
+
+class TaskMoveRequest(BaseModel):
+    after_task_id: Optional[int] = None
+    before_task_id: Optional[int] = None
+
+@router.post("/move/{task_id}")
+async def move_task(
+    task_id: int = Path(..., description="タスクID"),
+    request: TaskMoveRequest = ...,
+    user_session: UserSession = Depends(get_current_user_session)
+):
+    """タスクの表示順を移動"""
+    try:
+        async with backend_http_client() as client:
+            headers = {
+                "Authorization": f"Bearer {user_session.access_token}",
+                "Content-Type": "application/json"
+            }
+            
+            response = await client.put(
+                f"{settings.backend_url}/api/tasks/tasks/{task_id}/position",
+                headers=headers,
+                json=request.model_dump(exclude_none=True)
+            )
+            
+            if response.status_code == 200:
+                return StandardResponse.success_response({
+                    "task": response.json(),
+                    "message": "タスクを移動しました"
+                })
+            else:
+                error_detail = response.json().get("detail", "タスクの移動に失敗しました")
+                return StandardResponse.error_response(error_detail, response.status_code)
+                
+    except Exception as e:
+        return StandardResponse.error_response(f"タスクの移動中にエラーが発生しました: {str(e)}", 500)
+
+class TaskReorderRequest(BaseModel):
+    project_id: int
+    task_ids: List[int]
+
+@router.post("/reorder")
+async def reorder_tasks(
+    request: TaskReorderRequest,
+    user_session: UserSession = Depends(get_current_user_session)
+):
+    """ドラッグ＆ドロップの並べ替え結果を一括反映"""
+    try:
+        async with backend_http_client() as client:
+            headers = {
+                "Authorization": f"Bearer {user_session.access_token}",
+                "Content-Type": "application/json"
+            }
+            
+            response = await client.post(
+                f"{settings.backend_url}/api/tasks/projects/{request.project_id}/tasks/reorder",
+                headers=headers,
+                json={"task_ids": request.task_ids}
+            )
+            
+            if response.status_code == 200:
+                return StandardResponse.success_response({
+                    "sort_orders": response.json(),
+                    "message": "タスクの並び順を更新しました"
+                })
+            else:
+                error_detail = response.json().get("detail", "タスクの並べ替えに失敗しました")
+                return StandardResponse.error_response(error_detail, response.status_code)
+                
+    except Exception as e:
+        return StandardResponse.error_response(f"タスクの並べ替え中にエラーが発生しました: {str(e)}", 500)
+
 @router.get("/delete")
 async def delete_task_simple_get(task_id: int):
     """タスク削除（シンプル）- GETメソッド（互換性維持）"""
@@ -418,7 +591,7 @@ async def assign_task(
 ):
     """タスク担当者割り当て"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -455,7 +628,7 @@ async def unassign_task(
 ):
     """タスク担当者解除"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -521,7 +694,7 @@ async def get_task_comments(
 ):
     """タスクコメント一覧取得"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -552,7 +725,7 @@ async def add_task_comment(
 ):
     """タスクコメント追加"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -582,6 +755,45 @@ async def add_task_comment(
         return StandardResponse.error_response(f"コメントの追加中にエラーが発生しました: {str(e)}", 500)
 
 # ガンチャート用の追加API
+class GanttDataRequest(BaseModel):
+    project_id: int
+
+@router.post("/gantt")
+async def get_gantt_data(
+    request: GanttDataRequest,
+    user_session: UserSession = Depends(get_current_user_session)
+):
+    """ガンチャート描画用データ一括取得（プロジェクト・タスク・依存関係・担当者・メンバー）"""
+    try:
+        async with backend_http_client() as client:
+            headers = {
+                "Authorization": f"Bearer {user_session.access_token}",
+                "Content-Type": "application/json"
+            }
+            
+            response = await client.get(
+                f"{settings.backend_url}/api/tasks/projects/{request.project_id}/gantt",
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                # 大きなペイロードを再パースせず、バックエンドのJSONをそのまま標準形式で包む
+                metadata = ResponseMetadata(request_id="", timestamp=datetime.utcnow())
+                content = b"".join([
+                    b'{"success":true,"data":',
+                    response.content,
+                    b',"error":null,"metadata":',
+                    metadata.model_dump_json().encode(),
+                    b"}"
+                ])
+                return Response(content=content, media_type="application/json")
+            else:
+                error_detail = response.json().get("detail", "ガンチャートデータの取得に失敗しました")
+                return StandardResponse.error_response(error_detail, response.status_code)
+                
+    except Exception as e:
+        return StandardResponse.error_response(f"ガンチャートデータの取得中にエラーが発生しました: {str(e)}", 500)
+
 class TaskHierarchyRequest(BaseModel):
     project_id: int
 
@@ -592,7 +804,7 @@ async def get_task_hierarchy(
 ):
     """タスク階層構造取得（ガンチャート用）"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -615,6 +827,42 @@ async def get_task_hierarchy(
     except Exception as e:
         return StandardResponse.error_response(f"タスク階層の取得中にエラーが発生しました: {str(e)}", 500)
 
+class TaskChangesRequest(BaseModel):
+    project_id: int
+    since: Optional[str] = None
+
+@router.post("/changes")
+async def get_task_changes(
+    request: TaskChangesRequest,
+    user_session: UserSession = Depends(get_current_user_session)
+):
+    """前回取得以降のタスク変更取得（ガンチャートの差分更新用）"""
+    try:
+        async with backend_http_client() as client:
+            headers = {
+                "Authorization": f"Bearer {user_session.access_token}",
+                "Content-Type": "application/json"
+            }
+            
+            params = {}
+            if request.since:
+                params["since"] = request.since
+            
+            response = await client.get(
+                f"{settings.backend_url}/api/tasks/projects/{request.project_id}/changes",
+                headers=headers,
+                params=params
+            )
+            
+            if response.status_code == 200:
+                return StandardResponse.success_response(response.json())
+            else:
+                error_detail = response.json().get("detail", "タスク変更の取得に失敗しました")
+                return StandardResponse.error_response(error_detail, response.status_code)
+                
+    except Exception as e:
+        return StandardResponse.error_response(f"タスク変更の取得中にエラーが発生しました: {str(e)}", 500)
+
 class TaskDependenciesRequest(BaseModel):
     project_id: int
 
@@ -625,7 +873,7 @@ async def get_task_dependencies_list(
 ):
     """タスク依存関係一覧取得（ガンチャート用）"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -660,7 +908,7 @@ async def update_task_parent(
 ):
     """タスクの親子関係更新"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -701,7 +949,7 @@ async def get_valid_predecessors(
 ):
     """有効な先行タスク一覧取得"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -735,7 +983,7 @@ async def calculate_parent_progress(
 ):
     """親タスクの進捗率自動計算"""
     try:
-        async with httpx.AsyncClient() as client:
+        async with backend_http_client() as client:
             headers = {
                 "Authorization": f"Bearer {user_session.access_token}",
                 "Content-Type": "application/json"
@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     redis_db: int = 0
     redis_password: Optional[str] = None
     
+    # Metrics
+    metrics_enabled: bool = True  # /metrics でPrometheus形式のメトリクスを公開
+    
     # Environment
     environment: str = "development"
     debug: bool = True
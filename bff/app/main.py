@@ -1,13 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import httpx
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.api import auth, auth_simple, users, projects, tasks, test_debug
+from app.config import settings
 from app.utils.exceptions import (
     BFFException,
     bff_exception_handler,
     httpx_exception_handler,
     general_exception_handler
 )
+from app.utils.metrics import MetricsMiddleware
 
 app = FastAPI(
     title="Gunchart BFF API",
@@ -41,6 +44,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ルート単位のレイテンシ・ステータス（/metrics で公開）
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Add exception handlers
 app.add_exception_handler(BFFException, bff_exception_handler)
 app.add_exception_handler(httpx.HTTPError, httpx_exception_handler)
@@ -60,4 +67,10 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus テキスト形式のメトリクス（Redis・Backend API 呼び出しを含む）"""
+        return Response(generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -1,6 +1,11 @@
 import httpx
 from typing import Dict, Any, Optional
 from app.config import settings
+from app.utils.metrics import InstrumentedTransport
+
+def backend_http_client(**kwargs) -> httpx.AsyncClient:
+    """Backend API 呼び出し用の httpx クライアント（レイテンシ・ステータスを /metrics に記録）"""
+    return httpx.AsyncClient(transport=InstrumentedTransport(), **kwargs)
 
 class BackendClient:
     """Backend API クライアント"""
@@ -27,7 +32,7 @@ class BackendClient:
         if headers:
             default_headers.update(headers)
             
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        async with backend_http_client(timeout=self.timeout) as client:
             if method.upper() == "GET":
                 response = await client.get(url, headers=default_headers, params=data)
             elif method.upper() == "POST":
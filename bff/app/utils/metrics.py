@@ -0,0 +1,117 @@
+import re
+import time
+from typing import Optional
+import httpx
+import redis
+from prometheus_client import Counter, Gauge, Histogram, disable_created_metrics
+
+# Prometheus メトリクス（prometheus_client のデフォルトレジストリに登録し、/metrics で出力）
+#   値はプロセス単位のため、複数ワーカーで起動した場合はワーカーごとの値になる。
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REDIS_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+# *_created（生成時刻）の系列は出力しない
+disable_created_metrics()
+
+# HTTP
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "Requests currently being processed"
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency until the response is complete",
+    ("method", "route"), buckets=LATENCY_BUCKETS
+)
+http_responses = Counter(
+    "http_responses_total", "Responses by status code", ("method", "route", "status")
+)
+
+class MetricsMiddleware:
+    """ルート（パステンプレート）単位のレイテンシ・ステータス・処理中リクエスト数を記録するASGIミドルウェア"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = "500"  # レスポンス開始前に例外で終わった場合
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # ルーティング後のscopeにはマッチしたルートが入る（未マッチはまとめてラベル数を抑える）
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            method = scope["method"]
+            http_request_duration.labels(method, path).observe(time.perf_counter() - started)
+            http_responses.labels(method, path, status).inc()
+
+# Redis
+redis_command_duration = Histogram(
+    "redis_command_duration_seconds", "Redis command latency", ("command",), buckets=REDIS_BUCKETS
+)
+redis_command_errors = Counter(
+    "redis_command_errors_total", "Redis commands that raised an error", ("command",)
+)
+
+class InstrumentedRedis(redis.Redis):
+    """コマンドごとのレイテンシとエラーを記録する Redis クライアント"""
+
+    def execute_command(self, *args, **options):
+        command = str(args[0]).upper() if args else "UNKNOWN"
+        started = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        except redis.RedisError:
+            redis_command_errors.labels(command).inc()
+            raise
+        finally:
+            redis_command_duration.labels(command).observe(time.perf_counter() - started)
+
+# Backend API 呼び出し
+backend_request_duration = Histogram(
+    "backend_request_duration_seconds", "Outbound request latency to the backend until response headers",
+    ("method", "endpoint"), buckets=LATENCY_BUCKETS
+)
+backend_responses = Counter(
+    "backend_responses_total", "Outbound backend responses by status code (\"error\" for transport errors)",
+    ("method", "endpoint", "status")
+)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+def endpoint_label(path: str) -> str:
+    """URLパスのID部分を {id} に置き換えてラベル数を抑える"""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Backend API へのリクエストのレイテンシとステータスを記録する httpx トランスポート"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = endpoint_label(request.url.path)
+        status = "error"
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            backend_request_duration.labels(request.method, endpoint).observe(time.perf_counter() - started)
+            backend_responses.labels(request.method, endpoint, status).inc()
+
+    async def aclose(self):
+        await self._transport.aclose()
@@ -1,15 +1,15 @@
-import redis
 import json
 import uuid
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from app.config import settings
+from app.utils.metrics import InstrumentedRedis
 
 class SessionManager:
     """Redis セッション管理"""
     
     def __init__(self):
-        self.redis_client = redis.Redis(
+        self.redis_client = InstrumentedRedis(
             host=settings.redis_host,
             port=settings.redis_port,
             db=settings.redis_db,
@@ -0,0 +1,14 @@
+"""
+End-to-end load test for BFF -> backend -> DB
+
+Starts the backend and the BFF under uvicorn against a scratch database
+(SQLite by default, or --database-url) and an in-process fake Redis, seeds it
+with app.database.synthetic_seeds, replays a weighted mix of user scenarios at
+a fixed concurrency and reports throughput and latency percentiles per
+endpoint. Results can be saved as a baseline and later runs compared against
+it; the command exits with status 1 when an endpoint regresses.
+
+Usage (from the repository root):
+    python -m loadtest --concurrency 20 --duration 60 --save-baseline loadtest/baseline.json
+    python -m loadtest --concurrency 20 --duration 60 --baseline loadtest/baseline.json
+"""
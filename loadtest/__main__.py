@@ -0,0 +1,97 @@
+"""
+Command line entry point: python -m loadtest --help
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+
+from loadtest.runner import run_load
+from loadtest.scenarios import prepare_fixture, parse_weights
+from loadtest.stack import Stack
+from loadtest.stats import compare, format_table, load_results, save_results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="End-to-end load test (BFF -> backend -> DB)")
+    load = parser.add_argument_group("load")
+    load.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    load.add_argument("--duration", type=float, default=60, help="measured seconds")
+    load.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before measuring")
+    load.add_argument("--think-time", type=float, default=0.0, help="mean pause between scenarios (s)")
+    load.add_argument("--scenarios", help='weights, e.g. "drag_task=30,login=0" (overrides the defaults)')
+    load.add_argument("--users", type=int, default=20, help="distinct synthetic users to log in as")
+    load.add_argument("--seed", type=int, default=42, help="seeds both the dataset and the scenario mix")
+
+    stack = parser.add_argument_group("stack")
+    stack.add_argument("--database-url", help="scratch database (default: SQLite in a temp dir)")
+    stack.add_argument("--profile", default="small", help="app.database.synthetic_seeds profile")
+    stack.add_argument("--no-seed", action="store_true", help="database is already seeded")
+    stack.add_argument("--redis", help="HOST:PORT of a real Redis (default: start loadtest.fake_redis)")
+    stack.add_argument("--backend-workers", type=int, default=1)
+    stack.add_argument("--bff-workers", type=int, default=1)
+    stack.add_argument("--workdir", help="keep the database and service logs here")
+    stack.add_argument("--bff-url", help="use a running BFF instead of starting one (needs --backend-url and --redis)")
+    stack.add_argument("--backend-url")
+
+    results = parser.add_argument_group("results")
+    results.add_argument("--output", help="write this run's results as JSON")
+    results.add_argument("--save-baseline", metavar="PATH", help="store this run as the baseline")
+    results.add_argument("--baseline", metavar="PATH", help="compare against a stored baseline")
+    results.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    if args.bff_url and not (args.backend_url and args.redis):
+        parser.error("--bff-url requires --backend-url and --redis")
+    return args
+
+def execute(args, bff_url: str, backend_url: str, redis_host: str, redis_port: int) -> dict:
+    weights = parse_weights(args.scenarios)
+    fixture = asyncio.run(prepare_fixture(backend_url, redis_host, redis_port, args.users))
+    print(f"users={len(fixture.users)} projects={len(fixture.tasks)} concurrency={args.concurrency} "
+          f"duration={args.duration:g}s warmup={args.warmup:g}s")
+    recorder, elapsed, unavailable = asyncio.run(run_load(
+        fixture, weights, bff_url, backend_url, args.concurrency, args.duration, args.warmup,
+        args.seed, args.think_time
+    ))
+    for name in unavailable:
+        print(f"skipped scenario '{name}': endpoint not available (404/405)")
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "concurrency": args.concurrency, "duration": args.duration, "warmup": args.warmup,
+            "think_time": args.think_time, "profile": args.profile, "seed": args.seed,
+            "scenarios": {name: weight for name, weight in weights.items() if name not in unavailable},
+            "backend_workers": args.backend_workers, "bff_workers": args.bff_workers,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "endpoints": recorder.summary(elapsed),
+    }
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.bff_url:
+        host, _, port = args.redis.partition(":")
+        results = execute(args, args.bff_url, args.backend_url, host, int(port or 6379))
+    else:
+        with Stack(database_url=args.database_url, redis=args.redis, profile=args.profile, seed=args.seed,
+                   seed_data=not args.no_seed, backend_workers=args.backend_workers,
+                   bff_workers=args.bff_workers, workdir=args.workdir) as stack:
+            results = execute(args, stack.bff_url, stack.backend_url, stack.redis_host, stack.redis_port)
+
+    print(format_table(results["endpoints"]))
+    if args.output:
+        save_results(args.output, results)
+    if args.save_baseline:
+        save_results(args.save_baseline, results)
+        print(f"baseline saved to {args.save_baseline}")
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        regressions = compare(results["endpoints"], baseline["endpoints"], args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
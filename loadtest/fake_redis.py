@@ -0,0 +1,234 @@
+"""
+Minimal in-memory Redis server for load tests
+
+Speaks RESP2 and implements the commands the BFF and backend use (strings
+with expiry, counters, key scans). Everything lives in one dict, so it is only
+meant for a single test run; it is not a general Redis replacement.
+
+Usage:
+    python -m loadtest.fake_redis --port 6390
+"""
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Dict, List, Optional, Tuple
+
+class FakeRedis:
+    """キーと (値, 有効期限) を保持するストア"""
+
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _set(self, key: bytes, value: bytes, ttl: Optional[float] = None):
+        self.data[key] = (value, None if ttl is None else time.monotonic() + ttl)
+
+    def _live_keys(self) -> List[bytes]:
+        return [key for key in list(self.data) if self._get(key) is not None]
+
+    def execute(self, args: List[bytes]):
+        """1コマンドを実行し、RESPで返す値（Exceptionはエラー応答）を返す"""
+        name = args[0].decode().upper()
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return ValueError(f"ERR unknown command '{name}'")
+        try:
+            return handler(*args[1:])
+        except TypeError:
+            return ValueError(f"ERR wrong number of arguments for '{name.lower()}' command")
+        except ValueError as e:
+            return e
+
+    # 接続管理
+    def cmd_ping(self, message: Optional[bytes] = None):
+        return message if message is not None else "PONG"
+
+    def cmd_echo(self, message: bytes):
+        return message
+
+    def cmd_select(self, index: bytes):
+        return "OK"
+
+    def cmd_client(self, *args):
+        return "OK"
+
+    def cmd_info(self, *args):
+        return b"redis_version:7.0.0\r\n"
+
+    # 文字列
+    def cmd_get(self, key: bytes):
+        return self._get(key)
+
+    def cmd_mget(self, *keys: bytes):
+        return [self._get(key) for key in keys]
+
+    def cmd_set(self, key: bytes, value: bytes, *options: bytes):
+        ttl = None
+        nx = xx = False
+        options = [option.upper() for option in options]
+        i = 0
+        while i < len(options):
+            if options[i] == b"EX":
+                ttl, i = float(options[i + 1]), i + 2
+            elif options[i] == b"PX":
+                ttl, i = float(options[i + 1]) / 1000, i + 2
+            elif options[i] in (b"NX", b"XX"):
+                nx, xx = nx or options[i] == b"NX", xx or options[i] == b"XX"
+                i += 1
+            else:
+                raise ValueError("ERR syntax error")
+        exists = self._get(key) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._set(key, value, ttl)
+        return "OK"
+
+    def cmd_setex(self, key: bytes, seconds: bytes, value: bytes):
+        self._set(key, value, float(seconds))
+        return "OK"
+
+    def cmd_psetex(self, key: bytes, milliseconds: bytes, value: bytes):
+        self._set(key, value, float(milliseconds) / 1000)
+        return "OK"
+
+    def cmd_incrby(self, key: bytes, amount: bytes):
+        entry = self.data.get(key)
+        current = self._get(key)
+        try:
+            value = int(current or 0) + int(amount)
+        except ValueError:
+            raise ValueError("ERR value is not an integer or out of range")
+        # INCRは有効期限を維持する
+        self.data[key] = (str(value).encode(), entry[1] if entry and current is not None else None)
+        return value
+
+    def cmd_incr(self, key: bytes):
+        return self.cmd_incrby(key, b"1")
+
+    def cmd_decr(self, key: bytes):
+        return self.cmd_incrby(key, b"-1")
+
+    # キー
+    def cmd_del(self, *keys: bytes):
+        deleted = sum(self._get(key) is not None for key in keys)
+        for key in keys:
+            self.data.pop(key, None)
+        return deleted
+
+    cmd_unlink = cmd_del
+
+    def cmd_exists(self, *keys: bytes):
+        return sum(self._get(key) is not None for key in keys)
+
+    def cmd_expire(self, key: bytes, seconds: bytes):
+        value = self._get(key)
+        if value is None:
+            return 0
+        self._set(key, value, float(seconds))
+        return 1
+
+    def cmd_ttl(self, key: bytes):
+        if self._get(key) is None:
+            return -2
+        expires_at = self.data[key][1]
+        return -1 if expires_at is None else max(0, round(expires_at - time.monotonic()))
+
+    def cmd_keys(self, pattern: bytes):
+        return [key for key in self._live_keys() if fnmatch.fnmatchcase(key.decode(), pattern.decode())]
+
+    def cmd_scan(self, cursor: bytes, *options: bytes):
+        # 全件を1回で返す（カーソルは常に0）
+        options = list(options)
+        pattern = b"*"
+        for i, option in enumerate(options[:-1]):
+            if option.upper() == b"MATCH":
+                pattern = options[i + 1]
+        return [b"0", self.cmd_keys(pattern)]
+
+    def cmd_dbsize(self):
+        return len(self._live_keys())
+
+    def cmd_flushdb(self, *args):
+        self.data.clear()
+        return "OK"
+
+    cmd_flushall = cmd_flushdb
+
+def encode(value) -> bytes:
+    """Pythonの値をRESP2に変換（str は単純文字列、bytes はバルク文字列）"""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return f"-{value}\r\n".encode()
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, bool) or isinstance(value, int):
+        return f":{int(value)}\r\n".encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+    raise TypeError(f"cannot encode {type(value).__name__}")
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    """1コマンド分の引数を読む（接続終了時はNone）"""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.split()  # インラインコマンド（redis-cli / telnet）
+    args = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        length = int(header[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+async def serve(host: str = "127.0.0.1", port: int = 6379, store: Optional[FakeRedis] = None):
+    """サーバーを起動して asyncio.Server を返す"""
+    store = store or FakeRedis()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                if args:
+                    writer.write(encode(store.execute(args)))
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory Redis for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    async def run():
+        server = await serve(args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Closed-loop load generator: each virtual user repeatedly picks a weighted
+scenario and runs it to completion before picking the next one
+"""
+import asyncio
+import random
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from loadtest.scenarios import SCENARIOS, Actor, Fixture
+from loadtest.stats import Recorder
+
+async def probe(fixture: Fixture, weights: Dict[str, int], bff: httpx.AsyncClient,
+                backend: httpx.AsyncClient) -> List[str]:
+    """各シナリオを1回実行し、すべての呼び出しが404/405になるもの（未提供のAPI）を返す"""
+    user = next((user for user in fixture.users if user.owned), fixture.users[0])
+    unavailable = []
+    for name in weights:
+        recorder = Recorder()
+        recorder.enabled = True
+        await SCENARIOS[name](Actor(user, fixture, bff, backend, recorder, random.Random(0)))
+        missing = sum(recorder.errors[endpoint][code] for endpoint in recorder.errors for code in ("404", "405"))
+        calls = sum(len(values) for values in recorder.latencies.values())
+        if calls and missing == calls:
+            unavailable.append(name)
+    return unavailable
+
+async def run_load(fixture: Fixture, weights: Dict[str, int], bff_url: str, backend_url: str,
+                   concurrency: int, duration: float, warmup: float, seed: int = 42,
+                   think_time: float = 0.0) -> Tuple[Recorder, float, List[str]]:
+    """(記録, 計測時間[秒], 無効化したシナリオ) を返す"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=bff_url, limits=limits, timeout=120) as bff, \
+            httpx.AsyncClient(base_url=backend_url, limits=limits, timeout=120) as backend:
+        unavailable = await probe(fixture, weights, bff, backend)
+        weights = {name: weight for name, weight in weights.items() if name not in unavailable}
+        if not weights:
+            raise RuntimeError("no scenario can run against this deployment")
+        names, cumulative = list(weights), list(weights.values())
+
+        recorder = Recorder()
+        loop = asyncio.get_running_loop()
+        measure_from = loop.time() + warmup
+        stop_at = measure_from + duration
+
+        async def virtual_user(index: int):
+            # 仮想ユーザーごとに乱数系列を固定し、同じ --seed なら同じ操作列になる
+            rng = random.Random(seed * 100_003 + index)
+            actor = Actor(fixture.users[index % len(fixture.users)], fixture, bff, backend, recorder, rng)
+            while loop.time() < stop_at:
+                await SCENARIOS[rng.choices(names, cumulative)[0]](actor)
+                if think_time:
+                    await asyncio.sleep(rng.expovariate(1 / think_time))
+
+        async def start_measuring():
+            await asyncio.sleep(max(0.0, measure_from - loop.time()))
+            recorder.enabled = True
+            return time.perf_counter()
+
+        started, *_ = await asyncio.gather(start_measuring(), *(virtual_user(i) for i in range(concurrency)))
+        # 終了時刻を過ぎて完了したリクエストも計測に含むため、実際の経過時間で割る
+        elapsed = time.perf_counter() - started
+    return recorder, elapsed, unavailable
@@ -0,0 +1,237 @@
+"""
+Virtual users and the weighted scenario mix
+
+Every scenario is one user action from the Gantt UI expressed as the HTTP
+calls the frontend makes. Each call is recorded under an endpoint name, so
+a scenario that issues several requests contributes to several rows of
+the report.
+"""
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+import redis
+
+from loadtest.stats import Recorder
+
+SYNTHETIC_PASSWORD = "password"  # app.database.synthetic_seeds の共通パスワード
+
+class VirtualUser(NamedTuple):
+    """ログイン済みの合成ユーザー"""
+    user_id: int
+    username: str
+    token: str  # バックエンドのアクセストークン
+    session_id: str  # BFFのセッションID（X-Session-ID）
+    projects: List[int]  # 参照できるプロジェクト
+    owned: List[int]  # 作成者として変更できるプロジェクト
+
+class Fixture(NamedTuple):
+    users: List[VirtualUser]
+    tasks: Dict[int, List[int]]  # プロジェクトID → タスクID（表示順の先頭から）
+
+class Actor:
+    """1人の仮想ユーザー。HTTP呼び出しを計測してRecorderに記録する"""
+
+    def __init__(self, user: VirtualUser, fixture: Fixture, bff: httpx.AsyncClient,
+                 backend: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.user = user
+        self.fixture = fixture
+        self.bff_client = bff
+        self.backend_client = backend
+        self.recorder = recorder
+        self.rng = rng
+        self.cursors: Dict[int, str] = {}  # プロジェクトID → 差分同期カーソル
+
+    async def call(self, endpoint: str, client: httpx.AsyncClient, method: str, url: str,
+                   **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            await response.aread()
+        except httpx.HTTPError:
+            self.recorder.record(endpoint, time.perf_counter() - started, "transport")
+            return None
+        # BFFは失敗をHTTP 200 + {"success": false} で返すことがある
+        failed = response.status_code >= 400 or response.content.startswith(b'{"success":false')
+        self.recorder.record(endpoint, time.perf_counter() - started,
+                             str(response.status_code) if failed or response.status_code >= 300 else None)
+        return response
+
+    def bff(self, endpoint: str, path: str, payload: Optional[dict] = None):
+        return self.call(endpoint, self.bff_client, "POST", path, json=payload or {},
+                         headers={"X-Session-ID": self.user.session_id})
+
+    def backend(self, endpoint: str, method: str, path: str, **kwargs):
+        return self.call(endpoint, self.backend_client, method, path,
+                         headers={"Authorization": f"Bearer {self.user.token}"}, **kwargs)
+
+    def pick_project(self, owned: bool = False) -> Optional[int]:
+        candidates = self.user.owned if owned else self.user.projects
+        return self.rng.choice(candidates) if candidates else None
+
+# シナリオ
+
+async def open_gantt(actor: Actor):
+    """ガンチャート画面を開く（一括ペイロード + 差分同期の起点）"""
+    project_id = actor.pick_project()
+    await actor.bff("POST /tasks/gantt", "/api/v1/tasks/gantt", {"project_id": project_id})
+    actor.cursors.pop(project_id, None)
+    await poll_changes(actor, project_id)
+
+async def poll_changes(actor: Actor, project_id: Optional[int] = None):
+    """開いているガンチャートの差分更新"""
+    project_id = project_id or actor.pick_project()
+    since = actor.cursors.get(project_id)
+    response = await actor.bff(
+        "POST /tasks/changes" if since else "POST /tasks/changes (full)",
+        "/api/v1/tasks/changes", {"project_id": project_id, "since": since}
+    )
+    if response is not None and response.status_code == 200:
+        cursor = (response.json().get("data") or {}).get("cursor")
+        if cursor:
+            actor.cursors[project_id] = cursor
+
+async def drag_task(actor: Actor):
+    """タスクをドラッグして別のタスクの直後に移動"""
+    project_id = actor.pick_project(owned=True)
+    task_ids = actor.fixture.tasks.get(project_id) or []
+    if len(task_ids) < 2:
+        return await open_gantt(actor)
+    task_id, after_task_id = actor.rng.sample(task_ids, 2)
+    await actor.bff("POST /tasks/move/{id}", f"/api/v1/tasks/move/{task_id}", {"after_task_id": after_task_id})
+
+async def list_tasks(actor: Actor):
+    """タスク一覧画面"""
+    await actor.bff("POST /tasks/list", "/api/v1/tasks/list",
+                    {"project_id": actor.pick_project(), "limit": 100})
+
+async def list_projects(actor: Actor):
+    """プロジェクト一覧画面"""
+    await actor.bff("POST /projects/list", "/api/v1/projects/list", {"limit": 50})
+
+async def login(actor: Actor):
+    """BFFのログイン（簡易認証: admin/admin123）"""
+    await actor.call("POST /auth/login", actor.bff_client, "POST", "/api/v1/auth/login",
+                     json={"data": {"username": "admin", "password": "admin123"}})
+
+async def export_report(actor: Actor):
+    """タスク一覧のExcel出力（バックエンドのレポートAPIを直接呼ぶ）"""
+    project_id = actor.pick_project()
+    await actor.backend("GET /reports/projects/{id}/tasks/excel", "GET",
+                        f"/api/reports/projects/{project_id}/tasks/excel")
+
+async def view_report(actor: Actor):
+    """進捗レポートとダッシュボード統計の表示（マネージャーの再読み込み）"""
+    project_id = actor.pick_project()
+    await actor.backend("GET /reports/projects/{id}/progress", "GET",
+                        f"/api/reports/projects/{project_id}/progress")
+    await actor.backend("GET /reports/dashboard-stats", "GET", "/api/reports/dashboard-stats")
+
+Scenario = Callable[[Actor], Awaitable[None]]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "open_gantt": open_gantt,
+    "poll_changes": poll_changes,
+    "drag_task": drag_task,
+    "list_tasks": list_tasks,
+    "list_projects": list_projects,
+    "login": login,
+    "export_report": export_report,
+    "view_report": view_report,
+}
+
+# 既定の比率（ガンチャートの閲覧と差分更新が大半）
+DEFAULT_WEIGHTS = {
+    "open_gantt": 15,
+    "poll_changes": 40,
+    "drag_task": 15,
+    "list_tasks": 10,
+    "list_projects": 10,
+    "login": 5,
+    "export_report": 5,
+    "view_report": 5,
+}
+
+def parse_weights(spec: Optional[str]) -> Dict[str, int]:
+    """ "open_gantt=20,drag_task=5" 形式を既定の比率に上書きする（0で無効化）"""
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, (spec or "").split(",")):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        weights[name] = int(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+# 仮想ユーザーの準備
+
+def _write_session(store: redis.Redis, user: dict, token: str) -> str:
+    """BFFの SessionManager と同じ形式でセッションを作成する"""
+    session_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    expires_in = 86400
+    store.setex(f"session:{session_id}", expires_in, json.dumps({
+        "id": user["id"],
+        "username": user["username"],
+        "full_name": user["full_name"],
+        "email": user["email"],
+        "role_level": user["role_level"],
+        "access_token": token,
+        "created_at": now.isoformat(),
+        "expires_at": (now + timedelta(seconds=expires_in)).isoformat(),
+    }))
+    return session_id
+
+async def _login(backend: httpx.AsyncClient, store: redis.Redis, username: str) -> Optional[VirtualUser]:
+    response = await backend.post("/api/auth/login", json={"username": username, "password": SYNTHETIC_PASSWORD})
+    if response.status_code != 200:
+        return None
+    token = response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    me = (await backend.get("/api/auth/me", headers=headers)).json()
+    projects = (await backend.get("/api/projects/", params={"limit": 1000}, headers=headers)).json()
+    return VirtualUser(
+        user_id=me["id"], username=username, token=token,
+        session_id=_write_session(store, me, token),
+        projects=[project["id"] for project in projects],
+        owned=[project["id"] for project in projects if project["created_by"] == me["id"]],
+    )
+
+async def prepare_fixture(backend_url: str, redis_host: str, redis_port: int, users: int,
+                          prefix: str = "load", tasks_per_project: int = 1000) -> Fixture:
+    """合成ユーザーでログインし、プロジェクトに参加しているusers人（作成者を1人以上含む）を集める"""
+    store = redis.Redis(host=redis_host, port=redis_port)
+    pool: List[VirtualUser] = []
+    async with httpx.AsyncClient(base_url=backend_url, timeout=60) as backend:
+        index, batch = 0, 8  # パスワード検証が重いので少数ずつ並行に
+        while len(pool) < users or not any(user.owned for user in pool):
+            logged_in = await asyncio.gather(*(
+                _login(backend, store, f"{prefix}_user{i}") for i in range(index, index + batch)
+            ))
+            index += batch
+            if not any(logged_in):
+                break  # 合成ユーザーを使い切った
+            for user in filter(None, logged_in):
+                if user.projects and (len(pool) < users or (user.owned and not any(u.owned for u in pool))):
+                    pool.append(user)
+        if not pool:
+            raise RuntimeError(f"no '{prefix}_user*' users with projects; seed the database first")
+
+        tasks: Dict[int, List[int]] = {}
+        for user in pool:
+            for project_id in user.projects:
+                if project_id not in tasks:
+                    response = await backend.get(
+                        f"/api/tasks/projects/{project_id}/tasks",
+                        params={"limit": tasks_per_project},
+                        headers={"Authorization": f"Bearer {user.token}"}
+                    )
+                    response.raise_for_status()
+                    tasks[project_id] = [task["id"] for task in response.json()]
+    store.close()
+    return Fixture(pool, tasks)
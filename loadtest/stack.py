@@ -0,0 +1,178 @@
+"""
+Process management for the load test: fake Redis, database, backend and BFF
+
+Each service runs as its own subprocess on a free local port, with stdout and
+stderr written to <workdir>/<name>.log so a failed start can be diagnosed.
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = ROOT / "backend"
+BFF_DIR = ROOT / "bff"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class Service:
+    """サブプロセスで動くサービス1つ"""
+
+    def __init__(self, name: str, args: List[str], cwd: Path, env: Dict[str, str], logdir: Path):
+        self.name = name
+        self.args = args
+        self.cwd = cwd
+        self.env = env
+        self.log_path = logdir / f"{name}.log"
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self):
+        log = open(self.log_path, "wb")
+        self.process = subprocess.Popen(self.args, cwd=self.cwd, env=self.env,
+                                        stdout=log, stderr=subprocess.STDOUT)
+        log.close()
+
+    def wait_http(self, url: str, timeout: float = 60):
+        """urlが200を返すまで待つ（プロセスが終了した場合はログを添えて失敗）"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with {self.process.returncode}:\n{self.tail()}")
+            try:
+                if httpx.get(url, timeout=2).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"{self.name} did not become ready within {timeout:.0f}s:\n{self.tail()}")
+
+    def wait_port(self, port: int, timeout: float = 10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with {self.process.returncode}:\n{self.tail()}")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError(f"{self.name} did not open port {port}:\n{self.tail()}")
+
+    def tail(self, lines: int = 30) -> str:
+        try:
+            return "\n".join(self.log_path.read_text(errors="replace").splitlines()[-lines:])
+        except OSError:
+            return ""
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+class Stack:
+    """負荷試験対象一式（fake Redis・DB・backend・BFF）を起動・停止する"""
+
+    def __init__(self, database_url: Optional[str] = None, redis: Optional[str] = None,
+                 profile: str = "small", seed: int = 42, seed_data: bool = True,
+                 backend_workers: int = 1, bff_workers: int = 1, workdir: Optional[str] = None):
+        self._tmpdir = None if workdir else tempfile.TemporaryDirectory(prefix="loadtest-")
+        self.workdir = Path(workdir or self._tmpdir.name)
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        self.database_url = database_url or f"sqlite:///{self.workdir / 'loadtest.db'}"
+        self.redis = redis
+        self.profile = profile
+        self.seed = seed
+        self.seed_data = seed_data
+        self.backend_workers = backend_workers
+        self.bff_workers = bff_workers
+        self.services: List[Service] = []
+        self.backend_url = self.bff_url = ""
+        self.redis_host, self.redis_port = "127.0.0.1", 0
+
+    def _env(self, **extra: str) -> Dict[str, str]:
+        env = dict(os.environ)
+        env.update(extra)
+        env["PYTHONPATH"] = "."
+        return env
+
+    def _uvicorn(self, name: str, cwd: Path, port: int, workers: int, env: Dict[str, str]) -> Service:
+        service = Service(name, [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ], cwd, env, self.workdir)
+        self.services.append(service)
+        service.start()
+        return service
+
+    def prepare_database(self):
+        """テーブル作成と合成データ投入（synthetic_seeds をバックエンドの環境で実行）"""
+        result = subprocess.run(
+            [sys.executable, "-m", "app.database.synthetic_seeds", "--create-tables",
+             "--profile", self.profile, "--seed", str(self.seed)],
+            cwd=BACKEND_DIR, env=self._env(DATABASE_URL=self.database_url, DEBUG="false"),
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"seeding failed:\n{result.stdout}{result.stderr}")
+        return result.stdout
+
+    def start(self):
+        if self.redis:
+            host, _, port = self.redis.partition(":")
+            self.redis_host, self.redis_port = host, int(port or 6379)
+        else:
+            self.redis_port = free_port()
+            redis = Service("fake_redis", [
+                sys.executable, "-m", "loadtest.fake_redis", "--port", str(self.redis_port)
+            ], ROOT, self._env(), self.workdir)
+            self.services.append(redis)
+            redis.start()
+            redis.wait_port(self.redis_port)
+
+        if self.seed_data:
+            print(self.prepare_database().rstrip())
+
+        backend_port, bff_port = free_port(), free_port()
+        self.backend_url = f"http://127.0.0.1:{backend_port}"
+        self.bff_url = f"http://127.0.0.1:{bff_port}"
+        backend = self._uvicorn("backend", BACKEND_DIR, backend_port, self.backend_workers, self._env(
+            DATABASE_URL=self.database_url, DEBUG="false",
+            REDIS_URL=f"redis://{self.redis_host}:{self.redis_port}/1",
+        ))
+        # BFFはファイルストア（data/）を相対パスで参照するため bff ディレクトリで起動する
+        bff = self._uvicorn("bff", BFF_DIR, bff_port, self.bff_workers, self._env(
+            BACKEND_URL=self.backend_url, DEBUG="false",
+            REDIS_HOST=self.redis_host, REDIS_PORT=str(self.redis_port),
+        ))
+        backend.wait_http(f"{self.backend_url}/health")
+        bff.wait_http(f"{self.bff_url}/health")
+
+    def stop(self):
+        for service in reversed(self.services):
+            service.stop()
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+    def __enter__(self):
+        try:
+            self.start()
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,106 @@
+"""
+Latency recording, per-endpoint summaries and baseline comparison
+"""
+import json
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+PERCENTILES = (50, 90, 95, 99)
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """最近傍法のパーセンタイル（sorted_valuesは昇順）"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+class Recorder:
+    """エンドポイントごとのレイテンシとエラーを集める（計測期間外は記録しない）"""
+
+    def __init__(self):
+        self.enabled = False
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None):
+        """error はステータスコード（または "transport"）。成功時はNone"""
+        if not self.enabled:
+            return
+        self.latencies[endpoint].append(seconds)
+        if error is not None:
+            self.errors[endpoint][error] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        """エンドポイント名 → 件数・エラー・スループット・パーセンタイル（ミリ秒）"""
+        result = {}
+        everything = []
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            everything.extend(values)
+            result[endpoint] = self._row(values, self.errors[endpoint], elapsed)
+        errors = sum((counter for counter in self.errors.values()), Counter())
+        result["TOTAL"] = self._row(sorted(everything), errors, elapsed)
+        return result
+
+    @staticmethod
+    def _row(values: List[float], errors: Counter, elapsed: float) -> dict:
+        row = {
+            "requests": len(values),
+            "errors": sum(errors.values()),
+            "error_codes": dict(errors),
+            "rps": round(len(values) / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+        for pct in PERCENTILES:
+            row[f"p{pct}_ms"] = round(percentile(values, pct) * 1000, 2)
+        row["max_ms"] = round(values[-1] * 1000, 2) if values else 0.0
+        return row
+
+def format_table(summary: Dict[str, dict]) -> str:
+    header = (f"{'endpoint':<40} {'reqs':>7} {'errors':>7} {'req/s':>8} "
+              + " ".join(f"{f'p{pct} ms':>9}" for pct in PERCENTILES) + f" {'max ms':>9}")
+    lines = [header, "-" * len(header)]
+    for endpoint, row in summary.items():
+        if endpoint == "TOTAL":
+            lines.append("-" * len(header))
+        lines.append(
+            f"{endpoint:<40} {row['requests']:>7} {row['errors']:>7} {row['rps']:>8.1f} "
+            + " ".join(f"{row[f'p{pct}_ms']:>9.1f}" for pct in PERCENTILES) + f" {row['max_ms']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], tolerance: float,
+            min_delta_ms: float = 5.0) -> List[str]:
+    """ベースラインからの劣化を列挙する
+
+    p95/p99 が tolerance（割合）を超えて、かつ min_delta_ms 以上遅くなった場合、
+    スループットが tolerance を超えて下がった場合、エラー率が1ポイント以上増えた場合を劣化とする。
+    件数が少ないエンドポイントのパーセンタイルは揺れやすいため20件未満は比較しない。
+    """
+    regressions = []
+    for endpoint, before in baseline.items():
+        after = current.get(endpoint)
+        if after is None:
+            regressions.append(f"{endpoint}: missing from this run")
+            continue
+        if before["requests"] < 20 or after["requests"] < 20:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if after[key] > before[key] * (1 + tolerance) and after[key] - before[key] >= min_delta_ms:
+                regressions.append(f"{endpoint}: {key} {before[key]:.1f} -> {after[key]:.1f}")
+        if after["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: req/s {before['rps']:.1f} -> {after['rps']:.1f}")
+        before_rate = before["errors"] / before["requests"]
+        after_rate = after["errors"] / after["requests"]
+        if after_rate - before_rate > 0.01:
+            regressions.append(f"{endpoint}: error rate {before_rate:.1%} -> {after_rate:.1%}")
+    return regressions
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_results(path: str, results: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+        f.write("\n")